@@ -20,27 +20,22 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from backend.models import (
-    Chunk,
-    ChunkRead,
-    AiImage,
-    AiImageCreate,
-    AiImageRead,
-    SourceDocInfoAiResponse,
-    SourceDocInfoRequest,
-    SourceDocInfoResponse,
-    WordDefinitionWithContextRequest,
-    WordDefinitionResponse,
-    WordDefinition,
-    PhraseExplanation,
-    ExplainPhraseWithContextRequest,
-    ExplainPhraseResponse,
-    
-)
+# Importing the models registers every table on SQLModel.metadata
+import backend.models  # noqa: F401
+from backend.db import DATABASE_URL
+
+# Migrate the same database the app uses (DATABASE_URL env var / BackendConfig),
+# unless a URL is passed explicitly, e.g. `alembic -x url=postgresql+psycopg://... upgrade head`
+config.set_main_option("sqlalchemy.url", context.get_x_argument(as_dictionary=True).get("url", DATABASE_URL))
 # Set the target metadata for autogenerate
 # If you have multiple models, you can combine their metadata
 target_metadata = SQLModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from FTS5 tables and their shadow tables (managed by raw DDL, see backend/fts.py)."""
+    return not (type_ == "table" and reflected and compare_to is None and "_fts" in name)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -65,6 +60,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -86,7 +83,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most constraints in place; batch mode rebuilds the table instead
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,29 @@
+"""add chunk metatext_id position index
+
+Revision ID: 3c9e1f2a7b4d
+Revises: 164912383376
+Create Date: 2026-10-18 09:14:02.511347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f2a7b4d'
+down_revision: Union[str, None] = '164912383376'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index backing keyset pagination of a metatext's chunks
+    op.create_index('ix_chunk_metatext_id_position', 'chunk', ['metatext_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunk_metatext_id_position', table_name='chunk')
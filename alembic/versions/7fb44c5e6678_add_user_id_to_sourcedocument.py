@@ -30,10 +30,12 @@ def upgrade() -> None:
         batch_op.alter_column('user_id', nullable=False)
         batch_op.create_foreign_key('fk_sourcedocument_user_id_user', 'user', ['user_id'], ['id'])
 
-    # For metatext, drop and recreate the foreign key with explicit name for SQLite
-    with op.batch_alter_table('metatext') as batch_op:
-        batch_op.alter_column('user_id', nullable=False)
-        batch_op.create_foreign_key('fk_metatext_user_id_user', 'user', ['user_id'], ['id'])
+    # For metatext, drop and recreate the foreign key with explicit name for SQLite.
+    # Other databases kept the constraint created in 5785a84ef2d6, and adding it again would fail.
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('metatext') as batch_op:
+            batch_op.alter_column('user_id', nullable=False)
+            batch_op.create_foreign_key('fk_metatext_user_id_user', 'user', ['user_id'], ['id'])
     # ### end Alembic commands ###
 
 
@@ -43,7 +45,8 @@ def downgrade() -> None:
     with op.batch_alter_table('sourcedocument') as batch_op:
         batch_op.drop_constraint('fk_sourcedocument_user_id_user', type_='foreignkey')
         batch_op.drop_column('user_id')
-    with op.batch_alter_table('metatext') as batch_op:
-        batch_op.drop_constraint('fk_metatext_user_id_user', type_='foreignkey')
-        batch_op.alter_column('user_id', nullable=True)
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('metatext') as batch_op:
+            batch_op.drop_constraint('fk_metatext_user_id_user', type_='foreignkey')
+            batch_op.alter_column('user_id', nullable=True)
     # ### end Alembic commands ###
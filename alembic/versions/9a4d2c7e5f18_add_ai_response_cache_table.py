@@ -0,0 +1,39 @@
+"""add ai response cache table
+
+Revision ID: 9a4d2c7e5f18
+Revises: 3c9e1f2a7b4d
+Create Date: 2026-10-18 11:02:47.180233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d2c7e5f18'
+down_revision: Union[str, None] = '3c9e1f2a7b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('airesponsecacheentry',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('instructions_file', sa.String(), nullable=False),
+    sa.Column('response', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_accessed_at', sa.DateTime(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_airesponsecacheentry_last_accessed_at'), 'airesponsecacheentry', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_airesponsecacheentry_last_accessed_at'), table_name='airesponsecacheentry')
+    op.drop_table('airesponsecacheentry')
@@ -0,0 +1,82 @@
+"""add bookmark table
+
+Revision ID: a7e3b5d1c962
+Revises: f2d9a6c4e0b3
+Create Date: 2026-10-18 21:48:09.334170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3b5d1c962'
+down_revision: Union[str, None] = 'f2d9a6c4e0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilding chunk in batch mode drops its triggers; these mirror c5e7a9d31f02
+CHUNK_FTS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_ai AFTER INSERT ON chunk BEGIN "
+    "INSERT INTO chunk_fts(rowid, text, note, summary) VALUES (new.id, new.text, new.note, new.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_ad AFTER DELETE ON chunk BEGIN "
+    "INSERT INTO chunk_fts(chunk_fts, rowid, text, note, summary) "
+    "VALUES ('delete', old.id, old.text, old.note, old.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_au AFTER UPDATE OF text, note, summary ON chunk BEGIN "
+    "INSERT INTO chunk_fts(chunk_fts, rowid, text, note, summary) "
+    "VALUES ('delete', old.id, old.text, old.note, old.summary); "
+    "INSERT INTO chunk_fts(rowid, text, note, summary) VALUES (new.id, new.text, new.note, new.summary); END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'bookmark',
+        sa.Column('metatext_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('chunk_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['chunk_id'], ['chunk.id'], ),
+        sa.ForeignKeyConstraint(['metatext_id'], ['metatext.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('metatext_id', 'user_id')
+    )
+    op.create_index('ix_bookmark_chunk_id', 'bookmark', ['chunk_id'], unique=False)
+
+    # Carry over bookmarks stored on chunk rows (at most one per user and metatext)
+    op.execute(
+        "INSERT INTO bookmark (metatext_id, user_id, chunk_id, updated_at) "
+        "SELECT metatext_id, bookmarked_by_user_id, MIN(id), CURRENT_TIMESTAMP FROM chunk "
+        "WHERE bookmarked_by_user_id IS NOT NULL GROUP BY metatext_id, bookmarked_by_user_id"
+    )
+
+    op.drop_index('ix_chunk_bookmarked_by_user_id_metatext_id', table_name='chunk')
+    # SQLite cannot drop a column that has a foreign key in place, so the table is rebuilt
+    with op.batch_alter_table('chunk', schema=None) as batch_op:
+        batch_op.drop_column('bookmarked_by_user_id')
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in CHUNK_FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chunk', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bookmarked_by_user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_chunk_bookmarked_by_user_id_user', 'user', ['bookmarked_by_user_id'], ['id'])
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in CHUNK_FTS_TRIGGERS:
+            op.execute(statement)
+    op.execute(
+        "UPDATE chunk SET bookmarked_by_user_id = "
+        "(SELECT MIN(user_id) FROM bookmark WHERE bookmark.chunk_id = chunk.id) "
+        "WHERE id IN (SELECT chunk_id FROM bookmark)"
+    )
+    op.create_index(
+        'ix_chunk_bookmarked_by_user_id_metatext_id', 'chunk', ['bookmarked_by_user_id', 'metatext_id'], unique=False
+    )
+    op.drop_index('ix_bookmark_chunk_id', table_name='bookmark')
+    op.drop_table('bookmark')
@@ -0,0 +1,80 @@
+"""add favorite table
+
+Revision ID: b3f8e2c6d417
+Revises: a7e3b5d1c962
+Create Date: 2026-10-18 23:12:41.508923
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f8e2c6d417'
+down_revision: Union[str, None] = 'a7e3b5d1c962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilding chunk in batch mode drops its triggers; these mirror c5e7a9d31f02
+CHUNK_FTS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_ai AFTER INSERT ON chunk BEGIN "
+    "INSERT INTO chunk_fts(rowid, text, note, summary) VALUES (new.id, new.text, new.note, new.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_ad AFTER DELETE ON chunk BEGIN "
+    "INSERT INTO chunk_fts(chunk_fts, rowid, text, note, summary) "
+    "VALUES ('delete', old.id, old.text, old.note, old.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS chunk_fts_au AFTER UPDATE OF text, note, summary ON chunk BEGIN "
+    "INSERT INTO chunk_fts(chunk_fts, rowid, text, note, summary) "
+    "VALUES ('delete', old.id, old.text, old.note, old.summary); "
+    "INSERT INTO chunk_fts(rowid, text, note, summary) VALUES (new.id, new.text, new.note, new.summary); END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'favorite',
+        sa.Column('chunk_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['chunk_id'], ['chunk.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('chunk_id', 'user_id')
+    )
+    op.create_index(
+        'ix_favorite_user_id_created_at_chunk_id', 'favorite', ['user_id', 'created_at', 'chunk_id'], unique=False
+    )
+
+    # Carry over the single favorite stored on each chunk row
+    op.execute(
+        "INSERT INTO favorite (chunk_id, user_id, created_at) "
+        "SELECT id, favorited_by_user_id, CURRENT_TIMESTAMP FROM chunk WHERE favorited_by_user_id IS NOT NULL"
+    )
+
+    op.drop_index('ix_chunk_favorited_by_user_id', table_name='chunk')
+    # SQLite cannot drop a column that has a foreign key in place, so the table is rebuilt
+    with op.batch_alter_table('chunk', schema=None) as batch_op:
+        batch_op.drop_column('favorited_by_user_id')
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in CHUNK_FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chunk', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('favorited_by_user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_chunk_favorited_by_user_id_user', 'user', ['favorited_by_user_id'], ['id'])
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in CHUNK_FTS_TRIGGERS:
+            op.execute(statement)
+    # A chunk column holds one user: keep the earliest favorite of each chunk
+    op.execute(
+        "UPDATE chunk SET favorited_by_user_id = "
+        "(SELECT user_id FROM favorite WHERE favorite.chunk_id = chunk.id ORDER BY created_at, user_id LIMIT 1) "
+        "WHERE id IN (SELECT chunk_id FROM favorite)"
+    )
+    op.create_index('ix_chunk_favorited_by_user_id', 'chunk', ['favorited_by_user_id'], unique=False)
+    op.drop_index('ix_favorite_user_id_created_at_chunk_id', table_name='favorite')
+    op.drop_table('favorite')
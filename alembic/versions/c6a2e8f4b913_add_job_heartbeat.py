@@ -0,0 +1,29 @@
+"""add job heartbeat
+
+Revision ID: c6a2e8f4b913
+Revises: b3f8e2c6d417
+Create Date: 2026-10-19 10:14:52.301874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a2e8f4b913'
+down_revision: Union[str, None] = 'b3f8e2c6d417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,34 @@
+"""add explanation reuse key
+
+Revision ID: d8b3f6a1c247
+Revises: c5e7a9d31f02
+Create Date: 2026-10-18 19:02:37.540119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b3f6a1c247'
+down_revision: Union[str, None] = 'c5e7a9d31f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain ALTERs rather than batch mode: rebuilding the table on SQLite would drop its FTS triggers.
+    # Existing rows keep NULL keys and are simply never reused.
+    op.add_column('explanation', sa.Column('words_key', sa.String(), nullable=True))
+    op.add_column('explanation', sa.Column('context_hash', sa.String(), nullable=True))
+    op.create_index('ix_explanation_words_key_context_hash', 'explanation', ['words_key', 'context_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_explanation_words_key_context_hash', table_name='explanation')
+    op.drop_column('explanation', 'context_hash')
+    op.drop_column('explanation', 'words_key')
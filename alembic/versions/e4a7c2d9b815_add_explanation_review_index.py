@@ -0,0 +1,34 @@
+"""add explanation review index
+
+Revision ID: e4a7c2d9b815
+Revises: d8b3f6a1c247
+Create Date: 2026-10-18 20:11:52.203416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d9b815'
+down_revision: Union[str, None] = 'd8b3f6a1c247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index backing the type-filtered, keyset-paginated review list
+    op.create_index(
+        'ix_explanation_metatext_id_user_id_type_created_at',
+        'explanation',
+        ['metatext_id', 'user_id', 'type', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_explanation_metatext_id_user_id_type_created_at', table_name='explanation')
@@ -0,0 +1,43 @@
+"""add foreign key lookup indexes
+
+Revision ID: f2d9a6c4e0b3
+Revises: e4a7c2d9b815
+Create Date: 2026-10-18 21:04:16.871532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d9a6c4e0b3'
+down_revision: Union[str, None] = 'e4a7c2d9b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns) for every foreign key the services filter on.
+# chunk.metatext_id and explanation (metatext_id, user_id) are already the leading
+# columns of ix_chunk_metatext_id_position and ix_explanation_metatext_id_user_id_type_created_at.
+INDEXES = [
+    ('ix_chunk_favorited_by_user_id', 'chunk', ['favorited_by_user_id']),
+    ('ix_chunk_bookmarked_by_user_id_metatext_id', 'chunk', ['bookmarked_by_user_id', 'metatext_id']),
+    ('ix_image_chunk_id', 'image', ['chunk_id']),
+    ('ix_rewrite_chunk_id', 'rewrite', ['chunk_id']),
+    ('ix_metatext_user_id', 'metatext', ['user_id']),
+    ('ix_metatext_source_document_id', 'metatext', ['source_document_id']),
+    ('ix_sourcedocument_user_id', 'sourcedocument', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
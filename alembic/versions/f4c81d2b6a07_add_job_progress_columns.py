@@ -0,0 +1,33 @@
+"""add job progress columns
+
+Revision ID: f4c81d2b6a07
+Revises: e27b5a91c3d6
+Create Date: 2026-10-18 14:02:31.447120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c81d2b6a07'
+down_revision: Union[str, None] = 'e27b5a91c3d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job', sa.Column('progress_done', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('job', sa.Column('progress_total', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('job', sa.Column('progress_failed', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.drop_column('progress_failed')
+        batch_op.drop_column('progress_total')
+        batch_op.drop_column('progress_done')
@@ -0,0 +1,22 @@
+"""
+API router for operator diagnostics.
+"""
+from fastapi import APIRouter, Depends, Query
+
+from backend.dependencies import get_admin_user
+from backend.middleware import loop_monitor
+
+router = APIRouter()
+
+
+@router.get("/admin/loop-lag", name="get_loop_lag")
+async def get_loop_lag(
+    events: int = Query(20, ge=0, le=200, description="Most recent blocking events to include"),
+    admin = Depends(get_admin_user)
+):
+    """
+    Event-loop lag percentiles, blocking time per route and the most recent
+    blocking events with the stack that held the loop. Only populated when
+    the loop monitor is enabled.
+    """
+    return loop_monitor.snapshot(events=events)
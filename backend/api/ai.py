@@ -1,12 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Form, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.models import (
-     EvaluationResponse, Rewrite, RewriteRead, SourceDocInfoResponse, ImageRead, User
+     EvaluationResponse, Rewrite, RewriteRead, SourceDocInfoResponse, ImageRead, JobRead, MetatextPipelineRequest, User
 )
-from backend.db import get_session
+from backend.db import get_async_session
 
-from backend.dependencies import get_ai_service, get_current_user
+from backend.dependencies import (
+    IMAGE_JOB_KIND, PIPELINE_JOB_KIND, ai_quota, charge_ai_quota, get_ai_service, get_async_job_service, get_current_user,
+    get_image_job_queue, get_pipeline_job_queue, get_token_bucket_store
+)
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
 from backend.exceptions.ai_exceptions import (
     ChunkNotFoundError,
     SourceDocumentNotFoundError,
@@ -18,19 +23,22 @@ from backend.exceptions.ai_exceptions import (
     FileOperationError
 )
 from backend.services import AIService
+from backend.services.job_service import AsyncJobService, JobQueue
+from backend.services.metatext_pipeline_service import PIPELINE_QUOTA_OPERATIONS, MetatextPipelineService
+from backend.rate_limit import TokenBucketStore
 
 router = APIRouter()
 
-@router.get("/evaluation/{chunk_id}")
+@router.get("/evaluation/{chunk_id}", dependencies=[Depends(ai_quota("evaluation"))])
 async def generate_evaluation(
     chunk_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
     ai_service: AIService = Depends(get_ai_service)
 ) -> EvaluationResponse:
     """Generate AI evaluation for chunk note, summary, and text. Requires authentication."""
     try:
-        return ai_service.generate_evaluation(chunk_id, session)
+        return await ai_service.generate_evaluation(chunk_id, session)
     except ChunkNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -44,16 +52,16 @@ async def generate_evaluation(
 
 
 
-@router.post("/source-doc-info/{doc_id}")
+@router.post("/source-doc-info/{doc_id}", dependencies=[Depends(ai_quota("source_doc_info"))])
 async def source_doc_info(
     doc_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
     ai_service: AIService = Depends(get_ai_service)
 ) -> SourceDocInfoResponse:
     """Generate source document information using AI. Requires authentication."""
     try:
-        return ai_service.generate_source_document_info(doc_id, session)
+        return await ai_service.generate_source_document_info(doc_id, session)
     except PromptValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -72,17 +80,17 @@ async def source_doc_info(
 
 
 
-@router.post("/generate-image", response_model=ImageRead)
+@router.post("/generate-image", response_model=ImageRead, dependencies=[Depends(ai_quota("image"))])
 async def generate_image(
     prompt: str = Form(...),
     chunk_id: int = Form(None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
     ai_service: AIService = Depends(get_ai_service)
 ):
     """Generate AI image using DALL-E. Requires authentication."""
     try:
-        return ai_service.generate_image(prompt, chunk_id, session)
+        return await ai_service.generate_image(prompt, chunk_id, session)
     except PromptValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -101,17 +109,99 @@ async def generate_image(
 
 
 
-@router.get("/generate-rewrite/{chunk_id}")
+@router.post(
+    "/generate-image/jobs",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(ai_quota("image"))]
+)
+async def enqueue_generate_image(
+    prompt: str = Form(...),
+    chunk_id: int = Form(None),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(get_current_user),
+    job_service: AsyncJobService = Depends(get_async_job_service),
+    job_queue: JobQueue = Depends(get_image_job_queue)
+):
+    """
+    Queue an AI image generation and return immediately. Requires authentication.
+
+    Poll GET /jobs/{id} or stream GET /jobs/{id}/events for the result.
+    """
+    if not prompt:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing prompt"
+        )
+    job = await job_service.create_job(IMAGE_JOB_KIND, {"prompt": prompt, "chunk_id": chunk_id}, user.id, session)
+    await job_queue.submit(job.id)
+    return job_service.to_read(job)
+
+
+
+@router.post("/metatext/{metatext_id}/ai-pipeline", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_metatext_pipeline(
+    metatext_id: int,
+    req: MetatextPipelineRequest,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(get_current_user),
+    job_service: AsyncJobService = Depends(get_async_job_service),
+    job_queue: JobQueue = Depends(get_pipeline_job_queue),
+    buckets: TokenBucketStore = Depends(get_token_bucket_store)
+):
+    """
+    Queue an AI operation over every chunk of a metatext. Requires authentication.
+
+    The user's AI quota is charged the operation's cost for every chunk: the
+    first PIPELINE_QUOTA_BATCH_SIZE chunks here, the rest batch by batch while
+    the job runs, which stops early once the bucket cannot pay.
+    Progress (progress_done / progress_total) is reported on the job; poll
+    GET /jobs/{id} or stream GET /jobs/{id}/events.
+    """
+    try:
+        chunk_count = await session.run_sync(
+            lambda sync_session: MetatextPipelineService.validate_request(
+                metatext_id, user.id, req.operation, req.style_title, sync_session
+            )
+        )
+    except PromptValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    except MetatextNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meta-text not found."
+        )
+    per_chunk_cost = CONFIG.AI_RATE_LIMIT_COSTS[PIPELINE_QUOTA_OPERATIONS[req.operation]]
+    prepaid_chunks = min(chunk_count, CONFIG.PIPELINE_QUOTA_BATCH_SIZE)
+    charge_ai_quota(user.id, "pipeline", prepaid_chunks * per_chunk_cost, buckets)
+    concurrency = min(req.concurrency or CONFIG.PIPELINE_CONCURRENCY, CONFIG.MAX_PIPELINE_CONCURRENCY)
+    payload = {
+        "metatext_id": metatext_id,
+        "operation": req.operation,
+        "style_title": req.style_title,
+        "concurrency": concurrency,
+        "prepaid_chunks": prepaid_chunks,
+    }
+    job = await job_service.create_job(PIPELINE_JOB_KIND, payload, user.id, session)
+    await job_queue.submit(job.id)
+    return job_service.to_read(job)
+
+
+
+@router.get("/generate-rewrite/{chunk_id}", dependencies=[Depends(ai_quota("rewrite"))])
 async def generate_rewrite(
     chunk_id: int,
     style_title: str,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
     ai_service: AIService = Depends(get_ai_service)
 ) -> RewriteRead:
     """Generate a compressed version of a chunk's text in a given style using AI (does not save). Requires authentication."""
     try:
-        return ai_service.generate_rewrite(chunk_id, style_title, session)
+        return await ai_service.generate_rewrite(chunk_id, style_title, session)
     except ChunkNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
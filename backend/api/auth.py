@@ -2,21 +2,31 @@
 # Authentication endpoints and logic for the FastAPI backend.
 # Handles user registration, login, logout, token refresh, and user info.
 # Errors are caught by FastAPI's global exception handlers defined in main.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from fastapi import APIRouter, Depends, Response, Cookie, Header, HTTPException, status, Request
 from sqlmodel import Session
 from loguru import logger
-from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from backend.config import BackendConfig as CONFIG
 from backend.db import get_session
+from backend.rate_limit import limiter
 from backend.dependencies import AuthService 
 from backend.services.schemas import Token, UserCreate, UserRead, LoginRequest
 
 
 router = APIRouter()
 
-# Create limiter instance - this will be automatically shared when the app is configured
-limiter = Limiter(key_func=get_remote_address)
+
+# Login and registration wait on bcrypt (see backend/password_hashing.py). They run on these
+# threads rather than the shared threadpool, so a burst of them cannot stall other sync routes.
+_password_executor = ThreadPoolExecutor(CONFIG.PASSWORD_AUTH_THREADS, thread_name_prefix="auth-password")
+
+async def run_password_work(fn, *args):
+    """Run a blocking AuthService call that hashes or verifies a password on the dedicated auth threads."""
+    return await asyncio.get_running_loop().run_in_executor(_password_executor, partial(fn, *args))
 
 # Dependency injection function for AuthService
 def get_auth_service() -> AuthService:
@@ -26,7 +36,7 @@ def get_auth_service() -> AuthService:
 
 @router.post("/auth/register", response_model=UserRead)
 @limiter.limit("3/minute", key_func=lambda request: f"register:{get_remote_address(request)}")  # 3 registration attempts per minute
-def register(
+async def register(
     request: Request,  # Required for rate limiting
     user: UserCreate,
     session: Session = Depends(get_session),
@@ -41,7 +51,7 @@ def register(
     logger.info(f"User registration attempt for username: {user.username} from IP: {client_ip}")
     
     try:
-        new_user = auth_service.register_user(user.username, user.password, session)
+        new_user = await run_password_work(auth_service.register_user, user.username, user.password, session)
         logger.info(f"User registration successful for username: {user.username} (id={new_user.id}) from IP: {client_ip}")
         return UserRead.model_validate(new_user.model_dump())
     except Exception as e:
@@ -51,7 +61,7 @@ def register(
 
 @router.post("/auth/login")
 @limiter.limit("5/minute", key_func=lambda request: f"login:{get_remote_address(request)}")  # 5 login attempts per minute
-def login(
+async def login(
     request: Request,  # Required for rate limiting
     response: Response,
     login_req: LoginRequest,
@@ -68,7 +78,7 @@ def login(
     logger.info(f"Login attempt for username: {login_req.username} from IP: {client_ip}")
     
     try:
-        tokens = auth_service.login_user(login_req.username, login_req.password, session)
+        tokens = await run_password_work(auth_service.login_user, login_req.username, login_req.password, session)
         # Set both tokens as httpOnly cookies
         access_token_expires = auth_service.get_access_token_expires()
         auth_service.set_access_token_cookie(response, tokens.access_token, access_token_expires)
@@ -4,14 +4,16 @@ Handles CRUD operations for text chunks including splitting and combining operat
 """
 
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlmodel import Session
-from typing import List
-
-from backend.db import get_session
-from backend.models import ChunkRead, ChunkUpdate, CreateChunk, User
-from backend.services.chunk_service import ChunkService
-from backend.dependencies import get_current_user,  get_chunk_service
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Literal
+
+from backend.db import get_async_session
+from backend.models import ChunkRead, ChunkUpdate, CreateChunk, SimilarPassage, User
+from backend.config import BackendConfig as CONFIG
+from backend.services.chunk_service import AsyncChunkService
+from backend.services.similarity_service import AsyncSimilarityService
+from backend.dependencies import get_current_user, get_async_chunk_service, get_async_similarity_service
 from backend.exceptions.chunk_exceptions import (
     ChunkNotFoundError,
     InvalidSplitIndexError,
@@ -26,24 +28,43 @@ router = APIRouter()
 @router.post("/chunk", response_model=ChunkRead, name="create_chunk")
 async def create_chunk(
     chunk_data: CreateChunk = Body(...),
-    session: Session = Depends(get_session),
-    service: ChunkService = Depends(get_chunk_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncChunkService = Depends(get_async_chunk_service),
     user: User = Depends(get_current_user)
 ):
     """Create a new chunk. Requires authentication. metatextId must belong to the current user."""
-    chunk = service.create_chunk(chunk_data, user.id, session)
+    chunk = await service.create_chunk(chunk_data, user.id, session)
     return ChunkRead.model_validate(chunk, from_attributes=True)
 
 @router.get("/chunk/{chunk_id}", response_model=ChunkRead, name="get_chunk")
 async def get_chunk(
     chunk_id: int,
-    session: Session = Depends(get_session),
-    service: ChunkService = Depends(get_chunk_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncChunkService = Depends(get_async_chunk_service),
     user = Depends(get_current_user)
 ):
     """Get a specific chunk with its AI images. Requires authentication."""
     try:
-        return service.get_chunk(chunk_id, user.id, session)
+        return await service.get_chunk(chunk_id, user.id, session)
+    except ChunkNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chunk not found"
+        )
+
+
+@router.get("/chunk/{chunk_id}/similar", response_model=List[SimilarPassage], name="get_similar_chunks")
+async def get_similar_chunks(
+    chunk_id: int,
+    k: int = Query(CONFIG.DEFAULT_SIMILAR_PASSAGES, ge=1, le=CONFIG.MAX_SIMILAR_PASSAGES),
+    scope: Literal["metatext", "library"] = "metatext",
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSimilarityService = Depends(get_async_similarity_service),
+    user = Depends(get_current_user)
+):
+    """Find the passages most similar to a chunk, in its metatext or across the user's library."""
+    try:
+        return await service.similar_to_chunk(chunk_id, user.id, session, k=k, scope=scope)
     except ChunkNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,13 +76,13 @@ async def get_chunk(
 async def split_chunk(
     chunk_id: int,
     word_index: int,
-    session: Session = Depends(get_session),
-    service: ChunkService = Depends(get_chunk_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncChunkService = Depends(get_async_chunk_service),
     user = Depends(get_current_user)
 ):
     """Split a chunk at the specified word index. Requires authentication."""
     try:
-        return service.split_chunk(chunk_id, word_index, user.id, session)
+        return await service.split_chunk(chunk_id, word_index, user.id, session)
     except ChunkNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,14 +99,14 @@ async def split_chunk(
 async def combine_chunks(
     first_chunk_id: int,
     # second_chunk_id: int,
-    session: Session = Depends(get_session),
-    service: ChunkService = Depends(get_chunk_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncChunkService = Depends(get_async_chunk_service),
     user: User = Depends(get_current_user)
 ):
     """Combine two chunks into one. Requires authentication."""
     try:
-        # return service.combine_chunks(first_chunk_id, second_chunk_id, user.id, session)
-        return service.combine_chunks(first_chunk_id, user.id, session)
+        # return await service.combine_chunks(first_chunk_id, second_chunk_id, user.id, session)
+        return await service.combine_chunks(first_chunk_id, user.id, session)
     except ChunkNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,14 +123,14 @@ async def combine_chunks(
 async def update_chunk(
     chunk_id: int,
     update_data: ChunkUpdate,
-    session: Session = Depends(get_session),
-    service: ChunkService = Depends(get_chunk_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncChunkService = Depends(get_async_chunk_service),
     user: User = Depends(get_current_user)
 ):
     """Update a chunk with new data. Requires authentication."""
     try:
         update_dict = update_data.model_dump(exclude_unset=True, exclude_none=True)
-        return service.update_chunk(chunk_id, update_dict, user.id, session)
+        return await service.update_chunk(chunk_id, update_dict, user.id, session)
     except ChunkNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -4,22 +4,28 @@ The /explain is when the user wants to explain a word or a chunk.
 The /metatext/{metatext_id}/review is when the user wants to get all explanation data for a specific metatext.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from slowapi.util import get_remote_address
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.db import get_session
-from backend.models import  ExplanationRequest2, ExplanationResponse2, ExplanationsResponse, ExplanationRequest
+from backend.db import get_async_session, get_session
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.models import  ExplanationRequest2, ExplanationLookupResponse, ExplanationsResponse, ExplanationRequest, ExplanationType
 from backend.services.ai_service import AIService
 from backend.services.explanation_service import ExplanationService 
-from backend.dependencies import get_ai_service, get_explanation_service, get_current_user
+from backend.rate_limit import limiter
+from backend.dependencies import ai_quota, get_ai_service, get_explanation_service, get_current_user
 
 
 router = APIRouter()
 
-@router.post("/explain")
-def explain(
+@router.post("/explain", dependencies=[Depends(ai_quota("explain"))])
+async def explain(
     request: ExplanationRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     ai_service: AIService = Depends(get_ai_service),
     explanation_service: ExplanationService = Depends(get_explanation_service),
     user = Depends(get_current_user)
@@ -32,16 +38,22 @@ def explain(
     print(f"Request: {request}")
     if request.chunk_id is not None:
         # Chunk explanation
-        return ai_service.generate_chunk_explanation(user, request.chunk_id, session)
+        return await ai_service.generate_chunk_explanation(user, request.chunk_id, session)
     elif request.metatext_id is not None:
         # Words explanation (words and context are required fields, so they'll always be present)
-        return explanation_service.explain(
-            user=user,
-            words=request.words,
-            context=request.context,
-            metatext_id=request.metatext_id,
-            session=session
-        )
+        try:
+            return await explanation_service.explain(
+                user=user,
+                words=request.words,
+                context=request.context,
+                metatext_id=request.metatext_id,
+                session=session
+            )
+        except MetatextNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Meta-text not found."
+            )
     else:
         raise HTTPException(status_code=400, detail="metatext_id is required for words explanation.")
 
@@ -49,23 +61,37 @@ def explain(
 @router.get("/metatext/{metatext_id}/review", name="get_review_data", response_model=ExplanationsResponse)
 def get_review_data(
     metatext_id: int,
+    type: ExplanationType | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=CONFIG.MAX_REVIEW_PAGE_SIZE),
+    summary: bool = False,
     session: Session = Depends(get_session),
     service: ExplanationService = Depends(get_explanation_service),
     user = Depends(get_current_user)
 ):
     """
-    Get all review data for a specific metatext and user.
-    Returns a dictionary with all relevant review data (wordlist, explanations, etc).
+    Get review data for a specific metatext and user, oldest first.
+    Filter with `type`, drop the long texts with `summary`, and page with `limit`;
+    pass the returned next_cursor as `cursor` to fetch the next page.
     """
-    return service.get_review_data(metatext_id, user.id, session)
+    try:
+        return service.get_review_data(
+            metatext_id, user.id, session, type=type, cursor=cursor, limit=limit, summary=summary
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
 
 
 # Experiments page
 
-@router.post("/explain2", response_model=ExplanationResponse2)
-def explain2(
-    request: ExplanationRequest2,
-    session: Session = Depends(get_session),
+@router.post("/explain2", response_model=ExplanationLookupResponse)
+@limiter.limit(CONFIG.EXPLAIN2_RATE_LIMIT, key_func=lambda request: f"explain2:{get_remote_address(request)}")
+async def explain2(
+    request: Request,  # Required for rate limiting
+    req: ExplanationRequest2,
     ai_service: AIService = Depends(get_ai_service),
     explanation_service: ExplanationService = Depends(get_explanation_service),
     # user = Depends(get_current_user)
@@ -74,8 +100,8 @@ def explain2(
     Consolidated endpoint for explaining words or a chunk. Requires authentication.
     Determines the operation based on which fields are provided.
     """
-    return explanation_service.explain2(
-            word=request.word,
-            session=session,
-            context=request.context
+    return await explanation_service.explain2(
+            word=req.word,
+            context=req.context,
+            include_comprehensive=req.include_comprehensive
         )
\ No newline at end of file
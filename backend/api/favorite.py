@@ -1,12 +1,13 @@
 """
 API router for favorite chunk operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from typing import List
-from backend.db import get_session
-from backend.models import ChunkRead
-from backend.services.favorite_service import FavoriteService
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.config import BackendConfig as CONFIG
+from backend.db import get_async_session
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.models import ChunkRead, FavoritePage
+from backend.services.favorite_service import AsyncFavoriteService
 from backend.dependencies import get_current_user
 
 router = APIRouter()
@@ -14,28 +15,38 @@ router = APIRouter()
 @router.post("/chunk/{chunk_id}/favorite", response_model=ChunkRead, name="favorite_chunk")
 async def favorite_chunk(
     chunk_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user = Depends(get_current_user)
 ):
     """Mark a chunk as favorite for the current user."""
-    chunk = FavoriteService.favorite_chunk(chunk_id, user.id, session)
+    chunk = await AsyncFavoriteService.favorite_chunk(chunk_id, user.id, session)
     return ChunkRead.model_validate(chunk, from_attributes=True)
 
 @router.delete("/chunk/{chunk_id}/favorite", response_model=ChunkRead, name="unfavorite_chunk")
 async def unfavorite_chunk(
     chunk_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user = Depends(get_current_user)
 ):
     """Remove a chunk from the current user's favorites."""
-    chunk = FavoriteService.unfavorite_chunk(chunk_id, user.id, session)
+    chunk = await AsyncFavoriteService.unfavorite_chunk(chunk_id, user.id, session)
     return ChunkRead.model_validate(chunk, from_attributes=True)
 
-@router.get("/user/me/favorite_chunks", response_model=List[ChunkRead], name="get_favorite_chunks")
+@router.get("/user/me/favorite_chunks", response_model=FavoritePage, name="get_favorite_chunks")
 async def get_favorite_chunks(
-    session: Session = Depends(get_session),
+    cursor: str | None = None,
+    limit: int = Query(CONFIG.DEFAULT_FAVORITE_PAGE_SIZE, ge=1, le=CONFIG.MAX_FAVORITE_PAGE_SIZE),
+    session: AsyncSession = Depends(get_async_session),
     user = Depends(get_current_user)
 ):
-    """Get all favorite chunks for the current user."""
-    chunks = FavoriteService.get_favorite_chunks(user.id, session)
-    return [ChunkRead.model_validate(chunk, from_attributes=True) for chunk in chunks]
+    """
+    Get the current user's favorite chunks, newest first, with a short preview of each.
+    Pass the returned next_cursor as `cursor` to fetch the next page.
+    """
+    try:
+        return await AsyncFavoriteService.get_favorite_chunks(user.id, session, cursor=cursor, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
@@ -0,0 +1,86 @@
+"""
+API router for background job status.
+"""
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.db import get_async_session
+from backend.models import Job, JobRead
+from backend.config import BackendConfig as CONFIG
+from backend.dependencies import get_async_job_service, get_current_user
+from backend.exceptions.job_exceptions import JobNotFoundError
+from backend.services.job_service import AsyncJobService, TERMINAL_JOB_STATUSES
+
+router = APIRouter()
+
+
+@router.get("/jobs/{job_id}", response_model=JobRead, name="get_job")
+async def get_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user = Depends(get_current_user),
+    job_service: AsyncJobService = Depends(get_async_job_service)
+):
+    """Get the status and, once finished, the result of a background job."""
+    try:
+        job = await job_service.get_job_for_user(job_id, user.id, session)
+    except JobNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job_service.to_read(job)
+
+
+@router.get("/jobs/{job_id}/events", name="get_job_events")
+async def get_job_events(
+    job_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user = Depends(get_current_user),
+    job_service: AsyncJobService = Depends(get_async_job_service)
+):
+    """
+    Stream job status and progress changes as server-sent events until the job finishes.
+
+    Each status change is sent as a `status` event and each progress change
+    of a running job as a `progress` event, both carrying the job as JSON;
+    comment lines keep the connection alive while nothing changes.
+    """
+    try:
+        await job_service.get_job_for_user(job_id, user.id, session)
+    except JobNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    # The request session may be closed once the response starts, so poll with short-lived sessions
+    engine = session.bind
+
+    async def event_stream():
+        last_state = None
+        idle_seconds = 0.0
+        while True:
+            async with AsyncSession(engine) as poll_session:
+                job = await poll_session.get(Job, job_id)
+                job_read = job_service.to_read(job) if job else None
+            if job_read is None:
+                yield "event: error\ndata: {\"detail\": \"Job not found\"}\n\n"
+                return
+            state = (job_read.status, job_read.progress_done, job_read.progress_total, job_read.progress_failed)
+            if state != last_state:
+                event = "status" if last_state is None or job_read.status != last_state[0] else "progress"
+                last_state = state
+                idle_seconds = 0.0
+                yield f"event: {event}\ndata: {json.dumps(job_read.model_dump(mode='json'))}\n\n"
+                if job_read.status in TERMINAL_JOB_STATUSES:
+                    return
+            elif idle_seconds >= CONFIG.JOB_EVENTS_KEEPALIVE_SECONDS:
+                idle_seconds = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(CONFIG.JOB_EVENTS_POLL_SECONDS)
+            idle_seconds += CONFIG.JOB_EVENTS_POLL_SECONDS
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
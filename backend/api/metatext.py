@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.db import get_session
-from backend.models import CreateMetatextRequest, MetatextDetail, MetatextSummary
-from backend.services.metatext_service import MetatextService
+from backend.config import BackendConfig as CONFIG
+from backend.db import get_async_session
+from backend.models import ChunkPage, CreateMetatextRequest, MetatextDetail, MetatextSummary
+from backend.services.metatext_service import AsyncMetatextService
 from backend.exceptions.metatext_exceptions import (
     SourceDocumentNotFoundError,
     MetatextNotFoundError,
     MetatextTitleExistsError,
     MetatextCreationError
 )
-from backend.dependencies import get_current_user, get_metatext_service
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.dependencies import get_current_user, get_async_metatext_service
 
 
 router = APIRouter()
 
 
 @router.post("/metatext", response_model=MetatextSummary, name="create_metatext")
-def create_metatext(
+async def create_metatext(
     req: CreateMetatextRequest,
-    session: Session = Depends(get_session),
-    service: MetatextService = Depends(get_metatext_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
     user = Depends(get_current_user)
 ):
     """
@@ -29,7 +31,7 @@ def create_metatext(
     """
     try:
         # Pass user context explicitly to the service
-        metatext = service.create_metatext_with_chunks(
+        metatext = await service.create_metatext_with_chunks(
             title=req.title,
             source_doc_id=req.sourceDocId,
             user_id=user.id,
@@ -54,25 +56,25 @@ def create_metatext(
 
 
 @router.get("/metatext", response_model=list[MetatextSummary], name="list_metatexts")
-def list_metatexts(
-    session: Session = Depends(get_session),
-    service: MetatextService = Depends(get_metatext_service),
+async def list_metatexts(
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
     user = Depends(get_current_user)
 ):
     """List all metatexts for the authenticated user. Refactored to use 'user' variable."""
-    return service.list_user_metatexts(user_id=user.id, session=session)
+    return await service.list_user_metatexts(user_id=user.id, session=session)
 
 
 @router.get("/metatext/{metatext_id}", response_model=MetatextDetail, name="get_metatext")
-def get_metatext(
+async def get_metatext(
     metatext_id: int,
-    session: Session = Depends(get_session),
-    service: MetatextService = Depends(get_metatext_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
     user = Depends(get_current_user)
 ):
     """Get a specific metatext by ID for the authenticated user. Refactored to use 'user' variable."""
     try:
-        return service.get_metatext_by_id_and_user(metatext_id, user.id, session)
+        return await service.get_metatext_by_id_and_user(metatext_id, user.id, session)
     except MetatextNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,19 +82,46 @@ def get_metatext(
         )
 
 
+@router.get("/metatext/{metatext_id}/chunks", response_model=ChunkPage, name="list_metatext_chunks")
+async def list_metatext_chunks(
+    metatext_id: int,
+    cursor: str | None = None,
+    limit: int = Query(CONFIG.DEFAULT_CHUNK_PAGE_SIZE, ge=1, le=CONFIG.MAX_CHUNK_PAGE_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
+    user = Depends(get_current_user)
+):
+    """
+    Get a window of a metatext's chunks ordered by position.
+    Pass the returned next_cursor as `cursor` to stream the rest of the book.
+    """
+    try:
+        return await service.get_chunks_page(metatext_id, user.id, session, cursor=cursor, limit=limit)
+    except MetatextNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meta-text not found."
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+
+
 # --- Download Metatext as JSON ---
 @router.get("/metatext/{metatext_id}/download", name="download_metatext")
-def download_metatext(
+async def download_metatext(
     metatext_id: int,
-    session: Session = Depends(get_session),
-    service: MetatextService = Depends(get_metatext_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
     user = Depends(get_current_user)
 ):
     """
     Download a Metatext (and all related data) as a JSON file for backup or transfer.
     """
     try:
-        metatext = service.get_metatext_by_id_and_user(metatext_id, user.id, session)
+        metatext = await service.get_metatext_by_id_and_user(metatext_id, user.id, session)
         # Use MetatextDetail for serialization (includes chunks)
         detail = MetatextDetail.model_validate(metatext)
         import json
@@ -110,16 +139,16 @@ def download_metatext(
 
 
 @router.delete("/metatext/{metatext_id}", name="delete_metatext")
-def delete_metatext(
+async def delete_metatext(
     metatext_id: int,
-    session: Session = Depends(get_session),
-    service: MetatextService = Depends(get_metatext_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncMetatextService = Depends(get_async_metatext_service),
     user = Depends(get_current_user)
 ) -> dict:
     """Delete a metatext by ID for the authenticated user. Refactored to use 'user' variable."""
     try:
         # Only allow deletion if the metatext belongs to the current user
-        return service.delete_metatext(metatext_id, user.id, session)
+        return await service.delete_metatext(metatext_id, user.id, session)
     except TypeError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,15 @@
+"""
+API router exposing process metrics for scraping.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.metrics import metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Request, database and OpenAI metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,59 @@
+"""
+API router for full-text search.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.db import get_async_session
+from backend.models import SearchPage
+from backend.config import BackendConfig as CONFIG
+from backend.dependencies import get_current_user, get_async_search_service
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.exceptions.search_exceptions import InvalidSearchQueryError, SearchUnavailableError
+from backend.services.search_service import AsyncSearchService
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=SearchPage, name="search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description='Terms, "quoted phrases" and prefix* terms; all must match'),
+    metatext_id: int | None = None,
+    source_document_id: int | None = None,
+    kind: Literal["chunk", "explanation"] | None = None,
+    cursor: str | None = None,
+    limit: int = Query(CONFIG.SEARCH_DEFAULT_PAGE_SIZE, ge=1, le=CONFIG.SEARCH_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSearchService = Depends(get_async_search_service),
+    user = Depends(get_current_user)
+):
+    """
+    Ranked full-text search over the user's chunks, notes, summaries and explanations.
+    Pass the returned next_cursor as `cursor` to fetch more results.
+    """
+    try:
+        return await service.search(
+            user.id, q, session,
+            metatext_id=metatext_id,
+            source_document_id=source_document_id,
+            kind=kind,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidSearchQueryError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query has no searchable terms."
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+    except SearchUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Full-text search requires the SQLite database."
+        )
@@ -5,12 +5,12 @@ Handles CRUD operations for source documents including file uploads.
 
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.models import SourceDocumentSummary, SourceDocumentDetail, SourceDocumentUpdate, DeleteResponse, User
-from backend.db import get_session
-from backend.services.source_document_service import SourceDocumentService
-from backend.dependencies import get_current_user, get_source_document_service
+from backend.db import get_async_session
+from backend.services.source_document_service import AsyncSourceDocumentService
+from backend.dependencies import get_current_user, get_async_source_document_service
 from backend.exceptions.source_document_exceptions import (
     SourceDocumentNotFoundError,
     SourceDocumentTitleExistsError,
@@ -32,8 +32,8 @@ router = APIRouter(prefix="/source-documents")
 async def create_source_document(
     title: Annotated[str, Form()],
     file: Annotated[UploadFile, File()],
-    session: Session = Depends(get_session),
-    service: SourceDocumentService = Depends(get_source_document_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSourceDocumentService = Depends(get_async_source_document_service),
     user: User = Depends(get_current_user)
 ):
     """Create a new source document from an uploaded file. Requires authentication."""
@@ -64,25 +64,25 @@ async def create_source_document(
 
 @router.get("", response_model=list[SourceDocumentSummary], name="list_source_documents")
 async def list_source_documents(
-    session: Session = Depends(get_session),
-    service: SourceDocumentService = Depends(get_source_document_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSourceDocumentService = Depends(get_async_source_document_service),
     user: User = Depends(get_current_user)
 ):
     """List all source documents for the authenticated user."""
-    return service.list_all_source_documents(session=session, user=user)
+    return await service.list_all_source_documents(session=session, user=user)
 
 
 
 @router.get("/{doc_id}", response_model=SourceDocumentDetail, name="get_source_document")
 async def get_source_document(
     doc_id: int,
-    session: Session = Depends(get_session),
-    service: SourceDocumentService = Depends(get_source_document_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSourceDocumentService = Depends(get_async_source_document_service),
     user = Depends(get_current_user)
 ):
     """Retrieve a source document by ID for the authenticated user."""
     try:
-        return service.get_source_document_by_id(doc_id, session, user=user)
+        return await service.get_source_document_by_id(doc_id, session, user=user)
     except SourceDocumentNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -94,13 +94,13 @@ async def get_source_document(
 @router.delete("/{doc_id}", name="delete_source_document", response_model=DeleteResponse)
 async def delete_source_document(
     doc_id: int,
-    session: Session = Depends(get_session),
-    service: SourceDocumentService = Depends(get_source_document_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSourceDocumentService = Depends(get_async_source_document_service),
     user: User = Depends(get_current_user)
 ) -> DeleteResponse:
     """Delete a source document if no related MetaText records exist. Only for authenticated user."""
     try:
-        return service.delete_source_document(doc_id, session, user=user)
+        return await service.delete_source_document(doc_id, session, user=user)
     except SourceDocumentNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -118,15 +118,15 @@ async def delete_source_document(
 async def update_source_document(
     doc_id: int,
     update_data: SourceDocumentUpdate,
-    session: Session = Depends(get_session),
-    service: SourceDocumentService = Depends(get_source_document_service),
+    session: AsyncSession = Depends(get_async_session),
+    service: AsyncSourceDocumentService = Depends(get_async_source_document_service),
     user: User = Depends(get_current_user)
 ):
     """Update a source document with provided fields. Only for authenticated user."""
     try:
         # Convert to dict and exclude None values for partial updates
         update_dict = update_data.model_dump(exclude_unset=True, exclude_none=True)
-        return service.update_source_document(
+        return await service.update_source_document(
             doc_id=doc_id,
             update_data=update_dict,
             session=session,
@@ -0,0 +1 @@
+"""Standalone performance benchmarks; run each module with `python -m backend.benchmarks.<name>`."""
@@ -0,0 +1,92 @@
+"""
+Benchmark authenticated request throughput on GET /api/chunk/{id}.
+
+Runs the real auth dependency against a temporary SQLite database and
+compares three ways of resolving the access token to a user:
+
+- username: a token without the uid claim, looked up by username per request (the old path)
+- user id, no cache: the uid claim, looked up by primary key per request
+- user id, cached: the uid claim served from the principal cache
+
+Each is timed end to end through the app and as the auth dependency alone,
+since the request path also pays for thread hand-offs and the chunk query.
+
+    python -m backend.benchmarks.auth_throughput --requests 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'auth.sqlite')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-of-at-least-32-bytes")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from backend.config import BackendConfig as CONFIG  # noqa: E402
+from backend.db import engine  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models import Chunk, Metatext, SourceDocument, User  # noqa: E402
+from backend.services.auth_service import AuthService  # noqa: E402
+from backend.services.jwt_utils import create_access_token  # noqa: E402
+from backend.services.principal_cache import principal_cache  # noqa: E402
+
+
+def _seed() -> int:
+    with Session(engine) as session:
+        session.add(User(id=1, username="bench", hashed_password=""))
+        session.add(SourceDocument(id=1, user_id=1, title="bench", text=""))
+        session.add(Metatext(id=1, title="bench", source_document_id=1, user_id=1, text=""))
+        chunk = Chunk(text="a chunk of text " * 50, position=1.0, metatext_id=1)
+        session.add(chunk)
+        session.commit()
+        return chunk.id
+
+
+def _requests_per_second(client: TestClient, url: str, token: str, requests: int) -> float:
+    client.cookies.set("access_token", token)
+    for _ in range(min(50, requests)):  # Warm pools and the cache
+        assert client.get(url).status_code == 200
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(url)
+    return requests / (time.perf_counter() - started)
+
+
+def _lookups_per_second(token: str, lookups: int) -> float:
+    auth_service = AuthService()
+    with Session(engine) as session:
+        auth_service.get_user_from_access_token(token, session)
+        started = time.perf_counter()
+        for _ in range(lookups):
+            auth_service.get_user_from_access_token(token, session)
+            session.expunge_all()  # Like a fresh request session, so lookups are not served from the identity map
+        return lookups / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    chunk_id = _seed()
+    url = f"/api/chunk/{chunk_id}"
+    legacy_token = create_access_token(data={"sub": "bench"})
+    token = create_access_token(data={"sub": "bench", "uid": 1})
+    with TestClient(app) as client:
+        runs = [("username", legacy_token, False), ("user id, no cache", token, False), ("user id, cached", token, True)]
+        for name, run_token, cached in runs:
+            CONFIG.PRINCIPAL_CACHE_ENABLED = cached
+            principal_cache.clear()
+            rate = _requests_per_second(client, url, run_token, args.requests)
+            lookups = _lookups_per_second(run_token, args.requests * 10)
+            print(f"{name:>18}: {rate:,.0f} req/s on GET {url}, {lookups:,.0f} auth lookups/s")
+    engine.dispose()
+    _tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
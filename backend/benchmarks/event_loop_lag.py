@@ -0,0 +1,130 @@
+"""
+Benchmark event-loop lag when async handlers use the sync vs the async session.
+
+Reader and writer coroutines run on one event loop, like requests in one
+uvicorn worker. In "sync" mode they call the blocking Session directly (what
+the async handlers did before), in "async" mode they await AsyncSession over
+aiosqlite. A heartbeat task measures how late the loop wakes it up: in sync
+mode every query, including reads queued behind a write's lock, stalls the
+whole loop.
+
+    python -m backend.benchmarks.event_loop_lag --readers 16 --writers 4 --ops 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import update
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.db import create_async_db_engine, create_db_engine, to_async_url
+from backend.models import Chunk, Metatext
+
+CHUNKS = 2000
+HEARTBEAT_SECONDS = 0.005
+
+
+def _seed(url: str) -> None:
+    engine = create_db_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Metatext(id=1, title="bench", source_document_id=1, user_id=1, text=""))
+        session.add_all(Chunk(text=f"chunk {i} " * 50, position=float(i), metatext_id=1) for i in range(CHUNKS))
+        session.commit()
+    engine.dispose()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(time.perf_counter() - started - HEARTBEAT_SECONDS)
+
+
+async def _run(mode: str, url: str, readers: int, writers: int, ops: int) -> dict:
+    sync_engine = create_db_engine(url)
+    async_engine = create_async_db_engine(to_async_url(url))
+    read_latencies: list[float] = []
+
+    async def read_page(i: int) -> None:
+        statement = select(Chunk).where(Chunk.metatext_id == 1, Chunk.position >= (i * 37) % CHUNKS).limit(200)
+        if mode == "sync":
+            with Session(sync_engine) as session:
+                session.exec(statement).all()
+        else:
+            async with AsyncSession(async_engine) as session:
+                (await session.exec(statement)).all()
+
+    async def write_note(worker: int, i: int) -> None:
+        statement = update(Chunk).where(Chunk.metatext_id == 1).values(note=f"note {worker}-{i}")
+        if mode == "sync":
+            with Session(sync_engine) as session:
+                session.exec(statement)  # type: ignore
+                session.commit()
+        else:
+            async with AsyncSession(async_engine) as session:
+                await session.exec(statement)  # type: ignore
+                await session.commit()
+
+    async def reader(worker: int) -> None:
+        for i in range(ops):
+            started = time.perf_counter()
+            await read_page(worker * ops + i)
+            read_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+    async def writer(worker: int) -> None:
+        for i in range(ops):
+            await write_note(worker, i)
+            await asyncio.sleep(0)
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(reader(r) for r in range(readers)), *(writer(w) for w in range(writers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+    sync_engine.dispose()
+    await async_engine.dispose()
+    return {
+        "loop lag p50 ms": _percentile(lags, 0.5) if lags else float("nan"),
+        "loop lag p99 ms": _percentile(lags, 0.99) if lags else float("nan"),
+        "loop lag max ms": max(lags) * 1000 if lags else float("nan"),
+        "heartbeats": len(lags),
+        "read p99 ms": _percentile(read_latencies, 0.99),
+        "reads/s": len(read_latencies) / elapsed,
+        "seconds": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=50, help="operations per reader/writer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+        _seed(url)
+        for mode in ("sync", "async"):
+            result = asyncio.run(_run(mode, url, args.readers, args.writers, args.ops))
+            print(f"{mode:>6}: " + ", ".join(
+                f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in result.items()
+            ))
+    print(f"Loop lag is how late a {HEARTBEAT_SECONDS * 1000:.0f}ms timer fired, i.e. how long any other request would stall.")
+
+
+if __name__ == "__main__":
+    main()
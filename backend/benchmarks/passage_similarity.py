@@ -0,0 +1,60 @@
+"""
+Benchmark passage embedding throughput and top-k similarity query latency.
+
+Builds passage index files for --chunks synthetic chunks, either in one
+metatext or spread over --metatexts files (a whole library), then times
+most_similar queries the way the similar-passages endpoint runs them.
+
+    python -m backend.benchmarks.passage_similarity --chunks 100000 --metatexts 100
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from backend.services.passage_index import PassageIndex
+
+VOCABULARY = [f"w{i}" for i in range(20_000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--metatexts", type=int, default=100, help="files the chunks are spread over")
+    parser.add_argument("--words", type=int, default=80, help="words per chunk")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [" ".join(rng.choices(VOCABULARY, WEIGHTS, k=args.words)) for _ in range(args.chunks)]
+    per_file = -(-args.chunks // args.metatexts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = PassageIndex(directory=tmp)
+        started = time.perf_counter()
+        for metatext_id in range(args.metatexts):
+            offset = metatext_id * per_file
+            index.build(metatext_id, list(enumerate(texts[offset:offset + per_file], start=offset)))
+        elapsed = time.perf_counter() - started
+        print(f"indexed {args.chunks} chunks in {elapsed:.1f}s ({args.chunks / elapsed:.0f} chunks/s)")
+
+        queries = index.embedder.embed(rng.sample(texts, args.repeat))
+        metatext_ids = list(range(args.metatexts))
+        for label, scope in (("one metatext", metatext_ids[:1]), ("library", metatext_ids)):
+            timings = []
+            for query in queries:
+                started = time.perf_counter()
+                index.most_similar(query, scope, args.k)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{label:>13}: p50={statistics.median(timings):.2f}ms max={max(timings):.2f}ms")
+
+        started = time.perf_counter()
+        index.upsert(0, {0: texts[1]})
+        print(f"in-place re-embed of one chunk: {(time.perf_counter() - started) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark password hashing under a burst of concurrent logins.
+
+--clients threads verify passwords back to back (as login handlers would)
+while a probe thread repeatedly runs a small pure-Python task standing in
+for another request. Runs once with bcrypt on the calling threads and once
+in the process pool, and reports verifications per second and the probe's
+latency, which shows how much the burst slows everything else down.
+
+    python -m backend.benchmarks.password_hashing --clients 16 --workers 4 --rounds 12
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from backend.password_hashing import PasswordHasher, calibrate_rounds
+
+
+def _probe() -> None:
+    sum(i * i for i in range(20_000))
+
+
+def _run(hasher: PasswordHasher, clients: int, seconds: float) -> tuple[float, list[float]]:
+    hashed = hasher.hash("benchmark password")
+    hasher.verify("benchmark password", hashed)  # Start the pool before timing
+    verified = 0
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client() -> None:
+        nonlocal verified
+        while not stop.is_set():
+            hasher.verify("benchmark password", hashed)
+            with lock:
+                verified += 1
+
+    probe_ms = []
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while time.perf_counter() - started < seconds:
+        probe_started = time.perf_counter()
+        _probe()
+        probe_ms.append((time.perf_counter() - probe_started) * 1000)
+        time.sleep(0.01)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return verified / (time.perf_counter() - started), probe_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent logins")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="processes in the pool")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost (default: calibrate to 250ms)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    rounds = args.rounds or calibrate_rounds(target_ms=250, min_rounds=4, max_rounds=15)
+    baseline = statistics.median([_timed_probe() for _ in range(50)])
+    print(f"bcrypt cost {rounds}, {args.clients} clients, idle probe {baseline:.1f}ms")
+    for name, workers in (("calling threads", 0), (f"process pool ({args.workers})", args.workers)):
+        hasher = PasswordHasher(workers=workers, rounds=rounds)
+        try:
+            rate, probe_ms = _run(hasher, args.clients, args.seconds)
+        finally:
+            hasher.shutdown()
+        probe_ms.sort()
+        print(
+            f"{name:>20}: {rate:.1f} verifications/s, probe p50={statistics.median(probe_ms):.1f}ms "
+            f"p95={probe_ms[int(len(probe_ms) * 0.95)]:.1f}ms"
+        )
+
+
+def _timed_probe() -> float:
+    started = time.perf_counter()
+    _probe()
+    return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark full-text search latency on a synthetic library.
+
+Seeds one user's library with --books metatexts of --chunks chunks each
+(words drawn from a Zipf-like vocabulary, so common terms match a large
+share of the library), then times SearchService.search for rare, common,
+prefix and phrase queries.
+
+    python -m backend.benchmarks.search_latency --books 200 --chunks 300
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from backend.db import create_db_engine
+from backend.models import Chunk, Metatext, SourceDocument, User
+from backend.services.search_service import SearchService
+
+VOCABULARY = [f"w{i}" for i in range(20_000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+QUERIES = {
+    "rare term": "w15000",
+    "common term": "w3",
+    "two terms": "w10 w250",
+    "prefix": "w123*",
+    "phrase": '"w1 w2"',
+}
+
+
+def _seed(engine, books: int, chunks: int, words: int) -> None:
+    rng = random.Random(42)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, username="bench", hashed_password=""))
+        session.add(SourceDocument(id=1, user_id=1, title="bench", text=""))
+        session.add_all(
+            Metatext(id=book + 1, title=f"book {book}", source_document_id=1, user_id=1, text="")
+            for book in range(books)
+        )
+        session.commit()
+        for book in range(books):
+            rows = [
+                {
+                    "text": " ".join(rng.choices(VOCABULARY, WEIGHTS, k=words)),
+                    "position": float(position),
+                    "metatext_id": book + 1,
+                }
+                for position in range(chunks)
+            ]
+            session.execute(insert(Chunk), rows)
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=300, help="chunks per book")
+    parser.add_argument("--words", type=int, default=80, help="words per chunk")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    service = SearchService()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'search.sqlite')}")
+        started = time.perf_counter()
+        _seed(engine, args.books, args.chunks, args.words)
+        print(f"seeded {args.books * args.chunks} chunks in {time.perf_counter() - started:.1f}s")
+        with Session(engine) as session:
+            for name, query in QUERIES.items():
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    page = service.search(1, query, session, limit=20)
+                    timings.append((time.perf_counter() - started) * 1000)
+                print(
+                    f"{name:>12}: p50={statistics.median(timings):.1f}ms max={max(timings):.1f}ms "
+                    f"hits on page={len(page.results)}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark the security headers middleware: BaseHTTPMiddleware vs pure ASGI.
+
+Both versions wrap the same small Starlette app, which is called directly
+through ASGI (no server or HTTP client), so the numbers are middleware
+overhead plus routing. "legacy" is the previous BaseHTTPMiddleware version:
+it builds the headers on every response and runs the app in a separate task
+behind a memory stream. Reported for a JSON response and for a 20-event
+streaming response, along with the time to the first streamed event.
+
+    python -m backend.benchmarks.security_headers --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from backend.middleware.security import SecurityHeadersMiddleware, security_headers
+
+EVENTS = 20
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, kept here for comparison."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        is_development = os.environ.get("ENVIRONMENT") != "production"
+        for name, value in security_headers(is_development).items():
+            response.headers[name] = value
+        return response
+
+
+async def _json(request):
+    return JSONResponse({"message": "ok"})
+
+
+async def _events(request):
+    async def stream():
+        for i in range(EVENTS):
+            yield f"data: {i}\n\n"
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def _app(middleware_class) -> Starlette:
+    return Starlette(
+        routes=[Route("/json", _json), Route("/events", _events)],
+        middleware=[Middleware(middleware_class)],
+    )
+
+
+async def _request(app, path: str) -> float:
+    """Run one request and return the seconds until the first body byte."""
+    started = time.perf_counter()
+    first_body = None
+
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:  # Like a server with a connected client: nothing more until the response is done
+            await asyncio.Event().wait()
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal first_body
+        if message["type"] == "http.response.body" and message.get("body") and first_body is None:
+            first_body = time.perf_counter() - started
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return first_body
+
+
+async def _run(app, path: str, requests: int) -> tuple[float, float]:
+    for _ in range(min(200, requests)):
+        await _request(app, path)
+    first_body_total = 0.0
+    started = time.perf_counter()
+    for _ in range(requests):
+        first_body_total += await _request(app, path)
+    return requests / (time.perf_counter() - started), first_body_total / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    for path in ("/json", "/events"):
+        for name, middleware_class in (("legacy", LegacySecurityHeadersMiddleware), ("asgi", SecurityHeadersMiddleware)):
+            rate, first_body_us = asyncio.run(_run(_app(middleware_class), path, args.requests))
+            print(f"{path:>8} {name:>7}: {rate:,.0f} req/s, first body after {first_body_us:.0f}us")
+
+
+if __name__ == "__main__":
+    main()
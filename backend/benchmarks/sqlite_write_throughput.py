@@ -0,0 +1,101 @@
+"""
+Benchmark concurrent write throughput of the default SQLite engine vs the tuned one.
+
+Writer threads commit small chunk edits while reader threads page through chunks,
+mimicking note/bookmark/explanation traffic from FastAPI's threadpool.
+
+    python -m backend.benchmarks.sqlite_write_throughput --writers 8 --readers 4 --ops 200
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import Engine, update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend.db import create_db_engine
+from backend.models import Chunk, Metatext
+
+CHUNKS = 500
+
+
+def _seed(engine: Engine) -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Metatext(id=1, title="bench", source_document_id=1, user_id=1, text=""))
+        session.add_all(Chunk(text=f"chunk {i}", position=float(i), metatext_id=1) for i in range(CHUNKS))
+        session.commit()
+
+
+def _run(engine: Engine, writers: int, readers: int, ops: int) -> dict:
+    commits = errors = reads = 0
+    lock = threading.Lock()
+    stop_reading = threading.Event()
+
+    def writer(worker: int) -> None:
+        nonlocal commits, errors
+        for i in range(ops):
+            chunk_id = (worker * ops + i) % CHUNKS + 1
+            try:
+                with Session(engine) as session:
+                    session.exec(update(Chunk).where(Chunk.id == chunk_id).values(note=f"note {worker}-{i}"))  # type: ignore
+                    session.commit()
+                with lock:
+                    commits += 1
+            except OperationalError:
+                with lock:
+                    errors += 1
+
+    def reader() -> None:
+        nonlocal reads
+        while not stop_reading.is_set():
+            with Session(engine) as session:
+                session.exec(select(Chunk).where(Chunk.metatext_id == 1).limit(50)).all()
+            with lock:
+                reads += 1
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for t in reader_threads:
+        t.start()
+    started = time.perf_counter()
+    for t in writer_threads:
+        t.start()
+    for t in writer_threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop_reading.set()
+    for t in reader_threads:
+        t.join()
+    return {"commits/s": commits / elapsed, "locked errors": errors, "reads/s": reads / elapsed, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="commits per writer thread")
+    args = parser.parse_args()
+
+    engines = {
+        # What backend/db.py used to build: rollback journal, synchronous=FULL, driver default timeout
+        "default": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+        "tuned": create_db_engine,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in engines.items():
+            engine = factory(f"sqlite:///{os.path.join(tmp, name + '.sqlite')}")
+            _seed(engine)
+            result = _run(engine, args.writers, args.readers, args.ops)
+            engine.dispose()
+            print(f"{name:>8}: " + ", ".join(
+                f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in result.items()
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,112 @@
 """Configuration constants for the application."""
+import os
 
 # Text chunking configuration
 
 class BackendConfig:
     """Configuration for the backend application."""
     
-    # consider moving database connection settings to this file.
+    # SQLite connection tuning, applied to every pooled connection (see backend/db.py)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers and the writer no longer block each other
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsyncs at checkpoints instead of every commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for the write lock before raising "database is locked"
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024  # Memory-map up to this much of the database file for reads
+    SQLITE_CACHE_SIZE: int = -64_000  # Page cache per connection; negative values are KiB (here ~64MB)
+
+    DATABASE_URL: str | None = None  # SQLAlchemy URL; the DATABASE_URL env var wins, backend/database.sqlite if neither is set
+
+    DB_POOL_SIZE: int = 10  # Connections kept open for FastAPI's worker threads
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed during bursts
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free pooled connection before failing the request
+    DB_POOL_PRE_PING: bool = True  # Test server connections on checkout so restarts/failovers don't surface as errors
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace server connections older than this (idle timeouts, proxies)
 
     DEFAULT_CHUNK_SIZE: int = 500  # Default chunk size when breaking up a metatext for the first time
 
+    CHUNK_INSERT_BATCH_SIZE: int = 500  # Rows per executemany batch when bulk inserting chunks for a new metatext
+
+    DEFAULT_CHUNK_PAGE_SIZE: int = 50  # Chunks returned per page by the paginated chunk endpoint
+    MAX_CHUNK_PAGE_SIZE: int = 200  # Upper bound a client may request per page
+
+    EAGER_LOAD_METATEXT_CHILDREN: bool = True  # Batch-load chunk images/rewrites with selectinload instead of per-chunk lazy loads
+
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 8  # In-flight OpenAI calls allowed per worker process
+    OPENAI_REQUEST_TIMEOUT_SECONDS: float = 120.0  # Upper bound for one OpenAI call, including time queued for a slot
+    OPENAI_MAX_RETRIES: int = 2  # Retries performed by the OpenAI client on transient errors
+
+    INSTRUCTIONS_RELOAD_CHECK_SECONDS: float = 5.0  # Minimum interval between mtime checks of a cached instructions file
+
+    AI_CACHE_ENABLED: bool = True  # Reuse stored model responses for identical model + instructions + prompt + schema
+    AI_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60  # Cached responses older than this are treated as misses
+    AI_CACHE_MAX_ENTRIES: int = 50_000  # Least recently used entries are evicted beyond this size
+
+    IMAGE_JOB_WORKERS: int = 2  # Concurrent image generations run by the background job queue, independent of text calls
+    JOB_EVENTS_POLL_SECONDS: float = 0.5  # How often the SSE job status stream checks for changes
+    JOB_EVENTS_KEEPALIVE_SECONDS: float = 15.0  # Interval between SSE keep-alive comments while a job is unchanged
+    JOB_HEARTBEAT_SECONDS: float = 15.0  # How often a worker refreshes heartbeat_at on the job it is running
+    JOB_LEASE_SECONDS: float = 120.0  # A running job without a heartbeat for this long is requeued on the next start
+
+    PIPELINE_JOB_WORKERS: int = 1  # Whole-metatext AI pipelines run at once per process
+    PIPELINE_CONCURRENCY: int = 4  # Default in-flight chunk calls per pipeline (still bounded by OPENAI_MAX_CONCURRENT_REQUESTS)
+    MAX_PIPELINE_CONCURRENCY: int = 8  # Upper bound a client may request per pipeline
+    PIPELINE_COMMIT_BATCH_SIZE: int = 20  # Chunk results written per transaction, together with the job's progress
+    PIPELINE_QUOTA_BATCH_SIZE: int = 10  # Chunks a pipeline pays AI quota for at a time; it stops when the user's bucket cannot pay for the next batch
+
+    LOOP_MONITOR_ENABLED: bool = False  # Opt-in event-loop lag monitor; the LOOP_MONITOR_ENABLED env var also turns it on
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.05  # Heartbeat period used to sample event-loop lag
+    LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS: float = 0.1  # Loop stalls at least this long are logged with the blocking stack
+    LOOP_MONITOR_MAX_EVENTS: int = 200  # Most recent blocking events kept in memory for the admin endpoint
+
+    METRICS_ENABLED: bool = True  # Serve /metrics and record request, database and OpenAI metrics
+    METRICS_HTTP_LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    METRICS_DB_LATENCY_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+    METRICS_DB_QUERIES_PER_REQUEST_BUCKETS: tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+    METRICS_OPENAI_LATENCY_BUCKETS: tuple[float, ...] = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+    SEARCH_DEFAULT_PAGE_SIZE: int = 20  # Hits returned per page by /search
+    SEARCH_MAX_PAGE_SIZE: int = 100  # Upper bound a client may request per page
+    SEARCH_CHUNK_WEIGHTS: tuple[float, ...] = (1.0, 2.0, 2.0)  # BM25 weights for chunk text, note, summary
+    SEARCH_EXPLANATION_WEIGHTS: tuple[float, ...] = (3.0, 1.0)  # BM25 weights for explanation words, explanation
+    SEARCH_SNIPPET_TOKENS: int = 16  # Approximate length of each result snippet, in tokens
+    SEARCH_SNIPPET_OPEN: str = "<mark>"  # Inserted before each matched term in snippets
+    SEARCH_SNIPPET_CLOSE: str = "</mark>"  # Inserted after each matched term in snippets
+    SEARCH_SNIPPET_ELLIPSIS: str = "…"  # Marks text cut from either end of a snippet
+
+    PASSAGE_INDEX_DIR: str = os.path.join(os.path.dirname(__file__), "passage_index")  # Per-metatext embedding files
+    PASSAGE_EMBEDDING_DIM: int = 256  # Hashed embedding size; 1KB per chunk as float32
+    DEFAULT_SIMILAR_PASSAGES: int = 10  # Passages returned by the similar-passages endpoint
+    MAX_SIMILAR_PASSAGES: int = 50  # Upper bound a client may request
+
+    EXPLANATION_REUSE_ENABLED: bool = True  # Answer /explain from a stored explanation of the same words in the same context
+    EXPLANATION_REUSE_CONTEXT_TOKENS: int = 8  # Context tokens on each side of the words that must match for reuse
+
+    DEFAULT_REVIEW_PAGE_SIZE: int = 100  # Review entries per page when a cursor is passed without a limit
+    MAX_REVIEW_PAGE_SIZE: int = 500  # Upper bound a client may request per page
+
+    DEFAULT_FAVORITE_PAGE_SIZE: int = 50  # Favorites returned per page by /user/me/favorite_chunks
+    MAX_FAVORITE_PAGE_SIZE: int = 200  # Upper bound a client may request per page
+    FAVORITE_PREVIEW_CHARS: int = 200  # Leading characters of chunk text included with each favorite
+
+    PRINCIPAL_CACHE_ENABLED: bool = True  # Serve authenticated users from memory instead of a user lookup per request
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # Bound on staleness across processes; updates and deletes invalidate locally
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000  # Least recently used users are evicted beyond this size
+
+    PASSWORD_HASH_WORKERS: int = 2  # Processes that run bcrypt (see backend/password_hashing.py); 0 hashes on the calling thread
+    PASSWORD_AUTH_THREADS: int = 4  # Dedicated threads for login/register handlers, so bursts never take the shared threadpool
+    PASSWORD_HASH_CALIBRATE: bool = True  # Pick the bcrypt cost at startup from PASSWORD_HASH_TARGET_MS
+    PASSWORD_HASH_TARGET_MS: float = 250.0  # Time one hash should take on this host after calibration
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # Cost used when calibration is disabled, and the floor calibration never goes below
+    PASSWORD_BCRYPT_MAX_ROUNDS: int = 15  # ...or above this one, however fast
+
+    RATE_LIMIT_STORAGE_URL: str | None = None  # sqlite:/// file shared by all workers; the RATE_LIMIT_STORAGE_URL env var wins, backend/rate_limits.sqlite if neither is set
+    AI_RATE_LIMIT_ENABLED: bool = True  # Charge AI operations against a token bucket per user
+    AI_RATE_LIMIT_CAPACITY: float = 60.0  # Tokens a user can spend in a burst
+    AI_RATE_LIMIT_REFILL_PER_MINUTE: float = 30.0  # Tokens returned to each bucket per minute
+    AI_RATE_LIMIT_COSTS: dict[str, float] = {  # Tokens per operation; a metatext pipeline pays its operation's cost per chunk, PIPELINE_QUOTA_BATCH_SIZE chunks at a time
+        "explain": 1.0, "evaluation": 2.0, "source_doc_info": 2.0, "rewrite": 3.0, "image": 10.0
+    }
+    EXPLAIN2_RATE_LIMIT: str = "30/minute"  # Per client IP; explain2 is unauthenticated, so there is no user bucket to charge
+
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB # Maximum file size for source document uploads
 
     ALLOWED_EXTENSIONS: set[str] = {".txt"}  # Allowed file extensions for source document uploads
\ No newline at end of file
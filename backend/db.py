@@ -1,8 +1,112 @@
-from sqlmodel import create_engine, Session, SQLModel
 import os
 
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import backend.env_setup  # noqa: F401  # DATABASE_URL may come from .env
+from backend.config import BackendConfig as CONFIG
+from backend.metrics import instrument_engine
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "database.sqlite")
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
+DATABASE_URL = os.environ.get("DATABASE_URL") or CONFIG.DATABASE_URL or f"sqlite:///{DB_PATH}"
+
+# Sync drivers in DATABASE_URL and the asyncio driver used for the same database
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in url for its asyncio counterpart (psycopg 3 URLs already support both)."""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure every new SQLite connection for concurrent readers and writers."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={CONFIG.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={CONFIG.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={CONFIG.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={CONFIG.SQLITE_MMAP_SIZE_BYTES}")
+        cursor.execute(f"PRAGMA cache_size={CONFIG.SQLITE_CACHE_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str | None = None, tune_sqlite: bool = True, **engine_kwargs) -> Engine:
+    """
+    Create a database engine for url (DATABASE_URL by default).
+
+    Server databases such as PostgreSQL get a QueuePool sized from
+    BackendConfig with pre-ping and recycling. For file-backed SQLite,
+    connections come from a thread-safe pool sized for FastAPI's threadpool
+    and, with tune_sqlite, are switched to WAL with the pragmas from
+    BackendConfig so readers never block the single writer and writers wait
+    for the lock instead of failing with "database is locked".
+    """
+    url = url or DATABASE_URL
+    engine_kwargs = _pool_kwargs(url, engine_kwargs)
+    if url.startswith("sqlite") and "poolclass" not in engine_kwargs and not _is_sqlite_memory(url):
+        connect_args = engine_kwargs.pop("connect_args", {})
+        # Pooled connections are handed between worker threads
+        connect_args.setdefault("check_same_thread", False)
+        engine_kwargs["connect_args"] = connect_args
+
+    engine = create_engine(url, echo=False, **engine_kwargs)
+    if url.startswith("sqlite") and tune_sqlite:
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    if CONFIG.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+def create_async_db_engine(url: str | None = None, tune_sqlite: bool = True, **engine_kwargs) -> AsyncEngine:
+    """
+    Create an asyncio engine for url (ASYNC_DATABASE_URL by default).
+
+    Pool settings and SQLite pragmas match create_db_engine. With aiosqlite
+    every statement runs on the driver's own thread, so awaiting a query
+    leaves the event loop free to serve other requests.
+    """
+    url = url or ASYNC_DATABASE_URL
+    engine = create_async_engine(url, echo=False, **_pool_kwargs(url, engine_kwargs))
+    if url.startswith("sqlite") and tune_sqlite:
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if CONFIG.METRICS_ENABLED:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url.split("://", 1)[-1] in ("", "/:memory:") or "mode=memory" in url
+
+
+def _pool_kwargs(url: str, engine_kwargs: dict) -> dict:
+    """Fill in BackendConfig pool settings unless the caller chose a pool class or the database is in memory."""
+    if "poolclass" in engine_kwargs or (url.startswith("sqlite") and _is_sqlite_memory(url)):
+        return engine_kwargs
+    engine_kwargs.setdefault("pool_size", CONFIG.DB_POOL_SIZE)
+    engine_kwargs.setdefault("max_overflow", CONFIG.DB_MAX_OVERFLOW)
+    engine_kwargs.setdefault("pool_timeout", CONFIG.DB_POOL_TIMEOUT_SECONDS)
+    if not url.startswith("sqlite"):
+        engine_kwargs.setdefault("pool_pre_ping", CONFIG.DB_POOL_PRE_PING)
+        engine_kwargs.setdefault("pool_recycle", CONFIG.DB_POOL_RECYCLE_SECONDS)
+    return engine_kwargs
+
+
+engine = create_db_engine()
+async_engine = create_async_db_engine()
 
 def init_db():
     SQLModel.metadata.create_all(engine)
@@ -11,3 +115,9 @@ def init_db():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    # Objects stay usable after commit; reloading expired attributes would need implicit IO
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
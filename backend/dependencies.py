@@ -4,6 +4,9 @@ backend/dependencies.py
 This module contains reusable FastAPI dependency functions for the backend.
 """
 
+import math
+import os
+
 from fastapi import Depends, HTTPException, Header, Cookie, status
 from backend.db import get_session
 from sqlmodel import Session
@@ -16,14 +19,41 @@ from backend.services import (
     SourceDocumentService,
 )
 from backend.services.bookmark_service import BookmarkService
+from backend.services.chunk_service import AsyncChunkService
+from backend.services.metatext_service import AsyncMetatextService
+from backend.services.source_document_service import AsyncSourceDocumentService
+from backend.services.search_service import AsyncSearchService
+from backend.services.similarity_service import AsyncSimilarityService
+from backend.config import BackendConfig as CONFIG
+from backend.dictionary import load_dictionary
+from backend.metrics import AI_RATE_LIMITED_TOTAL
+from backend.rate_limit import TokenBucketStore, token_buckets
+from backend.services.ai_response_cache import AIResponseCache
+from backend.services.openai_service import AsyncOpenAIService
+from backend.services.job_service import AsyncJobService, JobContext, JobQueue, JobService
+from backend.services.metatext_pipeline_service import PIPELINE_QUOTA_OPERATIONS, MetatextPipelineService
+from backend.models import ImageRead
 # Dependency injection function
 def get_bookmark_service() -> BookmarkService:
     """Dependency injection function for BookmarkService."""
     return BookmarkService()
 
+
+# One async OpenAI service per process so its concurrency limit is shared by every AI endpoint
+_openai_service = None
+
+def get_openai_service() -> AsyncOpenAIService:
+    """Get the shared async OpenAI service with lazy initialization."""
+    global _openai_service
+    if _openai_service is None:
+        response_cache = AIResponseCache() if CONFIG.AI_CACHE_ENABLED else None
+        _openai_service = AsyncOpenAIService(response_cache=response_cache)
+    return _openai_service
+
+
 def get_explanation_service() -> ExplanationService:
     """Dependency injection function for ExplanationService."""
-    return ExplanationService()
+    return ExplanationService(openai_service=get_openai_service(), dictionary=load_dictionary())
 
 
 
@@ -39,6 +69,31 @@ def get_metatext_service() -> MetatextService:
     return MetatextService()
 
 
+def get_async_metatext_service() -> AsyncMetatextService:
+    """Dependency injection function for AsyncMetatextService."""
+    return AsyncMetatextService()
+
+
+def get_async_chunk_service() -> AsyncChunkService:
+    """Dependency injection function for AsyncChunkService."""
+    return AsyncChunkService()
+
+
+def get_async_source_document_service() -> AsyncSourceDocumentService:
+    """Dependency injection function for AsyncSourceDocumentService."""
+    return AsyncSourceDocumentService()
+
+
+def get_async_search_service() -> AsyncSearchService:
+    """Dependency injection function for AsyncSearchService."""
+    return AsyncSearchService()
+
+
+def get_async_similarity_service() -> AsyncSimilarityService:
+    """Dependency injection function for AsyncSimilarityService."""
+    return AsyncSimilarityService()
+
+
 # Dependency injection function
 def get_source_document_service() -> SourceDocumentService:
     """Dependency injection function for SourceDocumentService."""
@@ -55,7 +110,8 @@ def get_current_user(
 ):
     """
     Dependency to extract and validate the current user from the access_token cookie.
-    Returns the user instance or raises HTTPException if invalid.
+    Returns the authenticated Principal (id, username), usually from the
+    in-process principal cache, or raises HTTPException if invalid.
     """
     if not access_token:
         raise HTTPException(
@@ -66,6 +122,76 @@ def get_current_user(
     user = auth_service.get_user_from_access_token(access_token, session)
     return user
 
+
+def get_admin_user(user = Depends(get_current_user)):
+    """
+    Dependency for operator-only endpoints.
+    Admins are the usernames listed, comma-separated, in the ADMIN_USERNAMES env var.
+    """
+    admins = {name.strip() for name in os.environ.get("ADMIN_USERNAMES", "").split(",") if name.strip()}
+    if user.username not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
+
+def get_token_bucket_store() -> TokenBucketStore:
+    """Dependency injection function for the shared per-user token buckets."""
+    return token_buckets
+
+
+def take_ai_quota(user_id: int, operation: str, cost: float, buckets: TokenBucketStore) -> float:
+    """
+    Take cost tokens from the user's AI bucket if it holds enough.
+
+    Returns:
+        0 if the tokens were taken (or the buckets are off), otherwise the seconds until they could be
+    """
+    if not CONFIG.AI_RATE_LIMIT_ENABLED:
+        return 0.0
+    retry_after = buckets.consume(
+        f"ai:{user_id}",
+        cost,
+        CONFIG.AI_RATE_LIMIT_CAPACITY,
+        CONFIG.AI_RATE_LIMIT_REFILL_PER_MINUTE / 60,
+    )
+    if retry_after:
+        AI_RATE_LIMITED_TOTAL.inc(operation=operation)
+    return retry_after
+
+
+def charge_ai_quota(user_id: int, operation: str, cost: float, buckets: TokenBucketStore) -> None:
+    """
+    Take cost tokens from the user's AI bucket.
+
+    Raises:
+        HTTPException: 400 if the cost is more than a full bucket holds,
+            429 with Retry-After if the bucket cannot pay for the operation
+    """
+    if CONFIG.AI_RATE_LIMIT_ENABLED and cost > CONFIG.AI_RATE_LIMIT_CAPACITY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{operation} costs more AI quota than a full bucket holds.",
+        )
+    retry_after = take_ai_quota(user_id, operation, cost, buckets)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"AI rate limit exceeded for {operation}. Try again in {math.ceil(retry_after)}s.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def ai_quota(operation: str):
+    """Dependency charging AI_RATE_LIMIT_COSTS[operation] tokens to the current user's AI bucket."""
+    cost = CONFIG.AI_RATE_LIMIT_COSTS[operation]
+
+    def charge(
+        user = Depends(get_current_user),
+        buckets: TokenBucketStore = Depends(get_token_bucket_store)
+    ) -> None:
+        charge_ai_quota(user.id, operation, cost, buckets)
+
+    return charge
+
 # Lazy initialization of service to avoid requiring API key at import time
 _ai_service = None
 
@@ -74,7 +200,7 @@ def get_ai_service() -> AIService:
     global _ai_service
     if _ai_service is None:
         try:
-            _ai_service = AIService()
+            _ai_service = AIService(openai_service=get_openai_service())
         except Exception:
             # For testing environments where OpenAI API key might not be available
             # Return a mock service or handle gracefully
@@ -82,3 +208,69 @@ def get_ai_service() -> AIService:
             _ai_service = Mock(spec=AIService)
     return _ai_service
 
+
+
+IMAGE_JOB_KIND = "generate_image"
+
+async def _run_image_job(context: JobContext) -> dict:
+    """Job handler: generate one image and return it in its API representation."""
+    payload = context.payload
+    image = await get_ai_service().generate_image(payload["prompt"], payload.get("chunk_id"), context.session)
+    return ImageRead.model_validate(image).model_dump(mode="json")
+
+# Image generation runs on its own worker pool so slow image calls never hold request handlers open
+_image_job_queue = None
+
+def get_image_job_queue() -> JobQueue:
+    """Get the shared image generation job queue with lazy initialization."""
+    global _image_job_queue
+    if _image_job_queue is None:
+        _image_job_queue = JobQueue(IMAGE_JOB_KIND, _run_image_job, workers=CONFIG.IMAGE_JOB_WORKERS)
+    return _image_job_queue
+
+
+PIPELINE_JOB_KIND = "metatext_pipeline"
+
+def get_metatext_pipeline_service() -> MetatextPipelineService:
+    """Dependency injection function for MetatextPipelineService."""
+    return MetatextPipelineService(openai_service=get_openai_service())
+
+async def _run_pipeline_job(context: JobContext) -> dict:
+    """Job handler: run one AI operation over a whole metatext, reporting progress on the job."""
+    payload = context.payload
+    user_id = context.job.user_id
+    per_chunk_cost = CONFIG.AI_RATE_LIMIT_COSTS[PIPELINE_QUOTA_OPERATIONS[payload["operation"]]]
+
+    def charge(chunks: int) -> bool:
+        return not take_ai_quota(user_id, "pipeline", chunks * per_chunk_cost, get_token_bucket_store())
+
+    return await get_metatext_pipeline_service().run(
+        payload["metatext_id"],
+        user_id,
+        payload["operation"],
+        context.session,
+        style_title=payload.get("style_title"),
+        concurrency=payload["concurrency"],
+        on_progress=context.report_progress,
+        charge=charge,
+        prepaid=payload.get("prepaid_chunks", 0),
+    )
+
+_pipeline_job_queue = None
+
+def get_pipeline_job_queue() -> JobQueue:
+    """Get the shared metatext pipeline job queue with lazy initialization."""
+    global _pipeline_job_queue
+    if _pipeline_job_queue is None:
+        _pipeline_job_queue = JobQueue(PIPELINE_JOB_KIND, _run_pipeline_job, workers=CONFIG.PIPELINE_JOB_WORKERS)
+    return _pipeline_job_queue
+
+
+def get_job_service() -> JobService:
+    """Dependency injection function for JobService."""
+    return JobService()
+
+
+def get_async_job_service() -> AsyncJobService:
+    """Dependency injection function for AsyncJobService."""
+    return AsyncJobService()
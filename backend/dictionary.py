@@ -0,0 +1,165 @@
+"""
+Local dictionary used to answer explain2 lookups without calling the model.
+
+A dictionary is compiled once, at build or deploy time, from an open
+dictionary export into a read-only SQLite file keyed by normalised headword:
+
+    python -m backend.dictionary words.tsv                      # headword<TAB>definition per line
+    python -m backend.dictionary kaikki-english.jsonl -o path   # Wiktionary JSONL from wiktextract/kaikki.org
+
+Lookups go through DictionaryBackend, so another store can be plugged in by
+passing any object with the same lookup method to ExplanationService.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from typing import Iterable, Iterator
+
+from loguru import logger
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "dictionary.sqlite")
+DEFAULT_MAX_SENSES = 3  # Senses kept per headword; the first ones are the most common in both supported sources
+_SENSE_SEPARATOR = "; "
+_INSERT_BATCH_SIZE = 10_000
+
+
+def normalize_headword(word: str) -> str:
+    """Key used for both compiling and lookups: NFKC, case-folded, trimmed, single-spaced."""
+    return " ".join(unicodedata.normalize("NFKC", word).casefold().replace("’", "'").split())
+
+
+class DictionaryBackend:
+    """A source of short, context-free definitions."""
+
+    def lookup(self, word: str) -> str | None:
+        """Return the definition of word, or None if it is not a known headword."""
+        raise NotImplementedError
+
+
+class SQLiteDictionary(DictionaryBackend):
+    """Read-only lookups in a file produced by compile_dictionary, one connection per thread."""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # immutable=1: the file never changes while served, so SQLite skips locking entirely
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True)
+            self._local.connection = connection
+        return connection
+
+    def lookup(self, word: str) -> str | None:
+        headword = normalize_headword(word)
+        if not headword:
+            return None
+        row = self._connection().execute("SELECT definition FROM entry WHERE headword = ?", (headword,)).fetchone()
+        return row[0] if row else None
+
+
+_loaded: dict[str, DictionaryBackend | None] = {}
+_loaded_guard = threading.Lock()
+
+
+def load_dictionary(path: str | None = None) -> DictionaryBackend | None:
+    """
+    The dictionary at path (default: the DICTIONARY_PATH env var, then backend/dictionary.sqlite).
+
+    Returns None when no dictionary has been compiled, in which case explain2
+    always asks the model. The result is cached per path.
+    """
+    path = path or os.environ.get("DICTIONARY_PATH") or DEFAULT_DICTIONARY_PATH
+    with _loaded_guard:
+        if path not in _loaded:
+            try:
+                _loaded[path] = SQLiteDictionary(path)
+                logger.info(f"Local dictionary loaded: {path}")
+            except FileNotFoundError:
+                logger.info(f"No local dictionary at {path}; explain2 will always call the model")
+                _loaded[path] = None
+        return _loaded[path]
+
+
+def _read_tsv(path: str) -> Iterator[tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            headword, _, definition = line.rstrip("\n").partition("\t")
+            if headword and definition.strip():
+                yield headword, definition.strip()
+
+
+def _read_wiktextract(path: str) -> Iterator[tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            for sense in entry.get("senses", []):
+                glosses = sense.get("glosses")
+                if entry.get("word") and glosses:
+                    # The last gloss is the most specific; earlier ones repeat the parent sense
+                    yield entry["word"], glosses[-1]
+
+
+def read_entries(path: str) -> Iterator[tuple[str, str]]:
+    """(headword, definition) pairs from a .tsv or wiktextract .jsonl export."""
+    if path.endswith((".jsonl", ".json")):
+        return _read_wiktextract(path)
+    return _read_tsv(path)
+
+
+def compile_dictionary(entries: Iterable[tuple[str, str]], output: str, max_senses: int = DEFAULT_MAX_SENSES) -> int:
+    """
+    Write (headword, definition) pairs to a SQLite dictionary file, replacing it atomically.
+
+    Repeated headwords (several senses or parts of speech) are joined, keeping
+    the first max_senses distinct definitions.
+
+    Returns:
+        The number of headwords written
+    """
+    senses: dict[str, list[str]] = {}
+    for headword, definition in entries:
+        key = normalize_headword(headword)
+        kept = senses.setdefault(key, [])
+        if key and len(kept) < max_senses and definition not in kept:
+            kept.append(definition)
+
+    tmp_path = f"{output}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute("CREATE TABLE entry (headword TEXT PRIMARY KEY, definition TEXT NOT NULL) WITHOUT ROWID")
+        rows = [(key, _SENSE_SEPARATOR.join(kept)) for key, kept in senses.items() if kept]
+        for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+            connection.executemany("INSERT INTO entry VALUES (?, ?)", rows[start:start + _INSERT_BATCH_SIZE])
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    os.replace(tmp_path, output)
+    with _loaded_guard:
+        _loaded.pop(output, None)
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile an open dictionary export for explain2 lookups.")
+    parser.add_argument("source", help="headword<TAB>definition .tsv, or wiktextract .jsonl")
+    parser.add_argument("-o", "--output", default=DEFAULT_DICTIONARY_PATH)
+    parser.add_argument("--max-senses", type=int, default=DEFAULT_MAX_SENSES)
+    args = parser.parse_args()
+    count = compile_dictionary(read_entries(args.source), args.output, args.max_senses)
+    print(f"Wrote {count} headwords to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Custom exceptions for background job operations."""
+
+
+class JobServiceError(Exception):
+    """Base exception for job service errors."""
+    pass
+
+
+class JobNotFoundError(JobServiceError):
+    """Raised when a job is not found or not owned by the user."""
+    
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        super().__init__(f"Job not found: id={job_id}")
@@ -0,0 +1,14 @@
+"""Custom exceptions for paginated queries."""
+
+
+class PaginationError(Exception):
+    """Base exception for pagination errors."""
+    pass
+
+
+class InvalidCursorError(PaginationError):
+    """Raised when a pagination cursor cannot be decoded."""
+    
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor: {cursor!r}")
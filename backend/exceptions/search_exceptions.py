@@ -0,0 +1,22 @@
+"""Custom exceptions for full-text search."""
+
+
+class SearchServiceError(Exception):
+    """Base exception for search service errors."""
+    pass
+
+
+class InvalidSearchQueryError(SearchServiceError):
+    """Raised when a search query contains no searchable terms."""
+    
+    def __init__(self, query: str):
+        self.query = query
+        super().__init__(f"Search query has no searchable terms: {query!r}")
+
+
+class SearchUnavailableError(SearchServiceError):
+    """Raised when the database has no full-text index (only SQLite FTS5 is supported)."""
+    
+    def __init__(self, dialect: str):
+        self.dialect = dialect
+        super().__init__(f"Full-text search is not available on {dialect}")
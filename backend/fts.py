@@ -0,0 +1,50 @@
+"""
+SQLite FTS5 full-text indexes over chunks and explanations.
+
+Both are external-content tables: the text lives only in chunk/explanation
+and triggers keep the index in step with every insert, delete and update of
+an indexed column. The same DDL is applied by the Alembic migration (for
+existing databases) and by the metadata hooks below (for databases created
+with create_all). Other dialects get no index and search is unavailable.
+"""
+from sqlalchemy import DDL, Table, event
+
+# unicode61 folds case and, with remove_diacritics 2, accents; prefix indexes keep "word*" queries fast
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+FTS_PREFIX = "2 3"
+
+CHUNK_FTS_COLUMNS = ("text", "note", "summary")
+EXPLANATION_FTS_COLUMNS = ("words", "explanation")
+
+
+def fts_ddl(table: str, columns: tuple[str, ...]) -> list[str]:
+    """CREATE statements for table_fts and the triggers that maintain it."""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='{FTS_TOKENIZE}', prefix='{FTS_PREFIX}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        # Only edits of indexed columns touch the index (position, favourites, AI fields do not)
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def drop_fts_ddl(table: str) -> list[str]:
+    """DROP statements for table_fts; SQLite drops the triggers together with their table."""
+    return [f"DROP TABLE IF EXISTS {table}_fts"]
+
+
+def register_fts(table: Table, columns: tuple[str, ...]) -> None:
+    """Create (and drop) the FTS index alongside table whenever metadata creates it on SQLite."""
+    for statement in fts_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in drop_fts_ddl(table.name):
+        event.listen(table, "after_drop", DDL(statement).execute_if(dialect="sqlite"))
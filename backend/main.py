@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 from loguru import logger
 import backend.env_setup  # noqa: F401
@@ -6,13 +8,17 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from backend.db import init_db
-from backend.middleware import SecurityHeadersMiddleware
-from backend.api import ai, chunk, explanation, metatext, source_documents, auth, logs, bookmark, user_config, favorite
+from backend.db import async_engine, init_db
+from backend.password_hashing import password_hasher
+from backend.rate_limit import limiter
+from backend.services.instructions_registry import instructions_registry
+from backend.config import BackendConfig as CONFIG
+from backend.middleware import SecurityHeadersMiddleware, LoopMonitorMiddleware, MetricsMiddleware, loop_monitor
+from backend.api import ai, chunk, explanation, metatext, source_documents, auth, logs, bookmark, user_config, favorite, jobs, admin, metrics, search
+from backend.dependencies import get_image_job_queue, get_pipeline_job_queue
 from backend.exceptions.auth_exceptions import (
     InvalidCredentialsError,
     UserRegistrationError,
@@ -33,11 +39,33 @@ if not os.path.exists("backend/logs"):
 if not os.path.exists("public/generated_images"):
     os.makedirs("public/generated_images")
 
+# Opt-in event-loop lag monitoring (see backend/middleware/loop_monitor.py)
+LOOP_MONITOR_ENABLED = CONFIG.LOOP_MONITOR_ENABLED or os.environ.get("LOOP_MONITOR_ENABLED", "").lower() in ("1", "true")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+    if CONFIG.PASSWORD_HASH_CALIBRATE:
+        # Also starts the bcrypt worker processes, so the first login does not wait for them
+        await asyncio.to_thread(password_hasher.calibrate)
+    # Start background workers and resume jobs left unfinished by a previous process
+    job_queues = [get_image_job_queue(), get_pipeline_job_queue()]
+    for job_queue in job_queues:
+        await job_queue.start()
+    yield
+    for job_queue in job_queues:
+        await job_queue.stop()
+    # Close pooled async driver connections (aiosqlite keeps a thread per connection)
+    await async_engine.dispose()
+    password_hasher.shutdown()
+    if LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+
 # FastAPI application setup
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
-# Initialize rate limiter for the app
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter shared with the auth routes; counters live in RATE_LIMIT_STORAGE_URL (see backend/rate_limit.py)
 app.state.limiter = limiter
 
 # Rate limit exception handler
@@ -108,7 +136,16 @@ app.add_middleware(
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
+if LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware, monitor=loop_monitor)
+
+# Outermost, so request latency includes every other middleware
+if CONFIG.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 init_db()
+# Read prompt instruction files once so AI requests are served from memory
+instructions_registry.preload()
 
 app.include_router(source_documents.router, prefix="/api", tags=["source_documents"])
 app.include_router(metatext.router, prefix="/api", tags=["meta_text"])
@@ -120,6 +157,11 @@ app.include_router(logs.router, prefix="/api", tags=["logs"])
 app.include_router(favorite.router, prefix="/api", tags=["favorites"])
 app.include_router(user_config.router, prefix="/api", tags=["user_config"])
 app.include_router(bookmark.router, prefix="/api", tags=["bookmarks"])
+app.include_router(jobs.router, prefix="/api", tags=["jobs"])
+app.include_router(search.router, prefix="/api", tags=["search"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
+if CONFIG.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
 
 # Mount static files for generated images
 public_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../public'))
@@ -0,0 +1,290 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms live in one registry per process; the
+/metrics endpoint renders it. Each uvicorn worker keeps its own registry,
+so scrape every worker (or run a single worker per scrape target).
+"""
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from sqlalchemy import Engine, event
+
+from backend.config import BackendConfig as CONFIG
+
+# One sample line: (name suffix, labels, value)
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a named metric with a fixed set of label names."""
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", self._labels(key), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Per label set: [per-bucket counts..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0.0
+
+    def sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-2] if state else 0.0
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield "_sum", labels, state[-2]
+            yield "_count", labels, state[-1]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Render every metric in the text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUESTS_TOTAL = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION_SECONDS = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ("method", "route"), CONFIG.METRICS_HTTP_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = metrics_registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method",)
+)
+HTTP_REQUEST_DB_QUERIES = metrics_registry.histogram(
+    "http_request_db_queries", "Database statements executed per HTTP request.",
+    ("method", "route"), CONFIG.METRICS_DB_QUERIES_PER_REQUEST_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = metrics_registry.histogram(
+    "http_request_db_seconds", "Time spent in database statements per HTTP request.",
+    ("method", "route"), CONFIG.METRICS_HTTP_LATENCY_BUCKETS,
+)
+DB_QUERIES_TOTAL = metrics_registry.counter(
+    "db_queries_total", "Database statements executed, by statement type.", ("statement",)
+)
+DB_QUERY_DURATION_SECONDS = metrics_registry.histogram(
+    "db_query_duration_seconds", "Database statement latency by statement type.",
+    ("statement",), CONFIG.METRICS_DB_LATENCY_BUCKETS,
+)
+OPENAI_REQUESTS_TOTAL = metrics_registry.counter(
+    "openai_requests_total", "OpenAI API calls by operation, instructions file and outcome.",
+    ("operation", "instructions", "outcome"),
+)
+OPENAI_REQUEST_DURATION_SECONDS = metrics_registry.histogram(
+    "openai_request_duration_seconds", "OpenAI API call latency by operation and instructions file.",
+    ("operation", "instructions"), CONFIG.METRICS_OPENAI_LATENCY_BUCKETS,
+)
+OPENAI_TOKENS_TOTAL = metrics_registry.counter(
+    "openai_tokens_total", "Tokens reported by the OpenAI API, by instructions file and direction.",
+    ("instructions", "direction"),
+)
+OPENAI_ERRORS_TOTAL = metrics_registry.counter(
+    "openai_errors_total", "Failed OpenAI API calls by operation, instructions file and error type.",
+    ("operation", "instructions", "error"),
+)
+EXPLANATION_LOOKUPS_TOTAL = metrics_registry.counter(
+    "explanation_lookups_total", "Word explanations served, by where the answer came from.", ("source",)
+)
+DICTIONARY_LOOKUPS_TOTAL = metrics_registry.counter(
+    "dictionary_lookups_total", "explain2 lookups in the local dictionary, by outcome.", ("outcome",)
+)
+AI_RATE_LIMITED_TOTAL = metrics_registry.counter(
+    "ai_rate_limited_total", "AI requests rejected because the user's token bucket was empty, by operation.",
+    ("operation",),
+)
+
+
+@dataclass
+class RequestMetrics:
+    """Database work attributed to the current HTTP request."""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Set by MetricsMiddleware; copied into threadpool workers along with the rest of the context
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar("current_request_metrics", default=None)
+
+
+def _statement_type(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "WITH") else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    statement_type = _statement_type(statement)
+    DB_QUERIES_TOTAL.inc(statement=statement_type)
+    DB_QUERY_DURATION_SECONDS.observe(duration, statement=statement_type)
+    request_metrics = current_request_metrics.get()
+    if request_metrics is not None:
+        request_metrics.db_queries += 1
+        request_metrics.db_seconds += duration
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement run through engine (use AsyncEngine.sync_engine for async engines)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_openai_call(
+    operation: str,
+    instructions_key: str | None,
+    duration: float | None,
+    response: object | None = None,
+    error: BaseException | None = None,
+) -> None:
+    """Record latency, outcome and token usage of one OpenAI API call."""
+    instructions = instructions_key or "none"
+    if duration is not None:
+        OPENAI_REQUEST_DURATION_SECONDS.observe(duration, operation=operation, instructions=instructions)
+    if error is not None:
+        OPENAI_REQUESTS_TOTAL.inc(operation=operation, instructions=instructions, outcome="error")
+        OPENAI_ERRORS_TOTAL.inc(operation=operation, instructions=instructions, error=type(error).__name__)
+        return
+    OPENAI_REQUESTS_TOTAL.inc(operation=operation, instructions=instructions, outcome="success")
+    usage = getattr(response, "usage", None)
+    for direction in ("input", "output"):
+        tokens = getattr(usage, f"{direction}_tokens", None)
+        if isinstance(tokens, int) and tokens:
+            OPENAI_TOKENS_TOTAL.inc(tokens, instructions=instructions, direction=direction)
@@ -1,5 +1,7 @@
 """Middleware package for the FastAPI backend."""
 
 from .security import SecurityHeadersMiddleware
+from .loop_monitor import LoopLagMonitor, LoopMonitorMiddleware, loop_monitor
+from .metrics import MetricsMiddleware
 
-__all__ = ["SecurityHeadersMiddleware"]
\ No newline at end of file
+__all__ = ["SecurityHeadersMiddleware", "LoopLagMonitor", "LoopMonitorMiddleware", "loop_monitor", "MetricsMiddleware"]
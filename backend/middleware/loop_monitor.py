@@ -0,0 +1,208 @@
+"""
+Event-loop lag monitor.
+
+A heartbeat task on the event loop measures how late it is woken up. A
+watchdog thread notices when the heartbeat stops and captures the loop
+thread's stack while it is still blocked, together with the requests in
+flight (tracked by LoopMonitorMiddleware). Opt-in: see LOOP_MONITOR_ENABLED.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from loguru import logger
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.config import BackendConfig as CONFIG
+
+
+@dataclass
+class BlockingEvent:
+    """One stretch of time during which the event loop did not run other tasks."""
+    started_at: float  # Unix time the loop stopped responding
+    duration_seconds: float
+    routes: list[str]
+    stack: str
+
+
+@dataclass
+class RouteBlockingStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class _ActiveRequest:
+    scope: dict = field(repr=False)
+    started_at: float = 0.0
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route on the shared scope once it has dispatched
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "?")
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and records calls that hold the loop longer than a threshold."""
+
+    def __init__(
+        self,
+        interval: float = CONFIG.LOOP_MONITOR_INTERVAL_SECONDS,
+        threshold: float = CONFIG.LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS,
+        max_events: int = CONFIG.LOOP_MONITOR_MAX_EVENTS,
+        max_samples: int = 1000,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=max_samples)
+        self._events: deque[BlockingEvent] = deque(maxlen=max_events)
+        self._route_stats: dict[str, RouteBlockingStats] = {}
+        self._active: dict[int, _ActiveRequest] = {}
+        self._total_samples = 0
+        self._max_lag = 0.0
+        self._last_beat = 0.0
+        self._pending: tuple[str, list[str]] | None = None  # Stack and routes captured during the current stall
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    async def start(self) -> None:
+        """Start sampling the running event loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="loop-lag-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Loop lag monitor started (interval={self.interval}s, threshold={self.threshold}s)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    def request_started(self, scope: dict) -> int:
+        token = id(scope)
+        with self._lock:
+            self._active[token] = _ActiveRequest(scope=scope, started_at=time.perf_counter())
+        return token
+
+    def request_finished(self, token: int) -> None:
+        with self._lock:
+            self._active.pop(token, None)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - before - self.interval)
+            with self._lock:
+                self._samples.append(lag)
+                self._total_samples += 1
+                self._max_lag = max(self._max_lag, lag)
+                pending, self._pending = self._pending, None
+            if lag >= self.threshold:
+                self._record_event(lag, pending)
+
+    def _watch(self) -> None:
+        """Runs in a thread: capture the loop's stack while it is still blocked."""
+        check_every = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(check_every):
+            overdue = time.perf_counter() - self._last_beat - self.interval
+            if overdue < self.threshold:
+                continue
+            with self._lock:
+                if self._pending is not None:
+                    continue
+                routes = [request.route for request in self._active.values()]
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            with self._lock:
+                self._pending = (stack, routes)
+
+    def _record_event(self, duration: float, pending: tuple[str, list[str]] | None) -> None:
+        stack, routes = pending or ("(stall ended before the watchdog sampled it)", [])
+        event = BlockingEvent(
+            started_at=time.time() - duration,
+            duration_seconds=duration,
+            routes=routes,
+            stack=stack,
+        )
+        with self._lock:
+            self._events.append(event)
+            for route in routes or ["(no request)"]:
+                stats = self._route_stats.setdefault(route, RouteBlockingStats())
+                stats.count += 1
+                stats.total_seconds += duration
+                stats.max_seconds = max(stats.max_seconds, duration)
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms; active routes: {routes or 'none'}\n{stack}"
+        )
+
+    def snapshot(self, events: int = 20) -> dict[str, Any]:
+        """Aggregated lag statistics and the most recent blocking events."""
+        with self._lock:
+            samples = sorted(self._samples)
+            recent = list(self._events)[-events:]
+            route_stats = {route: asdict(stats) for route, stats in self._route_stats.items()}
+            total = self._total_samples
+            max_lag = self._max_lag
+
+        def percentile(pct: float) -> float:
+            return samples[min(len(samples) - 1, int(len(samples) * pct))] if samples else 0.0
+
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "threshold_seconds": self.threshold,
+            "samples": total,
+            "lag_p50_seconds": percentile(0.5),
+            "lag_p99_seconds": percentile(0.99),
+            "lag_max_seconds": max_lag,
+            "routes": dict(sorted(route_stats.items(), key=lambda item: -item[1]["total_seconds"])),
+            "events": [asdict(event) for event in reversed(recent)],
+        }
+
+
+class LoopMonitorMiddleware:
+    """Pure ASGI middleware that tells the monitor which requests are in flight."""
+
+    def __init__(self, app: ASGIApp, monitor: LoopLagMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = self.monitor.request_started(scope)  # type: ignore[arg-type]
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.request_finished(token)
+
+
+loop_monitor = LoopLagMonitor()
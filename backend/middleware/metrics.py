@@ -0,0 +1,60 @@
+"""
+Per-route request metrics middleware.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_REQUESTS_TOTAL,
+    RequestMetrics,
+    current_request_metrics,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request counts, latency and database work per route.
+
+    Routes are labelled by their template (/api/chunk/{chunk_id}) rather than
+    the raw path so label cardinality stays bounded; requests that match no
+    API route share the "unmatched" label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        request_metrics = RequestMetrics()
+        token = current_request_metrics.set(request_metrics)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            current_request_metrics.reset(token)
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            # The router records the matched route on the shared scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUESTS_TOTAL.inc(method=method, route=route, status=str(status_code))
+            HTTP_REQUEST_DURATION_SECONDS.observe(duration, method=method, route=route)
+            HTTP_REQUEST_DB_QUERIES.observe(request_metrics.db_queries, method=method, route=route)
+            HTTP_REQUEST_DB_SECONDS.observe(request_metrics.db_seconds, method=method, route=route)
@@ -3,15 +3,68 @@ Security middleware for FastAPI backend.
 Adds security headers to all responses to protect against common web vulnerabilities.
 """
 import os
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
 
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# More permissive in development, strict in production
+DEVELOPMENT_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: blob:; "
+    "font-src 'self'; "
+    "connect-src 'self'; "
+    "media-src 'self'; "
+    "object-src 'none'; "
+    "child-src 'none'; "
+    "worker-src 'self'; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'; "
+    "base-uri 'self'"
+)
+PRODUCTION_CSP = (
+    "default-src 'self'; "
+    "script-src 'self'; "
+    "style-src 'self'; "
+    "img-src 'self' data:; "
+    "font-src 'self'; "
+    "connect-src 'self'; "
+    "media-src 'self'; "
+    "object-src 'none'; "
+    "child-src 'none'; "
+    "worker-src 'self'; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'; "
+    "base-uri 'self'; "
+    "upgrade-insecure-requests"
+)
+
+
+def security_headers(is_development: bool) -> dict[str, str]:
+    """The security headers for every response, by name."""
+    headers = {
+        # Prevent MIME type sniffing
+        "X-Content-Type-Options": "nosniff",
+        # Prevent clickjacking attacks
+        "X-Frame-Options": "DENY",
+        # Enable XSS filtering (for legacy browsers)
+        "X-XSS-Protection": "1; mode=block",
+        # Control referrer information
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        # Control browser features
+        "Permissions-Policy": "camera=(), microphone=(), geolocation=(), interest-cohort=()",
+        "Content-Security-Policy": DEVELOPMENT_CSP if is_development else PRODUCTION_CSP,
+    }
+    # HSTS (HTTP Strict Transport Security) - only in production with HTTPS
+    if not is_development:
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+    return headers
+
+
+class SecurityHeadersMiddleware:
     """
-    Middleware that adds security headers to all HTTP responses.
-    
+    Pure ASGI middleware that adds security headers to all HTTP responses.
+
     Headers added:
     - X-Content-Type-Options: Prevents MIME type sniffing
     - X-Frame-Options: Prevents clickjacking attacks
@@ -19,78 +72,29 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy: Controls referrer information
     - Permissions-Policy: Controls browser features
     - Content-Security-Policy: Prevents XSS and data injection attacks
+    - Strict-Transport-Security: Forces HTTPS (production only)
+
+    The headers are encoded once here and appended to the http.response.start
+    message, replacing any the route set itself. Body messages pass through
+    untouched, so streaming and SSE responses are not buffered.
     """
-    
+
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.is_development = os.environ.get("ENVIRONMENT") != "production"
-    
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
-        
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Prevent clickjacking attacks
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # Enable XSS filtering (for legacy browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Control browser features
-        response.headers["Permissions-Policy"] = (
-            "camera=(), "
-            "microphone=(), "
-            "geolocation=(), "
-            "interest-cohort=()"
-        )
-        
-        # Content Security Policy
-        # More permissive in development, strict in production
-        if self.is_development:
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: blob:; "
-                "font-src 'self'; "
-                "connect-src 'self'; "
-                "media-src 'self'; "
-                "object-src 'none'; "
-                "child-src 'none'; "
-                "worker-src 'self'; "
-                "frame-ancestors 'none'; "
-                "form-action 'self'; "
-                "base-uri 'self'"
-            )
-        else:
-            # Production CSP - more restrictive
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self'; "
-                "img-src 'self' data:; "
-                "font-src 'self'; "
-                "connect-src 'self'; "
-                "media-src 'self'; "
-                "object-src 'none'; "
-                "child-src 'none'; "
-                "worker-src 'self'; "
-                "frame-ancestors 'none'; "
-                "form-action 'self'; "
-                "base-uri 'self'; "
-                "upgrade-insecure-requests"
-            )
-        
-        response.headers["Content-Security-Policy"] = csp
-        
-        # HSTS (HTTP Strict Transport Security) - only in production with HTTPS
-        if not self.is_development:
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
-        
-        return response
\ No newline at end of file
+        headers = security_headers(self.is_development)
+        self.raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+        self.header_names = {name for name, _ in self.raw_headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [header for header in message.get("headers", ()) if header[0].lower() not in self.header_names]
+                message["headers"] = headers + self.raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,9 +1,14 @@
-from typing import Optional, List
+from typing import Any, Literal, Optional, List
 from enum import Enum
+from uuid import uuid4
+from sqlalchemy import Index, select as sa_select
+from sqlalchemy.orm import column_property
 from sqlmodel import SQLModel, Field, Relationship
 from pydantic import BaseModel
 from datetime import datetime  # removed unused timezone import
 
+from backend.fts import CHUNK_FTS_COLUMNS, EXPLANATION_FTS_COLUMNS, register_fts
+
 # --- User UI Preferences Model ---
 class UserUIPreferences(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
@@ -23,10 +28,6 @@ class User(SQLModel, table=True):
     source_documents: List["SourceDocument"] = Relationship(back_populates="user")
     metatexts: List["Metatext"] = Relationship(back_populates="user")
     ui_preferences: Optional[UserUIPreferences] = Relationship(back_populates="user", sa_relationship_kwargs={"uselist": False})
-    favorite_chunks: List["Chunk"] = Relationship(
-        back_populates="favorited_by_user",
-        sa_relationship_kwargs={"foreign_keys": "Chunk.favorited_by_user_id"}
-    )
     explanations: List["Explanation"] = Relationship(back_populates="user")
     
 
@@ -43,7 +44,7 @@ class SourceDocumentBase(SQLModel):
     locations: str | None = None
     themes: str | None = None
     symbols: str | None = None
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
 
 class SourceDocument(SourceDocumentBase, table=True):
     text: str
@@ -71,8 +72,8 @@ class SourceDocumentUpdate(SQLModel):
 # --- Metatext Schemas ---
 class MetatextBase(SQLModel):
     title: str
-    source_document_id: int = Field(foreign_key="sourcedocument.id")
-    user_id: int = Field(foreign_key="user.id") 
+    source_document_id: int = Field(foreign_key="sourcedocument.id", index=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
     
 class Metatext(MetatextBase, table=True):
     id: int = Field(default=None, primary_key=True)
@@ -81,6 +82,7 @@ class Metatext(MetatextBase, table=True):
     source_document: Optional[SourceDocument] = Relationship(back_populates="metatexts")
     user: Optional["User"] = Relationship(back_populates="metatexts")
     explanations: List["Explanation"] = Relationship(back_populates="metatext", cascade_delete=True)
+    bookmarks: List["Bookmark"] = Relationship(back_populates="metatext", cascade_delete=True)
 
 class MetatextSummary(MetatextBase):
     id: int
@@ -110,6 +112,9 @@ class ChunkBase(SQLModel):
     explanation: str = ""
 
 class Chunk(ChunkBase, table=True):
+    # Serves ordered reads of a metatext's chunks (keyset pagination, neighbour lookups)
+    __table_args__ = (Index("ix_chunk_metatext_id_position", "metatext_id", "position"),)
+
     id: int = Field(default=None, primary_key=True)
     metatext: Optional[Metatext] = Relationship(back_populates="chunks")
     images: List["Image"] = Relationship(back_populates="chunk", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -121,13 +126,7 @@ class Chunk(ChunkBase, table=True):
         back_populates="chunk",
         sa_relationship_kwargs={"cascade": "all, delete-orphan"}
     ) 
-    favorited_by_user_id: Optional[int] = Field(default=None, foreign_key="user.id")
-    favorited_by_user: Optional["User"] = Relationship(
-        back_populates="favorite_chunks",
-        sa_relationship_kwargs={"foreign_keys": "Chunk.favorited_by_user_id"}
-    )
-    # New: bookmark functionality
-    bookmarked_by_user_id: Optional[int] = Field(default=None, foreign_key="user.id")  # User who bookmarked this chunk
+    favorites: List["Favorite"] = Relationship(back_populates="chunk", cascade_delete=True)
 
 
 class ChunkRead(ChunkBase):
@@ -135,6 +134,12 @@ class ChunkRead(ChunkBase):
     images: list["ImageRead"] = []
     rewrites: list["RewriteRead"] = []
     favorited_by_user_id: Optional[int] = None
+
+
+class ChunkPage(SQLModel):
+    """A window of a metatext's chunks ordered by position."""
+    chunks: list[ChunkRead]
+    next_cursor: str | None = None  # Pass back as `cursor` to fetch the next window; None on the last page
     
 
 class ChunkUpdate(SQLModel):
@@ -150,7 +155,7 @@ class ChunkUpdate(SQLModel):
 class RewriteBase(SQLModel):
     title: str  # e.g., "like im 5", "like a bro"
     rewrite_text: str
-    chunk_id: int = Field(foreign_key="chunk.id")
+    chunk_id: int = Field(foreign_key="chunk.id", index=True)
 
 class Rewrite(RewriteBase, table=True):
     id: int = Field(default=None, primary_key=True)
@@ -182,9 +187,18 @@ class ExplanationType(str, Enum):
     phrase = "phrase"
     
 class Explanation(SQLModel, table=True):
+    __table_args__ = (
+        # Backs the reuse lookup in ExplanationService.explain
+        Index("ix_explanation_words_key_context_hash", "words_key", "context_hash"),
+        # Backs the filtered, keyset-paginated review list
+        Index("ix_explanation_metatext_id_user_id_type_created_at", "metatext_id", "user_id", "type", "created_at"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     words: str  # word or phrase
     context: str
+    words_key: Optional[str] = Field(default=None)  # Normalised words, see ExplanationService.words_key
+    context_hash: Optional[str] = Field(default=None)  # Hash of the context window around the words
     explanation: str
     explanation_in_context: str
     type: ExplanationType = Field(default=ExplanationType.word, nullable=False)
@@ -201,13 +215,62 @@ class Explanation(SQLModel, table=True):
         return cls(**kwargs)
 
 
+# Full-text indexes (SQLite FTS5) maintained by triggers; see backend/fts.py
+register_fts(Chunk.__table__, CHUNK_FTS_COLUMNS)  # type: ignore[arg-type]
+register_fts(Explanation.__table__, EXPLANATION_FTS_COLUMNS)  # type: ignore[arg-type]
+
+
+# --- Search Schemas ---
+class SearchHit(SQLModel):
+    """One full-text match, either a chunk or an explanation."""
+    kind: Literal["chunk", "explanation"]
+    id: int
+    metatext_id: int
+    metatext_title: str
+    source_document_id: int
+    snippet: str  # Matching excerpt with hits wrapped in BackendConfig.SEARCH_SNIPPET_OPEN/CLOSE
+    rank: float  # BM25 score; lower is more relevant
+    position: float | None = None  # Chunk position, for chunk hits
+    words: str | None = None  # Explained word or phrase, for explanation hits
+
+
+class SearchPage(SQLModel):
+    """A window of search hits ordered by relevance."""
+    results: list[SearchHit]
+    next_cursor: str | None = None  # Pass back as `cursor` to fetch the next window; None on the last page
+
+
+class SimilarPassage(SQLModel):
+    """A chunk ranked by embedding similarity to another chunk."""
+    chunk_id: int
+    metatext_id: int
+    metatext_title: str
+    position: float
+    text: str
+    score: float  # Cosine similarity in [0, 1]; higher is more similar
+
+
+class ExplanationReviewItem(SQLModel):
+    """An explanation in the review list; the long texts are None in summary mode."""
+    id: int
+    words: str
+    type: ExplanationType
+    created_at: datetime
+    user_id: int
+    metatext_id: int
+    context: Optional[str] = None
+    explanation: Optional[str] = None
+    explanation_in_context: Optional[str] = None
+
+
 class ExplanationsResponse(BaseModel):
     """
     Response model for review endpoints.
-    Contains wordlist and phrase explanations.
+    Contains wordlist and phrase explanations, oldest first.
     """
-    word_list: List[Explanation]
-    phrase_list: List[Explanation]
+    word_list: List[ExplanationReviewItem]
+    phrase_list: List[ExplanationReviewItem]
+    next_cursor: str | None = None  # Set when the review list is paginated and more entries follow
 
 class ExplanationResponse(BaseModel):
     explanation: str
@@ -222,18 +285,29 @@ class ExplanationRequest(BaseModel):
 class ExplanationRequest2(BaseModel):
     word: str = Field(..., description="Word(s) to explain")
     context: Optional[str] = Field(None, description="Surrounding text to help disambiguate the word's meaning")
+    include_comprehensive: bool = Field(
+        True, description="Also return the contextual comprehensive explanation (needs a model call)"
+    )
 
 class ExplanationResponse2(BaseModel):
+    """What the explain2 instructions ask the model for."""
     word: str
     concise: str
     comprehensive: str
 
+class ExplanationLookupResponse(BaseModel):
+    """Response of /explain2: the concise explanation may come from the local dictionary."""
+    word: str
+    concise: str
+    comprehensive: Optional[str] = None  # None when not requested
+    source: Literal["dictionary", "model"] = "model"  # Where concise came from
+
 # --- AI Image Schemas ---
 class Image(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     prompt: str
     path: str  # relative path to the saved image file
-    chunk_id: Optional[int] = Field(default=None, foreign_key="chunk.id")  # Many-to-one FK to Chunk
+    chunk_id: Optional[int] = Field(default=None, foreign_key="chunk.id", index=True)  # Many-to-one FK to Chunk
     chunk: Optional["Chunk"] = Relationship(back_populates="images")  # Many-to-one relationship
 
 class ImageCreate(SQLModel):
@@ -247,21 +321,111 @@ class ImageRead(SQLModel):
     path: str
     chunk_id: Optional[int] = None
 
-# # --- Bookmark Schemas ---    
-# class Bookmark(SQLModel, table=True):
-#     id: int = Field(default=None, primary_key=True)
-#     user_id: int = Field(foreign_key="user.id")
-#     user: Optional["User"] = Relationship(back_populates="bookmarks")
-#     chunk_id: int = Field(foreign_key="chunk.id")
+# --- AI Response Cache Schemas ---
+class AIResponseCacheEntry(SQLModel, table=True):
+    """A cached model response, addressed by the hash of everything that determines it."""
+    key: str = Field(primary_key=True)  # SHA-256 of model, instructions, prompt and response schema
+    model: str
+    instructions_file: str
+    response: str  # Raw text, or JSON for structured (parsed) responses
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    last_accessed_at: datetime = Field(default_factory=datetime.now, nullable=False, index=True)
+    hit_count: int = 0
+
+# --- Background Job Schemas ---
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+class Job(SQLModel, table=True):
+    """A unit of background work (e.g. an image generation) run by an in-process worker pool."""
+    id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True)
+    kind: str = Field(index=True)  # e.g. "generate_image"
+    status: JobStatus = Field(default=JobStatus.queued, nullable=False, index=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    payload: str  # JSON-encoded job arguments
+    result: str | None = None  # JSON-encoded result once succeeded
+    error: str | None = None
+    progress_done: int = 0  # Work items finished so far, for jobs that report progress
+    progress_total: int = 0
+    progress_failed: int = 0
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    heartbeat_at: datetime | None = None  # Refreshed by the worker running the job; a stale one means the worker is gone
+
+class JobRead(SQLModel):
+    id: str
+    kind: str
+    status: JobStatus
+    result: Any | None = None
+    error: str | None = None
+    progress_done: int = 0
+    progress_total: int = 0
+    progress_failed: int = 0
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+class MetatextPipelineRequest(BaseModel):
+    operation: Literal["rewrite", "explanation", "evaluation"] = Field(..., description="AI operation to run on every chunk")
+    style_title: Optional[str] = Field(None, description="Rewrite style, required for the rewrite operation")
+    concurrency: Optional[int] = Field(None, ge=1, description="Chunk calls in flight at once")
+
+# --- Bookmark Schemas ---
+class Bookmark(SQLModel, table=True):
+    """A user's reading position in a metatext; the primary key allows one per user and metatext."""
+    # metatext_id leads the key so deleting a metatext finds its bookmarks without a scan
+    metatext_id: int = Field(foreign_key="metatext.id", primary_key=True)
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    chunk_id: int = Field(foreign_key="chunk.id", index=True)  # Indexed so combining chunks can move bookmarks
+    updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    metatext: Optional["Metatext"] = Relationship(back_populates="bookmarks")
+
+
+class Favorite(SQLModel, table=True):
+    """A chunk a user marked as favorite; the primary key allows one row per chunk and user."""
+    # Newest-first listing of a user's favorites reads this index in order
+    __table_args__ = (Index("ix_favorite_user_id_created_at_chunk_id", "user_id", "created_at", "chunk_id"),)
+
+    # chunk_id leads the key so deleting or combining chunks finds their favorites without a scan
+    chunk_id: int = Field(foreign_key="chunk.id", primary_key=True)
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    chunk: Optional["Chunk"] = Relationship(back_populates="favorites")
+
+
+# Users can only favorite chunks of their own metatexts (FavoriteService), so this is
+# whether the owner favorited the chunk. Loaded with every chunk SELECT as a correlated subquery
+# on the favorite primary key; ChunkRead.favorited_by_user_id keeps its meaning.
+Chunk.favorited_by_user_id = column_property(
+    sa_select(Favorite.user_id)
+    .join(Metatext, Metatext.user_id == Favorite.user_id)
+    .where(Favorite.chunk_id == Chunk.id, Metatext.id == Chunk.metatext_id)
+    .correlate_except(Favorite, Metatext)
+    .scalar_subquery(),
+    expire_on_flush=False,  # Chunk updates don't change it; lazy reloads would fail on AsyncSession
+)
+
+
+class FavoriteChunk(SQLModel):
+    """A favorite in the user's list: where the chunk lives and the start of its text."""
+    chunk_id: int
+    metatext_id: int
+    metatext_title: str
+    position: float
+    preview: str  # The first FAVORITE_PREVIEW_CHARS characters of the chunk text
+    favorited_at: datetime
 
 
-# # Pydantic model for setting a bookmark
-# class SetBookmarkRequest(BaseModel):
-#     metatext_id: int
-#     chunk_id: int
+class FavoritePage(SQLModel):
+    """A window of the user's favorites, newest first."""
+    favorites: list[FavoriteChunk]
+    next_cursor: str | None = None  # Pass back as `cursor` to fetch the next window; None on the last page
 
 
-    
 # Generic error response model
 class DeleteResponse(BaseModel):
     message: str
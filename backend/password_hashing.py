@@ -0,0 +1,126 @@
+"""
+bcrypt hashing in a small process pool, with a work factor calibrated to the host.
+
+Hashes are computed in PASSWORD_HASH_WORKERS spawned processes, so a burst of
+logins or registrations never competes with request handlers for the GIL or
+for worker threads. At startup the bcrypt cost is calibrated so one hash takes
+about PASSWORD_HASH_TARGET_MS on this machine, clamped to
+[PASSWORD_BCRYPT_ROUNDS, PASSWORD_BCRYPT_MAX_ROUNDS]. Stored hashes with a
+lower cost are rehashed the next time their owner logs in; hashes are never
+weakened, so processes that calibrated differently cannot make a hash flip
+between costs.
+
+This module only depends on the config and passlib, so worker processes
+start without importing the application.
+"""
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from loguru import logger
+from passlib.hash import bcrypt
+
+from backend.config import BackendConfig as CONFIG
+
+_CALIBRATION_SAMPLE_ROUNDS = 8  # Cheap cost timed during calibration; each extra round doubles the time
+_CALIBRATION_SAMPLES = 3
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.using(rounds=rounds).hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return bcrypt.verify(password, hashed)
+
+
+def _seconds_per_hash(rounds: int) -> float:
+    """Best of a few timings of one hash at the given cost."""
+    timings = []
+    for _ in range(_CALIBRATION_SAMPLES):
+        started = time.perf_counter()
+        _hash("calibration", rounds)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """The highest bcrypt cost whose hash time stays within target_ms on this machine."""
+    sample = _seconds_per_hash(_CALIBRATION_SAMPLE_ROUNDS)
+    rounds = _CALIBRATION_SAMPLE_ROUNDS + math.floor(math.log2(target_ms / 1000 / sample))
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+def hash_rounds(hashed: str) -> int | None:
+    """The cost a bcrypt hash was made with, or None if it is not a bcrypt hash."""
+    try:
+        return bcrypt.from_string(hashed).rounds
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords in a lazily started process pool.
+
+    Calls block the calling thread until a worker is done; callers bound how
+    many of them wait (see the auth routes). With workers=0 the work runs on
+    the calling thread instead.
+    """
+
+    def __init__(self, workers: int = CONFIG.PASSWORD_HASH_WORKERS, rounds: int = CONFIG.PASSWORD_BCRYPT_ROUNDS):
+        self.workers = workers
+        self.rounds = rounds
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_guard = threading.Lock()
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        with self._executor_guard:
+            if self._executor is None:
+                # spawn, not fork: forking a process that runs threads can copy held locks
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            executor = self._executor
+        return executor.submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(_verify, password, hashed)
+
+    def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """
+        Verify a password and, if it matches a hash made with a lower cost, rehash it.
+
+        Returns:
+            (whether the password matches, the replacement hash or None)
+        """
+        if not self.verify(password, hashed):
+            return False, None
+        if (hash_rounds(hashed) or 0) >= self.rounds:
+            return True, None
+        return True, self.hash(password)
+
+    def calibrate(
+        self,
+        target_ms: float = CONFIG.PASSWORD_HASH_TARGET_MS,
+        min_rounds: int = CONFIG.PASSWORD_BCRYPT_ROUNDS,
+        max_rounds: int = CONFIG.PASSWORD_BCRYPT_MAX_ROUNDS,
+    ) -> int:
+        """Pick the cost for new hashes by timing a worker; also starts the pool so the first login is not slower."""
+        self.rounds = self._run(calibrate_rounds, target_ms, min_rounds, max_rounds)
+        logger.info(f"bcrypt cost calibrated to {self.rounds} rounds (target {target_ms:.0f}ms per hash)")
+        return self.rounds
+
+    def shutdown(self) -> None:
+        with self._executor_guard:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
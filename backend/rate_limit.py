@@ -0,0 +1,164 @@
+"""
+Rate limiting shared by every worker process and kept across restarts.
+
+Both kinds of limit live in one SQLite file (RATE_LIMIT_STORAGE_URL, by
+default backend/rate_limits.sqlite):
+
+- slowapi's per-IP limits on the auth routes go through SQLiteStorage, a
+  `limits` storage backend registered for sqlite:// URIs.
+- AI operations draw from a token bucket per user (TokenBucketStore); each
+  operation costs AI_RATE_LIMIT_COSTS[operation] tokens.
+
+Every check is a single statement, so concurrent workers can never both
+spend the same tokens or slots.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+import backend.env_setup  # noqa: F401  # RATE_LIMIT_STORAGE_URL may come from .env
+from backend.config import BackendConfig as CONFIG
+
+DEFAULT_STORAGE_PATH = os.path.join(os.path.dirname(__file__), "rate_limits.sqlite")
+RATE_LIMIT_STORAGE_URL = (
+    os.environ.get("RATE_LIMIT_STORAGE_URL") or CONFIG.RATE_LIMIT_STORAGE_URL or f"sqlite:///{DEFAULT_STORAGE_PATH}"
+)
+_PURGE_EVERY = 1000  # Counter increments per process between deletions of expired windows
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counter (key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL);
+"""
+
+
+def _sqlite_path(url: str) -> str:
+    if not url.startswith("sqlite:///"):
+        raise ValueError(f"Rate limit storage must be a sqlite:/// URL, got {url!r}")
+    return url[len("sqlite:///"):]
+
+
+class _Connections:
+    """One autocommit connection per thread to the rate limit database, which is created on first use."""
+
+    def __init__(self, url: str):
+        self.path = _sqlite_path(url)
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA busy_timeout={CONFIG.SQLITE_BUSY_TIMEOUT_MS}")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window counters for slowapi/limits, usable as Limiter(storage_uri="sqlite:///path")."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._connections = _Connections(uri)
+        self._increments = 0
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        connection = self._connections.get()
+        self._increments += 1
+        if self._increments % _PURGE_EVERY == 0:
+            connection.execute("DELETE FROM counter WHERE expires_at <= ?", (now,))
+        # An expired window restarts at amount instead of adding to the old count
+        row = connection.execute(
+            "INSERT INTO counter (key, value, expires_at) VALUES (:key, :amount, :expires_at) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires_at <= :now THEN :amount ELSE value + :amount END, "
+            "expires_at = CASE WHEN expires_at <= :now THEN :expires_at ELSE expires_at END "
+            "RETURNING value",
+            {"key": key, "amount": amount, "expires_at": now + expiry, "now": now},
+        ).fetchone()
+        return row[0]
+
+    def get(self, key: str) -> int:
+        row = self._connections.get().execute(
+            "SELECT value FROM counter WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._connections.get().execute("SELECT expires_at FROM counter WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connections.get().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._connections.get().execute("DELETE FROM counter").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connections.get().execute("DELETE FROM counter WHERE key = ?", (key,))
+
+
+class TokenBucketStore:
+    """Token buckets keyed by string, refilled continuously up to their capacity."""
+
+    def __init__(self, url: str = RATE_LIMIT_STORAGE_URL):
+        self._connections = _Connections(url)
+
+    def consume(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        """
+        Take cost tokens from key's bucket if it holds enough; a new bucket starts full.
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until the bucket will hold cost tokens
+
+        Raises:
+            ValueError: If cost is larger than capacity, which no bucket could ever pay
+        """
+        if cost > capacity:
+            raise ValueError(f"Cost {cost} exceeds bucket capacity {capacity}")
+        params = {"key": key, "cost": cost, "capacity": capacity, "rate": refill_per_second, "now": time.time()}
+        connection = self._connections.get()
+        # Refill and spend in one upsert; the WHERE leaves an insufficient bucket untouched
+        taken = connection.execute(
+            "INSERT INTO bucket (key, tokens, updated_at) VALUES (:key, :capacity - :cost, :now) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "tokens = min(:capacity, tokens + (:now - updated_at) * :rate) - :cost, updated_at = :now "
+            "WHERE min(:capacity, tokens + (:now - updated_at) * :rate) >= :cost",
+            params,
+        ).rowcount
+        if taken:
+            return 0.0
+        row = connection.execute(
+            "SELECT min(:capacity, tokens + (:now - updated_at) * :rate) FROM bucket WHERE key = :key", params
+        ).fetchone()
+        available = row[0] if row else capacity
+        if refill_per_second <= 0:
+            return math.inf
+        return max((cost - available) / refill_per_second, 0.001)
+
+    def reset(self) -> None:
+        self._connections.get().execute("DELETE FROM bucket")
+
+
+# Shared by the app (app.state.limiter) and the route decorators in backend/api/auth.py
+limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URL)
+
+token_buckets = TokenBucketStore()
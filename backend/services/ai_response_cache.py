@@ -0,0 +1,126 @@
+"""Persistent, content-addressed cache for OpenAI responses."""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from loguru import logger
+
+from backend.config import BackendConfig as CONFIG
+from backend.models import AIResponseCacheEntry
+
+
+@dataclass
+class AIResponseCacheStats:
+    """In-process counters for cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+class AIResponseCache:
+    """
+    SQLite-backed response cache with TTL expiry and LRU eviction.
+
+    Entries are keyed by the SHA-256 of the model, the instructions file
+    contents, the prompt and the response schema, so identical requests from
+    any user share one stored answer. Cache failures are logged and treated as
+    misses; they never fail the AI call itself.
+    """
+
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        ttl_seconds: int = CONFIG.AI_CACHE_TTL_SECONDS,
+        max_entries: int = CONFIG.AI_CACHE_MAX_ENTRIES,
+    ):
+        if engine is None:
+            from backend.db import engine as default_engine
+            engine = default_engine
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.stats = AIResponseCacheStats()
+
+    @staticmethod
+    def make_key(model: str, instructions: str, prompt: str, response_schema: str = "") -> str:
+        """Build the content address for a request."""
+        digest = hashlib.sha256()
+        for part in (model, instructions, prompt, response_schema):
+            encoded = part.encode("utf-8")
+            # Length-prefix each part so boundaries cannot be shifted between fields
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        try:
+            with Session(self.engine) as session:
+                entry = session.get(AIResponseCacheEntry, key)
+                if entry is None:
+                    self.stats.misses += 1
+                    return None
+                now = datetime.now()
+                if now - entry.created_at > self.ttl:
+                    session.delete(entry)
+                    session.commit()
+                    self.stats.expirations += 1
+                    self.stats.misses += 1
+                    return None
+                entry.last_accessed_at = now
+                entry.hit_count += 1
+                response = entry.response
+                session.add(entry)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"AI response cache read failed: {e}")
+            self.stats.errors += 1
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        logger.debug(f"AI response cache hit: {key[:12]}")
+        return response
+
+    def set(self, key: str, model: str, instructions_file: str, response: str) -> None:
+        """Store a response and evict least recently used entries beyond max_entries."""
+        try:
+            with Session(self.engine) as session:
+                session.merge(AIResponseCacheEntry(
+                    key=key,
+                    model=model,
+                    instructions_file=instructions_file,
+                    response=response,
+                ))
+                session.flush()
+                self._evict_overflow(session)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"AI response cache write failed: {e}")
+            self.stats.errors += 1
+            return
+        self.stats.stores += 1
+
+    def _evict_overflow(self, session: Session) -> None:
+        """Delete the least recently accessed entries above max_entries."""
+        count = session.exec(select(func.count()).select_from(AIResponseCacheEntry)).one()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        stale_keys = select(AIResponseCacheEntry.key).order_by(
+            AIResponseCacheEntry.last_accessed_at  # type: ignore
+        ).limit(overflow)
+        session.exec(delete(AIResponseCacheEntry).where(AIResponseCacheEntry.key.in_(stale_keys)))  # type: ignore
+        self.stats.evictions += overflow
+        logger.debug(f"AI response cache evicted {overflow} entries")
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with Session(self.engine) as session:
+            session.exec(delete(AIResponseCacheEntry))  # type: ignore
+            session.commit()
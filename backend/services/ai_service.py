@@ -1,12 +1,14 @@
 """AI service for handling AI-related business logic."""
+import asyncio
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from loguru import logger
 
 from backend.models import (
     Chunk, EvaluationResponse, Rewrite, RewriteRead, SourceDocument, Image,
     SourceDocInfoResponse, SourceDocInfoAiResponse, Explanation, ExplanationResponse, ExplanationRequest, User
 )
-from backend.services.openai_service import OpenAIService
+from backend.services.openai_service import AsyncOpenAIService
 from backend.services.file_service import FileService
 from backend.exceptions.ai_exceptions import (
     ChunkNotFoundError,
@@ -19,18 +21,34 @@ from backend.exceptions.ai_exceptions import (
 class AIService:
     """Service for AI operations business logic."""
     
-    def __init__(self, openai_service: OpenAIService | None = None, file_service: FileService | None = None):
+    def __init__(self, openai_service: AsyncOpenAIService | None = None, file_service: FileService | None = None):
         """
         Initialize AI service with dependency injection.
         
         Args:
-            openai_service: OpenAI service instance
+            openai_service: Async OpenAI service instance
             file_service: File service instance
         """
-        self.openai_service = openai_service or OpenAIService()
+        self.openai_service = openai_service or AsyncOpenAIService()
         self.file_service = file_service or FileService()
     
-    def generate_evaluation(self, chunk_id: int, session: Session) -> EvaluationResponse:
+    @staticmethod
+    def evaluation_prompt(chunk: Chunk) -> str:
+        return (
+            f"CHUNK TEXT:\n{chunk.text}\n\n"
+            f"SUMMARY FIELD:\n{chunk.summary}\n\n"
+            f"NOTES FIELD:\n{chunk.note}\n\n"
+        )
+
+    @staticmethod
+    def rewrite_prompt(chunk: Chunk, style_title: str) -> str:
+        return f"Compress the following text {style_title}:\n{chunk.text}"
+
+    @staticmethod
+    def chunk_explanation_prompt(chunk: Chunk) -> str:
+        return f"CHUNK TEXT TO EXPLAIN:\n{chunk.text}\n"
+
+    async def generate_evaluation(self, chunk_id: int, session: AsyncSession) -> EvaluationResponse:
         """
         Generate AI evaluation for a chunk's note, summary, and text.
         
@@ -47,33 +65,30 @@ class AIService:
         logger.info(f"Generating chunk evaluation for chunk_id: {chunk_id}")
         
         # Get chunk from database
-        chunk = session.get(Chunk, chunk_id)
+        chunk = await session.get(Chunk, chunk_id)
         if not chunk:
             logger.warning(f"Chunk not found: id={chunk_id}")
             raise ChunkNotFoundError(chunk_id)
+        await session.commit()  # End the read transaction so no connection is held during the model call
         
         # Compose prompt for AI
-        prompt = (
-            f"CHUNK TEXT:\n{chunk.text}\n\n"
-            f"SUMMARY FIELD:\n{chunk.summary}\n\n"
-            f"NOTES FIELD:\n{chunk.note}\n\n"
-        )
+        prompt = self.evaluation_prompt(chunk)
         
         # Generate AI response
-        evaluation_text = self.openai_service.generate_text_response(
-            "instructions/note_summary_comparison_instructions.txt",
+        evaluation_text = await self.openai_service.generate_text_response(
+            "note_summary_comparison_instructions",
             prompt
         )
         
         # Save result to database
         chunk.evaluation = evaluation_text
         session.add(chunk)
-        session.commit()
+        await session.commit()
 
         logger.info(f"AI evaluation generated and saved for chunk_id: {chunk_id}")
         return EvaluationResponse(evaluation_text=evaluation_text)
 
-    def generate_word_definition(self, user: User, request: ExplanationRequest, session: Session) -> ExplanationResponse:
+    async def generate_word_definition(self, user: User, request: ExplanationRequest, session: Session) -> ExplanationResponse:
         """
         Generate word definition with context using AI.
         
@@ -99,8 +114,8 @@ class AIService:
         prompt = f"word='{request.words}' context='{request.context}'"
         
         # Generate AI response
-        ai_data = self.openai_service.generate_parsed_response(
-            "instructions/definition_with_context_instructions.txt",
+        ai_data = await self.openai_service.generate_parsed_response(
+            "definition_with_context_instructions",
             prompt,
             ExplanationResponse
         )
@@ -123,7 +138,7 @@ class AIService:
             explanation_in_context=ai_data.explanationInContext
         )
     
-    def generate_source_document_info(self, doc_id: int, session: Session) -> SourceDocInfoResponse:
+    async def generate_source_document_info(self, doc_id: int, session: AsyncSession) -> SourceDocInfoResponse:
         """
         Generate source document information using AI.
         
@@ -139,16 +154,17 @@ class AIService:
             SourceDocumentNotFoundError: If source document is not found
         """
         logger.info(f"Generating source doc info for doc_id: {doc_id}")
-        doc = session.get(SourceDocument, doc_id)
+        doc = await session.get(SourceDocument, doc_id)
         if not doc:
             logger.warning(f"Source document not found for doc_id: {doc_id}")
             raise SourceDocumentNotFoundError(doc_id)
+        await session.commit()  # End the read transaction so no connection is held during the model call
         # Use the document title as the prompt
         prompt = doc.title if doc.title else ""
         if not prompt:
             raise PromptValidationError("Missing prompt (document title)")
-        ai_data = self.openai_service.generate_parsed_response(
-            "instructions/source_doc_info_instructions.txt",
+        ai_data = await self.openai_service.generate_parsed_response(
+            "source_doc_info_instructions",
             prompt,
             SourceDocInfoAiResponse
         )
@@ -160,11 +176,11 @@ class AIService:
         doc.themes = ", ".join(ai_data.themes) if ai_data.themes else None
         doc.symbols = ", ".join(ai_data.symbols) if ai_data.symbols else None
         session.add(doc)
-        session.commit()
+        await session.commit()
         logger.info(f"Source doc info updated in DB for doc_id: {doc_id}")
         return SourceDocInfoResponse(result=ai_data)
     
-    def generate_image(self, prompt: str, chunk_id: int | None, session: Session) -> Image:
+    async def generate_image(self, prompt: str, chunk_id: int | None, session: AsyncSession) -> Image:
         """
         Generate AI image using DALL-E.
         
@@ -186,50 +202,51 @@ class AIService:
             raise PromptValidationError("Missing prompt")
         
         # Generate image using OpenAI
-        b64_image_data = self.openai_service.generate_image(prompt)
+        b64_image_data = await self.openai_service.generate_image(prompt)
         
-        # Save image to file system
-        rel_path = self.file_service.save_base64_image(b64_image_data)
+        # Save image to file system off the event loop (base64 decode + disk write)
+        rel_path = await asyncio.to_thread(self.file_service.save_base64_image, b64_image_data)
         
         # Save record to database
         ai_image = Image(prompt=prompt, path=rel_path, chunk_id=chunk_id)
         session.add(ai_image)
-        session.commit()
+        await session.commit()
         
         logger.info(f"AI image generated and saved: {rel_path} (chunk_id={chunk_id})")
         return ai_image
     
-    def generate_rewrite(self, chunk_id: int, style_title: str, session: Session) -> RewriteRead:
+    async def generate_rewrite(self, chunk_id: int, style_title: str, session: AsyncSession) -> RewriteRead:
         """
         Generate a compressed version of a chunk's text in a given style using AI, and save it to the database.
         """
         logger.info(f"Generating chunk rewrite for chunk_id: {chunk_id} with style: {style_title}")
         
         # Get chunk from database
-        chunk = session.get(Chunk, chunk_id)
+        chunk = await session.get(Chunk, chunk_id)
         if not chunk:
             logger.warning(f"Chunk not found: id={chunk_id}")
             raise ChunkNotFoundError(chunk_id)
+        await session.commit()  # End the read transaction so no connection is held during the model call
         
         # Compose prompt for AI
-        prompt = f"Compress the following text {style_title}:\n{chunk.text}"
+        prompt = self.rewrite_prompt(chunk, style_title)
         
         # Generate AI response
-        rewrite = self.openai_service.generate_text_response(
-            "instructions/chunk_rewrite_instructions.txt", prompt
+        rewrite = await self.openai_service.generate_text_response(
+            "chunk_rewrite_instructions", prompt
         )
 
         obj = Rewrite(chunk_id=chunk_id, title=style_title, rewrite_text=rewrite)
 
         session.add(obj)
-        session.commit()
-        session.refresh(obj)
+        await session.commit()
+        await session.refresh(obj)
         
         logger.info(f"AI chunk rewrite generated for chunk_id: {chunk_id} style: {style_title}")
 
         return RewriteRead.model_validate(obj)
 
-    def generate_chunk_explanation(self, user: User, chunk_id: int, session: Session) -> dict:
+    async def generate_chunk_explanation(self, user: User, chunk_id: int, session: AsyncSession) -> dict:
         """
         Generate a detailed, in-depth AI explanation for a chunk's text.
         
@@ -246,24 +263,25 @@ class AIService:
         logger.info(f"Generating chunk explanation for chunk_id: {chunk_id}")
         
         # Get chunk from database
-        chunk = session.get(Chunk, chunk_id)
+        chunk = await session.get(Chunk, chunk_id)
         if not chunk:
             logger.warning(f"Chunk not found: id={chunk_id}")
             raise ChunkNotFoundError(chunk_id)
+        await session.commit()  # End the read transaction so no connection is held during the model call
         
         # Compose prompt for AI
-        prompt = f"CHUNK TEXT TO EXPLAIN:\n{chunk.text}\n"
+        prompt = self.chunk_explanation_prompt(chunk)
         
         # Generate AI response
-        ai_text = self.openai_service.generate_text_response(
-            "instructions/chunk_explanation_instructions.txt",
+        ai_text = await self.openai_service.generate_text_response(
+            "chunk_explanation_instructions",
             prompt
         )
         
         # Save explanation to database
         chunk.explanation = ai_text
         session.add(chunk)
-        session.commit()
+        await session.commit()
         
         logger.info(f"AI explanation generated and saved for chunk_id: {chunk_id}")
         return {"explanation": ai_text}
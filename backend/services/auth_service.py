@@ -15,10 +15,12 @@ from backend.exceptions.auth_exceptions import (
     InvalidTokenError,
     TokenMissingUserIdError
 )
-from backend.services.schemas import LoginTokens
+from backend.config import BackendConfig as CONFIG
+from backend.services.principal_cache import PrincipalCache, principal_cache as default_principal_cache
+from backend.services.schemas import LoginTokens, Principal
 # from passlib.context import CryptContext
 
-from backend.services.password_utils import hash_password, verify_password
+from backend.services.password_utils import hash_password, verify_and_update_password
 from backend.services.jwt_utils import create_access_token, create_refresh_token, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
 import jwt
 
@@ -27,9 +29,13 @@ import jwt
 
 class AuthService:
 
-    def get_user_from_access_token(self, token: str, session: Session):
+    def get_user_from_access_token(self, token: str, session: Session) -> Principal:
         """
-        Validate the JWT access token and return the user instance.
+        Validate the JWT access token and return the authenticated user.
+
+        Tokens carry the user id in the 'uid' claim, so a cached principal is
+        returned after the signature check alone; on a miss, or for tokens
+        issued before the claim existed, the user is loaded from the database.
         Raises HTTPException for any auth error.
         """
         from fastapi import HTTPException, status
@@ -56,21 +62,37 @@ class AuthService:
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        user = self.get_user_by_username(username, session)
+        user_id = payload.get("uid")
+        if not isinstance(user_id, int):
+            user = self.get_user_by_username(username, session)
+        else:
+            if self.principal_cache is not None:
+                principal = self.principal_cache.get(user_id)
+                # The username check keeps a token from outliving a rename or a reused id
+                if principal is not None and principal.username == username:
+                    return principal
+            user = session.get(User, user_id)
+            if user is not None and user.username != username:
+                user = None
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return user
+        principal = Principal(id=user.id, username=user.username)
+        if self.principal_cache is not None:
+            self.principal_cache.put(principal)
+        return principal
     """
     Service for user authentication and account management.
     Handles registration, login, password hashing, and JWT token generation/refresh.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, principal_cache: PrincipalCache | None = None):
+        if principal_cache is None and CONFIG.PRINCIPAL_CACHE_ENABLED:
+            principal_cache = default_principal_cache
+        self.principal_cache = principal_cache
 
     def get_access_token_expires(self) -> timedelta:
         """Return timedelta for access token expiration."""
@@ -115,13 +137,13 @@ class AuthService:
     def generate_tokens(self, user, access_token_expires: timedelta, refresh_token_expires: timedelta):
         """
         Generate access and refresh tokens for a user.
-        Uses username as the JWT 'sub' claim for consistency.
+        Uses username as the JWT 'sub' claim for consistency, and the user id as 'uid'.
         """
         access_token = create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+            data={"sub": user.username, "uid": user.id}, expires_delta=access_token_expires
         )
         refresh_token = create_refresh_token(
-            data={"sub": user.username}, expires_delta=refresh_token_expires
+            data={"sub": user.username, "uid": user.id}, expires_delta=refresh_token_expires
         )
         return access_token, refresh_token
 
@@ -177,14 +199,21 @@ class AuthService:
     def authenticate_user(self, username: str, password: str, session: Session) -> User:
         """
         Authenticate a user by username and password.
+        A hash made with another bcrypt cost than the current one is replaced on success.
         Raises InvalidCredentialsError if authentication fails.
         """
         logger.info(f"Authenticating user: {username}")
         try:
             user = self.get_user_by_username(username, session)
-            if not verify_password(password, user.hashed_password):
+            verified, new_hash = verify_and_update_password(password, user.hashed_password)
+            if not verified:
                 logger.warning(f"Invalid password for user: {username}")
                 raise InvalidCredentialsError(username)
+            if new_hash:
+                user.hashed_password = new_hash
+                session.add(user)
+                session.commit()
+                logger.info(f"Password rehashed at the current bcrypt cost for user: {username} (id={user.id})")
             logger.info(f"Authentication successful for user: {username} (id={user.id})")
             return user
         except UserNotFoundError:
@@ -194,10 +223,10 @@ class AuthService:
     def create_login_token(self, user: User) -> str:
         """
         Create a JWT access token for the user.
-        Uses username as the 'sub' claim.
+        Uses username as the 'sub' claim and the user id as 'uid'.
         """
         logger.debug(f"Creating login token for user: {user.username} (id={user.id})")
-        return create_access_token(data={"sub": user.username})
+        return create_access_token(data={"sub": user.username, "uid": user.id})
 
     def login_user(self, username: str, password: str, session: Session) -> LoginTokens:
         """
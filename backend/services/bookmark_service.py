@@ -1,63 +1,57 @@
 """
 BookmarkService: Service class for managing persistent chunk bookmarks per user/metatext.
 """
-from sqlmodel import Session, select
-from ..models import Chunk
+from datetime import datetime
+
+from sqlalchemy import delete, literal, select as sa_select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+from ..models import Bookmark, Chunk
 
 class BookmarkService:
     def get_user_bookmark_for_metatext(self, session: Session, user_id: int, metatext_id: int):
         """
         Returns the chunk bookmarked by the user for the given metatext, or None.
         """
-        chunk = session.exec(
-            select(Chunk)
-            .where(
-                Chunk.metatext_id == metatext_id,
-                Chunk.bookmarked_by_user_id == user_id
-            )
-        ).first()
-        return chunk.id if chunk else None
+        bookmark = session.get(Bookmark, (metatext_id, user_id))
+        return bookmark.chunk_id if bookmark else None
 
     def set_user_bookmark_for_metatext(self, session: Session, user_id: int, metatext_id: int, chunk_id: int):
         """
         Sets the bookmark for a chunk, ensuring only one chunk is bookmarked per user/metatext.
+
+        A single INSERT ... SELECT ... ON CONFLICT DO UPDATE on the (metatext_id,
+        user_id) primary key: the SELECT checks that the chunk belongs to
+        the metatext, so saving progress is one indexed write.
         """
-        # Clear any existing bookmark for this user/metatext
-        existing = session.exec(
-            select(Chunk)
-            .where(
-                Chunk.metatext_id == metatext_id,
-                Chunk.bookmarked_by_user_id == user_id
-            )
-        ).all()
-        for chunk in existing:
-            chunk.bookmarked_by_user_id = None
-            session.add(chunk)
-        # Set bookmark on the specified chunk
-        chunk = session.get(Chunk, chunk_id)
-        if not chunk or chunk.metatext_id != metatext_id:
+        insert = postgresql_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+        chunk_in_metatext = sa_select(
+            literal(user_id), Chunk.metatext_id, Chunk.id, literal(datetime.now())
+        ).where(Chunk.id == chunk_id, Chunk.metatext_id == metatext_id)
+        statement = insert(Bookmark).from_select(
+            ["user_id", "metatext_id", "chunk_id", "updated_at"], chunk_in_metatext
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["metatext_id", "user_id"],
+            set_={"chunk_id": statement.excluded.chunk_id, "updated_at": statement.excluded.updated_at},
+        )
+        result = session.exec(statement)  # type: ignore[call-overload]
+        if result.rowcount == 0:
+            session.rollback()
             raise ValueError("Chunk not found or does not belong to the specified metatext.")
-        chunk.bookmarked_by_user_id = user_id
-        session.add(chunk)
         session.commit()
-        session.refresh(chunk)
-        return chunk.id
+        return chunk_id
 
     def clear_user_bookmark_for_metatext(self, session: Session, user_id: int, metatext_id: int):
         """
         Clears the user's bookmark for the given metatext.
         """
-        chunk = session.exec(
-            select(Chunk)
-            .where(
-                Chunk.metatext_id == metatext_id,
-                Chunk.bookmarked_by_user_id == user_id
-            )
-        ).first()
-        if chunk:
-            chunk.bookmarked_by_user_id = None
-            session.add(chunk)
+        result = session.exec(  # type: ignore[call-overload]
+            delete(Bookmark).where(Bookmark.user_id == user_id, Bookmark.metatext_id == metatext_id)
+        )
+        if result.rowcount:
             session.commit()
             return True
         else:
-            raise ValueError("No bookmark found for the specified user and metatext.")
\ No newline at end of file
+            raise ValueError("No bookmark found for the specified user and metatext.")
@@ -1,9 +1,15 @@
 """Chunk service for business logic operations."""
+import asyncio
+from typing import Callable, TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
 from sqlmodel import select, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
 from loguru import logger
 
-from backend.models import Chunk, ChunkRead, Metatext, CreateChunk
+from backend.models import Bookmark, Chunk, Favorite, ChunkRead, Metatext, CreateChunk
 from backend.exceptions.chunk_exceptions import (
     ChunkNotFoundError,
     InvalidSplitIndexError,
@@ -11,6 +17,9 @@ from backend.exceptions.chunk_exceptions import (
     ChunkUpdateError
 )
 from backend.services.ai_image_service import AiImageService
+from backend.services.passage_index import PassageIndex, passage_index as default_passage_index
+
+T = TypeVar("T")
 
 
 class ChunkService:
@@ -46,11 +55,13 @@ class ChunkService:
         session.add(chunk)
         session.commit()
         session.refresh(chunk)
+        self.passage_index.apply_changes(metatext_id, changed={chunk.id: chunk.text})
         return chunk
     """Service for chunk business logic operations."""
     
-    def __init__(self, ai_image_service: AiImageService | None = None):
+    def __init__(self, ai_image_service: AiImageService | None = None, passage_index: PassageIndex | None = None):
         self.ai_image_service = ai_image_service or AiImageService()
+        self.passage_index = passage_index or default_passage_index
     
     @staticmethod
     def split_chunk_text(text: str, word_index: int) -> tuple[str, str]:
@@ -78,24 +89,68 @@ class ChunkService:
             chunk: The chunk to update
             data: Dictionary of field updates
         """
-        allowed_fields = ['text', 'summary', 'note', 'evaluation', 'explanation', 'bookmarked_by_user_id']
+        allowed_fields = ['text', 'summary', 'note', 'evaluation', 'explanation']
         for field in allowed_fields:
             if field in data:
                 setattr(chunk, field, data[field])
     
+    @staticmethod
+    def merge_chunk_fields(first: Chunk, second: Chunk) -> None:
+        """
+        Fold the second chunk's text and string fields into the first.
+        """
+        # Combine text
+        first.text = f"{first.text} {second.text}".strip()
+
+        # Merge other string fields by appending with a newline to preserve all data
+        def _merge_str_field(field_name: str):
+            first_val = getattr(first, field_name, None)
+            second_val = getattr(second, field_name, None)
+            # Treat None as empty for safe merge
+            first_s = (first_val or "").strip()
+            second_s = (second_val or "").strip()
+            if second_s:
+                if first_s:
+                    # Add a blank line between concatenated strings
+                    setattr(first, field_name, f"{first_s}\n\n{second_s}")
+                else:
+                    setattr(first, field_name, second_s)
+
+        for fname in ("note", "summary", "evaluation", "explanation"):
+            _merge_str_field(fname)
+
+    @staticmethod
+    def move_bookmarks(from_chunk_id: int, to_chunk_id: int):
+        """Statement pointing every bookmark on a chunk about to be deleted at the chunk that absorbs it."""
+        return update(Bookmark).where(Bookmark.chunk_id == from_chunk_id).values(chunk_id=to_chunk_id)  # type: ignore[arg-type]
+
+    @staticmethod
+    def move_favorites(from_chunk_id: int, to_chunk_id: int):
+        """
+        Statement moving favorites off a chunk about to be deleted onto the chunk that absorbs it.
+        Users who already favorited both keep their existing row; the leftover is deleted with the chunk.
+        """
+        already_favorited = select(Favorite.user_id).where(Favorite.chunk_id == to_chunk_id)
+        return (
+            update(Favorite)
+            .where(Favorite.chunk_id == from_chunk_id, Favorite.user_id.not_in(already_favorited))  # type: ignore[arg-type, union-attr]
+            .values(chunk_id=to_chunk_id)
+        )
+
     def get_chunk_by_id(self, chunk_id: int, user_id: int, session: Session) -> Chunk:
         """
         Get a chunk by ID, ensuring it belongs to the given user.
         """
         logger.info(f"Retrieving chunk with id: {chunk_id} for user_id: {user_id}")
-        chunk = session.get(Chunk, chunk_id)
-        if not chunk:
-            logger.warning(f"Chunk not found: id={chunk_id}")
-            raise ChunkNotFoundError(chunk_id)
         # Enforce per-user access: chunk must belong to a Metatext owned by user_id
-        metatext = session.get(Metatext, chunk.metatext_id)
-        if not metatext or metatext.user_id != user_id:
-            logger.warning(f"User {user_id} unauthorized for chunk {chunk_id}")
+        chunk = session.exec(
+            select(Chunk)
+            .join(Metatext)
+            .where(Chunk.id == chunk_id, Metatext.user_id == user_id)
+            .options(selectinload(Chunk.images), selectinload(Chunk.rewrites))  # type: ignore
+        ).first()
+        if not chunk:
+            logger.warning(f"Chunk not found or not owned by user: id={chunk_id}, user_id={user_id}")
             raise ChunkNotFoundError(chunk_id)
         logger.debug(f"Chunk found: id={chunk.id}, metatext_id={chunk.metatext_id}")
         return chunk
@@ -174,6 +229,7 @@ class ChunkService:
         session.commit()
         session.refresh(chunk)
         session.refresh(new_chunk)
+        self.passage_index.apply_changes(chunk.metatext_id, changed={chunk.id: chunk.text, new_chunk.id: new_chunk.text})
         
         logger.info(f"Chunk split successful: old_chunk_id={chunk.id}, new_chunk_id={new_chunk.id}")
         return [chunk, new_chunk]
@@ -216,31 +272,7 @@ class ChunkService:
 
         try:
             logger.info(f"Found second chunk to combine: id={second.id}")
-            # Combine text
-            first.text = f"{first.text} {second.text}".strip()
-
-            # Merge other string fields by appending with a newline to preserve all data
-            def _merge_str_field(field_name: str):
-                first_val = getattr(first, field_name, None)
-                second_val = getattr(second, field_name, None)
-                # Treat None as empty for safe merge
-                first_s = (first_val or "").strip()
-                second_s = (second_val or "").strip()
-                if second_s:
-                    if first_s:
-                        # Add a blank line between concatenated strings
-                        setattr(first, field_name, f"{first_s}\n\n{second_s}")
-                    else:
-                        setattr(first, field_name, second_s)
-
-            for fname in ("note", "summary", "evaluation", "explanation"):
-                _merge_str_field(fname)
-
-            # Scalar adoption: if first has no favorite/bookmark but second does, adopt it.
-            if getattr(first, "favorited_by_user_id", None) is None and getattr(second, "favorited_by_user_id", None) is not None:
-                first.favorited_by_user_id = second.favorited_by_user_id
-            if getattr(first, "bookmarked_by_user_id", None) is None and getattr(second, "bookmarked_by_user_id", None) is not None:
-                first.bookmarked_by_user_id = second.bookmarked_by_user_id
+            self.merge_chunk_fields(first, second)
 
             # Reassign children from second -> first to preserve FKs (e.g., Rewrite.chunk_id NOT NULL)
             # Load relationships if not already loaded
@@ -257,6 +289,9 @@ class ChunkService:
                 for img in second_images:
                     img.chunk = first
 
+            session.exec(self.move_bookmarks(second.id, first.id))  # type: ignore[call-overload]
+            session.exec(self.move_favorites(second.id, first.id))  # type: ignore[call-overload]
+
             # Flush reassignments so DB sees updates before deleting second
             session.flush()
 
@@ -266,6 +301,7 @@ class ChunkService:
             logger.debug(f"Deleted second chunk: id={second.id}")
             session.commit()
             session.refresh(first)
+            self.passage_index.apply_changes(first.metatext_id, changed={first.id: first.text}, removed=[second.id])
             logger.info(f"Chunks combined successfully: kept_chunk_id={first.id}, deleted_chunk_id={second.id}")
             return first
         except Exception as e:
@@ -295,9 +331,73 @@ class ChunkService:
             session.add(chunk)
             session.commit()
             session.refresh(chunk)
+            if "text" in chunk_data:
+                self.passage_index.apply_changes(chunk.metatext_id, changed={chunk.id: chunk.text})
             logger.info(f"Chunk updated successfully: id={chunk.id}")
             return chunk
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating chunk {chunk_id}: {e}")
             raise ChunkUpdateError(chunk_id, str(e))
+
+
+class _PendingIndexChanges:
+    """Stands in for the passage index inside run_sync, recording updates to apply afterwards off the event loop."""
+
+    def __init__(self):
+        self.changes: list[tuple] = []
+
+    def apply_changes(self, metatext_id: int, changed: dict[int, str] | None = None, removed: list[int] | None = None) -> None:
+        self.changes.append((metatext_id, changed, removed))
+
+    def flush(self, passage_index: PassageIndex) -> None:
+        for metatext_id, changed, removed in self.changes:
+            passage_index.apply_changes(metatext_id, changed, removed)
+
+
+class AsyncChunkService:
+    """
+    Async counterpart of ChunkService for handlers running on the event loop.
+
+    Each method runs the ChunkService implementation through
+    AsyncSession.run_sync, like AsyncMetatextService. Returned chunks have
+    their images and rewrites loaded before control is back on the event
+    loop, where lazy loads cannot run. Passage index file updates made by the
+    sync code are recorded and applied in a worker thread afterwards.
+    """
+
+    def __init__(self, passage_index: PassageIndex | None = None):
+        self.passage_index = passage_index or default_passage_index
+
+    @staticmethod
+    def _load_children(result):
+        for chunk in result if isinstance(result, list) else [result]:
+            if isinstance(chunk, Chunk):
+                _ = (chunk.images, chunk.rewrites)  # Lazy loads still work here, inside run_sync
+        return result
+
+    async def _run(self, session: AsyncSession, operation: Callable[[ChunkService, Session], T]) -> T:
+        pending = _PendingIndexChanges()
+        chunk_service = ChunkService(passage_index=pending)  # type: ignore[arg-type]
+        result = await session.run_sync(lambda sync_session: self._load_children(operation(chunk_service, sync_session)))
+        if pending.changes:
+            await asyncio.to_thread(pending.flush, self.passage_index)
+        return result
+
+    async def create_chunk(self, chunk_data: CreateChunk, user_id: int, session: AsyncSession) -> Chunk:
+        return await self._run(session, lambda service, s: service.create_chunk(chunk_data, user_id, s))
+
+    async def get_chunk_by_id(self, chunk_id: int, user_id: int, session: AsyncSession) -> Chunk:
+        return await self._run(session, lambda service, s: service.get_chunk_by_id(chunk_id, user_id, s))
+
+    async def get_chunk(self, chunk_id: int, user_id: int, session: AsyncSession) -> ChunkRead:
+        return await self._run(session, lambda service, s: service.get_chunk(chunk_id, user_id, s))
+
+    async def split_chunk(self, chunk_id: int, word_index: int, user_id: int, session: AsyncSession) -> list[Chunk]:
+        return await self._run(session, lambda service, s: service.split_chunk(chunk_id, word_index, user_id, s))
+
+    async def combine_chunks(self, first_chunk_id: int, user_id: int, session: AsyncSession) -> Chunk:
+        return await self._run(session, lambda service, s: service.combine_chunks(first_chunk_id, user_id, s))
+
+    async def update_chunk(self, chunk_id: int, chunk_data: dict, user_id: int, session: AsyncSession) -> Chunk:
+        return await self._run(session, lambda service, s: service.update_chunk(chunk_id, chunk_data, user_id, s))
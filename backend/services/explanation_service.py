@@ -5,91 +5,267 @@ Single word inputs will be saved as `WordDefinition`.
 Multiple word inputs will be saved as `PhraseExplanation`.
 
 Returns a consistent `ExplanationResponse` regardless of input type.
+
+Before calling the model, `explain` looks for a stored explanation of the same
+(normalised) words in the same context window, from this user or from anyone
+reading the same source document, and reuses it on a hit.
 """
+import hashlib
+import re
+import unicodedata
+from datetime import datetime
 
+from sqlalchemy import case, or_, tuple_
 from sqlmodel import Session, select
-from backend.models import ExplanationResponse,ExplanationResponse2,  ExplanationsResponse, User, Explanation, ExplanationType
-from backend.services.openai_service import OpenAIService
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.config import BackendConfig as CONFIG
+from backend.dictionary import DictionaryBackend
+from backend.metrics import DICTIONARY_LOOKUPS_TOTAL, EXPLANATION_LOOKUPS_TOTAL
+from backend.models import ExplanationResponse,ExplanationResponse2, ExplanationLookupResponse, ExplanationsResponse, ExplanationReviewItem, User, Explanation, ExplanationType, Metatext
+from backend.services.openai_service import AsyncOpenAIService
 from backend.exceptions.ai_exceptions import WordDefinitionValidationError
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.services.pagination import decode_cursor, encode_cursor
 from loguru import logger
 
+# Word characters with inner apostrophes ("don't", "o'clock"); everything else separates tokens
+_TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
 class ExplanationService:
     """
     Service to handle explanations for one or more words using a single instruction file.
     Decides internally whether to treat input as a single word or multiple words.
     Returns a consistent ExplanationResponse regardless of input type.
     """
-    def __init__(self, openai_service: OpenAIService | None = None):
-        self.openai_service = openai_service or OpenAIService()
-        self.instruction_file = "instructions/explain_words_with_context.txt"
+    def __init__(self, openai_service: AsyncOpenAIService | None = None, dictionary: DictionaryBackend | None = None):
+        self.openai_service = openai_service or AsyncOpenAIService()
+        self.dictionary = dictionary  # Local headword lookups for explain2, see backend/dictionary.py
+        self.instructions_key = "explain_words_with_context"
+
+    @staticmethod
+    def _tokens(text: str) -> list[str]:
+        # NFKC folds compatibility forms, casefold handles case; curly apostrophes become straight ones
+        text = unicodedata.normalize("NFKC", text).casefold().replace("\u2019", "'")
+        tokens = _TOKEN_PATTERN.findall(text)
+        # A possessive is the same word ("Ahab's" -> "ahab")
+        return [token[:-2] if token.endswith("'s") else token for token in tokens]
 
-    def explain(self, user: User, words: str, context: str, metatext_id: int, session: Session) -> ExplanationResponse:
+    @classmethod
+    def words_key(cls, words: str) -> str:
+        """Normalise words for lookup: case, punctuation, whitespace and possessives are ignored."""
+        return " ".join(cls._tokens(words))
+
+    @classmethod
+    def context_hash(cls, words: str, context: str, window: int = CONFIG.EXPLANATION_REUSE_CONTEXT_TOKENS) -> str:
+        """
+        Hash the normalised context around the first occurrence of words.
+
+        Only `window` tokens on each side count, so the same passage selected
+        with slightly different surrounding text still hashes the same. If the
+        words do not occur in the context, the whole context is hashed.
+        """
+        words_tokens = cls._tokens(words)
+        tokens = cls._tokens(context)
+        size = len(words_tokens)
+        for start in range(len(tokens) - size + 1):
+            if size and tokens[start:start + size] == words_tokens:
+                tokens = tokens[max(0, start - window):start + size + window]
+                break
+        return hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+
+    async def find_reusable(
+        self,
+        user_id: int,
+        metatext_id: int,
+        words_key: str,
+        context_hash: str,
+        session: AsyncSession
+    ) -> Explanation | None:
+        """
+        Find a stored explanation of the same words in the same context.
+
+        Candidates are the user's own explanations and those of anyone reading
+        the metatext's source document; the user's own (then the newest) win.
+        """
+        source_document_id = select(Metatext.source_document_id).where(Metatext.id == metatext_id).scalar_subquery()
+        statement = (
+            select(Explanation)
+            .join(Metatext, Metatext.id == Explanation.metatext_id)
+            .where(Explanation.words_key == words_key, Explanation.context_hash == context_hash)
+            .where(or_(Explanation.user_id == user_id, Metatext.source_document_id == source_document_id))
+            .order_by(case((Explanation.user_id == user_id, 0), else_=1), Explanation.created_at.desc())
+            .limit(1)
+        )
+        return (await session.exec(statement)).first()
+
+    async def explain(self, user: User, words: str, context: str, metatext_id: int, session: AsyncSession) -> ExplanationResponse:
+        """
+        Explain words in their context, reusing a stored explanation when possible.
+
+        Raises:
+            WordDefinitionValidationError: If words or metatext_id is missing
+            MetatextNotFoundError: If the metatext does not exist or is owned by another user
+        """
         if not words:
             raise WordDefinitionValidationError("words", "Missing words")
         if metatext_id is None:
             raise WordDefinitionValidationError("metatext_id", "Missing metatext_id")
+        # The reuse scope comes from this metatext and the result is saved on it, so it must be the caller's
+        owned = (await session.exec(
+            select(Metatext.id).where(Metatext.id == metatext_id, Metatext.user_id == user.id)
+        )).first()
+        if owned is None:
+            logger.warning(f"Meta-text not found or not owned by user: id={metatext_id}, user_id={user.id}")
+            raise MetatextNotFoundError(metatext_id)
+
+        words_key = self.words_key(words)
+        context_hash = self.context_hash(words, context)
+
+        if CONFIG.EXPLANATION_REUSE_ENABLED:
+            previous = await self.find_reusable(user.id, metatext_id, words_key, context_hash, session)
+            if previous is not None:
+                EXPLANATION_LOOKUPS_TOTAL.inc(source="stored")
+                if previous.user_id != user.id or previous.metatext_id != metatext_id:
+                    # Copy it so it shows up in this user's review list for this metatext
+                    session.add(Explanation.create_with_type(
+                        user_id=user.id,
+                        words=words,
+                        context=context,
+                        words_key=words_key,
+                        context_hash=context_hash,
+                        explanation=previous.explanation,
+                        explanation_in_context=previous.explanation_in_context,
+                        metatext_id=metatext_id
+                    ))
+                    await session.commit()
+                logger.info(f"Reused explanation id={previous.id} for: '{words}'")
+                return ExplanationResponse(
+                    explanation=previous.explanation,
+                    explanation_in_context=previous.explanation_in_context
+                )
 
-        is_single_word = len(words.split()) == 1
         prompt = f"words='{words}' context='{context}'"
 
-        ai_data : ExplanationResponse = self.openai_service.generate_parsed_response(
-            self.instruction_file,
+        ai_data : ExplanationResponse = await self.openai_service.generate_parsed_response(
+            self.instructions_key,
             prompt,
             ExplanationResponse
         )
+        EXPLANATION_LOOKUPS_TOTAL.inc(source="model")
+
+        log_entry = Explanation.create_with_type(
+            user_id=user.id,
+            words=words,
+            context=context,
+            words_key=words_key,
+            context_hash=context_hash,
+            explanation=ai_data.explanation,
+            explanation_in_context=ai_data.explanation_in_context,
+            metatext_id=metatext_id
+        )
+        session.add(log_entry)
+        await session.commit()
+        logger.info(f"Explanation generated and saved for {log_entry.type.value}: '{words}'")
 
-        if is_single_word:
-            log_entry = Explanation.create_with_type(
-                user_id=user.id,
-                words=words,
-                context=context,
-                explanation=ai_data.explanation,
-                explanation_in_context=ai_data.explanation_in_context,
-                metatext_id=metatext_id
-            )
-            session.add(log_entry)
-            session.commit()  # TODO: DRY
-            logger.info(f"Word definition generated and saved for word: '{words}'")
-        else:
-            log_entry = Explanation.create_with_type(
-                user_id=user.id,
-                words=words,
-                context=context,
-                explanation=ai_data.explanation,
-                explanation_in_context=ai_data.explanation_in_context,
-                metatext_id=metatext_id
-            )
-            session.add(log_entry)
-            session.commit()
-            logger.info(f"Words explanation generated and saved for: '{words}'")
-        
         return ExplanationResponse(
             explanation=ai_data.explanation,
             explanation_in_context=ai_data.explanation_in_context
         )
 
-    def get_review_data(self, metatext_id: int, user_id: int, session: Session) -> ExplanationsResponse:
+    def get_review_data(
+        self,
+        metatext_id: int,
+        user_id: int,
+        session: Session,
+        type: ExplanationType | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        summary: bool = False
+    ) -> ExplanationsResponse:
         """
-        Get all review data (word_list, explanations) for a specific metatext and user.
-        Returns a ExplanationsResponse: with word_list (type==word) and phrase_list (type==phrase).
+        Get review data (word_list, phrase_list) for a specific metatext and user, oldest first.
+
+        Filtering by type and paging with a keyset on (created_at, id) both
+        happen in SQL, on the (metatext_id, user_id, type, created_at) index.
+        Without a cursor or limit every entry is returned in one response.
+
+        Args:
+            metatext_id: The ID of the metatext
+            user_id: The ID of the user who wrote the explanations
+            session: Database session
+            type: Only return words or only phrases
+            cursor: Opaque cursor from the previous page, or None for the first page
+            limit: Maximum number of entries to return (both lists together)
+            summary: Leave out context, explanation and explanation_in_context
+
+        Returns:
+            ExplanationsResponse with the entries and, when paginated, the cursor for the next page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
         """
-        
-        # Fetch all Explanation records for this metatext and user
-        explanations = list(session.exec(
-            select(Explanation)
-            .where((Explanation.metatext_id == metatext_id) & (Explanation.user_id == user_id))
-        ).all())
-        
-        # Filter by type and return
+        columns = [
+            Explanation.id, Explanation.words, Explanation.type, Explanation.created_at,
+            Explanation.user_id, Explanation.metatext_id,
+        ]
+        if not summary:
+            columns += [Explanation.context, Explanation.explanation, Explanation.explanation_in_context]
+        statement = select(*columns).where(Explanation.metatext_id == metatext_id, Explanation.user_id == user_id)
+        if type is not None:
+            statement = statement.where(Explanation.type == type)
+        if cursor:
+            created_at, explanation_id = decode_cursor(cursor, 2)
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except (TypeError, ValueError):
+                raise InvalidCursorError(cursor)
+            if not isinstance(explanation_id, int):
+                raise InvalidCursorError(cursor)
+            statement = statement.where(tuple_(Explanation.created_at, Explanation.id) > (created_at, explanation_id))
+            limit = limit or CONFIG.DEFAULT_REVIEW_PAGE_SIZE
+        statement = statement.order_by(Explanation.created_at, Explanation.id)
+        if limit is not None:
+            # Fetch one extra row to learn whether another page exists
+            statement = statement.limit(limit + 1)
+
+        rows = session.exec(statement).all()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at.isoformat(), rows[-1].id)
+
+        items = [ExplanationReviewItem(**row._mapping) for row in rows]
         return ExplanationsResponse(
-            word_list=[e for e in explanations if e.type == ExplanationType.word],
-            phrase_list=[e for e in explanations if e.type == ExplanationType.phrase]
+            word_list=[item for item in items if item.type == ExplanationType.word],
+            phrase_list=[item for item in items if item.type == ExplanationType.phrase],
+            next_cursor=next_cursor
         )
 
-    def explain2(self, word: str, session: Session, context: str | None = None) -> ExplanationResponse2:
+    async def explain2(
+        self,
+        word: str,
+        context: str | None = None,
+        include_comprehensive: bool = True
+    ) -> ExplanationLookupResponse:
+        """
+        Explain a word concisely and, if asked, comprehensively in its context.
+
+        Known headwords get their concise explanation from the local
+        dictionary; the model is only called for the comprehensive one, or
+        for words the dictionary does not know.
+        """
         if not word:
             raise WordDefinitionValidationError("word", "Missing word")
 
+        definition = None
+        if self.dictionary is not None:
+            definition = self.dictionary.lookup(word)
+            DICTIONARY_LOOKUPS_TOTAL.inc(outcome="miss" if definition is None else "hit")
+            if definition is not None and not include_comprehensive:
+                logger.info(f"Dictionary hit for explain2 word: '{word}'")
+                return ExplanationLookupResponse(word=word, concise=definition, source="dictionary")
+
         prompt = f"word='{word}'"
         if context:
             # Trim excessive context to avoid blowing up prompt size
@@ -98,11 +274,18 @@ class ExplanationService:
                 trimmed = trimmed[:1200]
             prompt += f" context='{trimmed}'"
 
-        ai_data: ExplanationResponse2 = self.openai_service.generate_parsed_response(
-            "instructions/explain2.txt",
+        ai_data: ExplanationResponse2 = await self.openai_service.generate_parsed_response(
+            "explain2",
             prompt,
             ExplanationResponse2
         )
+        # A dictionary hit keeps its concise answer, whether or not the comprehensive one was asked for
+        response = ExplanationLookupResponse(
+            word=ai_data.word,
+            concise=ai_data.concise if definition is None else definition,
+            comprehensive=ai_data.comprehensive if include_comprehensive else None,
+            source="model" if definition is None else "dictionary"
+        )
 
         # log_entry = Explanation.create_with_type(
         #     user_id=user.id,
@@ -114,4 +297,4 @@ class ExplanationService:
         # session.commit()
         # logger.info(f"Word definition generated and saved for word: '{word}'")
 
-        return ai_data
\ No newline at end of file
+        return response
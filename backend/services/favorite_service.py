@@ -1,23 +1,105 @@
 """
 Service layer for managing favorite chunks for users.
 """
+from datetime import datetime
+
+from sqlalchemy import delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
 from sqlmodel import select, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
-from backend.models import Chunk
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.models import Chunk, Favorite, FavoriteChunk, FavoritePage, Metatext
+from backend.services.pagination import decode_cursor, encode_cursor
 from loguru import logger
 
 class FavoriteService:
     @staticmethod
-    def favorite_chunk(chunk_id: int, user_id: int, session: Session) -> Chunk:
+    def owned_chunk_statement(chunk_id: int, user_id: int):
+        """The chunk, only if it belongs to a metatext owned by the user; users can only favorite their own chunks."""
+        return (
+            select(Chunk)
+            .join(Metatext, Metatext.id == Chunk.metatext_id)  # type: ignore[arg-type]
+            .where(Chunk.id == chunk_id, Metatext.user_id == user_id)
+        )
+
+    @staticmethod
+    def add_statement(chunk_id: int, user_id: int, dialect_name: str):
+        """INSERT ... ON CONFLICT DO NOTHING on the (chunk_id, user_id) key, so favoriting twice is a no-op."""
+        insert = postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+        return insert(Favorite).values(
+            chunk_id=chunk_id, user_id=user_id, created_at=datetime.now()
+        ).on_conflict_do_nothing(index_elements=["chunk_id", "user_id"])
+
+    @staticmethod
+    def remove_statement(chunk_id: int, user_id: int):
+        return delete(Favorite).where(Favorite.chunk_id == chunk_id, Favorite.user_id == user_id)  # type: ignore[arg-type]
+
+    @staticmethod
+    def page_statement(user_id: int, cursor: str | None, limit: int):
         """
-        Mark a chunk as favorite for the user.
+        One joined query for a page of favorites, newest first, with a light projection of each chunk.
+
+        Paging is a keyset on (created_at, chunk_id), read in order from the
+        (user_id, created_at, chunk_id) index. One extra row is fetched to
+        learn whether another page exists.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
         """
-        chunk = session.get(Chunk, chunk_id)
+        statement = (
+            select(
+                Favorite.chunk_id,
+                Chunk.metatext_id,
+                Metatext.title.label("metatext_title"),  # type: ignore[attr-defined]
+                Chunk.position,
+                func.substr(Chunk.text, 1, CONFIG.FAVORITE_PREVIEW_CHARS).label("preview"),
+                Favorite.created_at.label("favorited_at"),  # type: ignore[attr-defined]
+            )
+            .join(Chunk, Chunk.id == Favorite.chunk_id)  # type: ignore[arg-type]
+            .join(Metatext, Metatext.id == Chunk.metatext_id)  # type: ignore[arg-type]
+            # Rows left from before favorites were owner-only don't leak other users' text
+            .where(Favorite.user_id == user_id, Metatext.user_id == user_id)
+        )
+        if cursor:
+            favorited_at, chunk_id = decode_cursor(cursor, 2)
+            try:
+                favorited_at = datetime.fromisoformat(favorited_at)
+            except (TypeError, ValueError):
+                raise InvalidCursorError(cursor)
+            if not isinstance(chunk_id, int):
+                raise InvalidCursorError(cursor)
+            statement = statement.where(tuple_(Favorite.created_at, Favorite.chunk_id) < (favorited_at, chunk_id))
+        return statement.order_by(
+            Favorite.created_at.desc(), Favorite.chunk_id.desc()  # type: ignore[attr-defined]
+        ).limit(limit + 1)
+
+    @staticmethod
+    def build_page(rows, limit: int) -> FavoritePage:
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].favorited_at.isoformat(), rows[-1].chunk_id)
+        return FavoritePage(favorites=[FavoriteChunk(**row._mapping) for row in rows], next_cursor=next_cursor)
+
+    @staticmethod
+    def _get_owned_chunk(chunk_id: int, user_id: int, session: Session) -> Chunk:
+        chunk = session.exec(FavoriteService.owned_chunk_statement(chunk_id, user_id)).first()
         if not chunk:
-            logger.warning(f"Chunk not found: id={chunk_id}")
+            logger.warning(f"Chunk not found or not owned by user: id={chunk_id}, user_id={user_id}")
             raise HTTPException(status_code=404, detail="Chunk not found")
-        chunk.favorited_by_user_id = user_id
-        session.add(chunk)
+        return chunk
+
+    @staticmethod
+    def favorite_chunk(chunk_id: int, user_id: int, session: Session) -> Chunk:
+        """
+        Mark a chunk as favorite for the user.
+        """
+        chunk = FavoriteService._get_owned_chunk(chunk_id, user_id, session)
+        session.exec(FavoriteService.add_statement(chunk_id, user_id, session.get_bind().dialect.name))  # type: ignore[call-overload]
         session.commit()
         session.refresh(chunk)
         logger.info(f"Chunk {chunk_id} favorited by user {user_id}")
@@ -28,26 +110,89 @@ class FavoriteService:
         """
         Remove a chunk from user's favorites.
         """
-        chunk = session.get(Chunk, chunk_id)
-        if not chunk:
-            logger.warning(f"Chunk not found: id={chunk_id}")
-            raise HTTPException(status_code=404, detail="Chunk not found")
-        if chunk.favorited_by_user_id != user_id:
+        chunk = FavoriteService._get_owned_chunk(chunk_id, user_id, session)
+        result = session.exec(FavoriteService.remove_statement(chunk_id, user_id))  # type: ignore[call-overload]
+        if result.rowcount == 0:
+            session.rollback()
             logger.warning(f"User {user_id} tried to unfavorite chunk {chunk_id} not favorited by them")
             raise HTTPException(status_code=403, detail="Not authorized to unfavorite this chunk")
-        chunk.favorited_by_user_id = None
-        session.add(chunk)
         session.commit()
         session.refresh(chunk)
         logger.info(f"Chunk {chunk_id} unfavorited by user {user_id}")
         return chunk
 
     @staticmethod
-    def get_favorite_chunks(user_id: int, session: Session) -> list[Chunk]:
+    def get_favorite_chunks(
+        user_id: int,
+        session: Session,
+        cursor: str | None = None,
+        limit: int = CONFIG.DEFAULT_FAVORITE_PAGE_SIZE
+    ) -> FavoritePage:
+        """
+        Get a page of the user's favorite chunks, newest first.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        rows = session.exec(FavoriteService.page_statement(user_id, cursor, limit)).all()
+        page = FavoriteService.build_page(rows, limit)
+        logger.info(f"Returning {len(page.favorites)} favorite chunks for user {user_id}")
+        return page
+
+
+class AsyncFavoriteService:
+    """Async counterpart of FavoriteService; chunks are returned with images and rewrites loaded."""
+
+    @staticmethod
+    async def _get_owned_chunk(chunk_id: int, user_id: int, session: AsyncSession) -> Chunk:
+        chunk = (await session.exec(
+            FavoriteService.owned_chunk_statement(chunk_id, user_id)
+            .options(selectinload(Chunk.images), selectinload(Chunk.rewrites))  # type: ignore
+        )).first()
+        if not chunk:
+            logger.warning(f"Chunk not found or not owned by user: id={chunk_id}, user_id={user_id}")
+            raise HTTPException(status_code=404, detail="Chunk not found")
+        return chunk
+
+    @staticmethod
+    async def favorite_chunk(chunk_id: int, user_id: int, session: AsyncSession) -> Chunk:
+        """
+        Mark a chunk as favorite for the user.
+        """
+        chunk = await AsyncFavoriteService._get_owned_chunk(chunk_id, user_id, session)
+        await session.exec(FavoriteService.add_statement(chunk_id, user_id, session.get_bind().dialect.name))  # type: ignore[call-overload]
+        await session.commit()
+        await session.refresh(chunk, ["favorited_by_user_id"])
+        logger.info(f"Chunk {chunk_id} favorited by user {user_id}")
+        return chunk
+
+    @staticmethod
+    async def unfavorite_chunk(chunk_id: int, user_id: int, session: AsyncSession) -> Chunk:
+        """
+        Remove a chunk from user's favorites.
+        """
+        chunk = await AsyncFavoriteService._get_owned_chunk(chunk_id, user_id, session)
+        result = await session.exec(FavoriteService.remove_statement(chunk_id, user_id))  # type: ignore[call-overload]
+        if result.rowcount == 0:
+            await session.rollback()
+            logger.warning(f"User {user_id} tried to unfavorite chunk {chunk_id} not favorited by them")
+            raise HTTPException(status_code=403, detail="Not authorized to unfavorite this chunk")
+        await session.commit()
+        await session.refresh(chunk, ["favorited_by_user_id"])
+        logger.info(f"Chunk {chunk_id} unfavorited by user {user_id}")
+        return chunk
+
+    @staticmethod
+    async def get_favorite_chunks(
+        user_id: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        limit: int = CONFIG.DEFAULT_FAVORITE_PAGE_SIZE
+    ) -> FavoritePage:
         """
-        Get all favorite chunks for a user.
+        Get a page of the user's favorite chunks, newest first (see FavoriteService.get_favorite_chunks).
         """
-        statement = select(Chunk).where(Chunk.favorited_by_user_id == user_id)
-        results = session.exec(statement).all()
-        logger.info(f"User {user_id} has {len(results)} favorite chunks")
-        return list(results)
+        rows = (await session.exec(FavoriteService.page_statement(user_id, cursor, limit))).all()
+        page = FavoriteService.build_page(rows, limit)
+        logger.info(f"Returning {len(page.favorites)} favorite chunks for user {user_id}")
+        return page
@@ -0,0 +1,121 @@
+"""In-memory registry of the prompt instruction files in backend/instructions."""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from loguru import logger
+
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.ai_exceptions import InstructionsFileNotFoundError
+
+INSTRUCTIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "instructions")
+
+
+@dataclass(frozen=True)
+class InstructionsEntry:
+    """Contents of one instructions file at a given modification time."""
+    key: str
+    path: str
+    content: str
+    mtime_ns: int
+
+
+class InstructionsRegistry:
+    """
+    Registry of instruction file contents keyed by file stem.
+
+    Files are loaded once (normally at startup) into an immutable mapping.
+    Lookups are served from memory; a file's mtime is checked at most once per
+    check_interval seconds and the file is re-read only when it changed. A
+    reload swaps in a new mapping, so readers never see a partially updated
+    registry.
+    """
+
+    def __init__(self, directory: str = INSTRUCTIONS_DIR, check_interval: float = CONFIG.INSTRUCTIONS_RELOAD_CHECK_SECONDS):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._entries: Mapping[str, InstructionsEntry] = MappingProxyType({})
+        self._last_checked: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_key(name: str) -> str:
+        """
+        Map a key or legacy path (e.g. 'instructions/explain2.txt') to its key ('explain2').
+        """
+        return os.path.splitext(os.path.basename(name))[0]
+
+    def preload(self) -> None:
+        """Load every .txt file in the instructions directory."""
+        entries = {}
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(".txt"):
+                entry = self._read(self.normalize_key(filename))
+                entries[entry.key] = entry
+        now = time.monotonic()
+        with self._lock:
+            self._entries = MappingProxyType(entries)
+            self._last_checked = {key: now for key in entries}
+        logger.info(f"Loaded {len(entries)} instruction files from {self.directory}")
+
+    def keys(self) -> list[str]:
+        """Return the keys of all loaded instruction files."""
+        return list(self._entries.keys())
+
+    def get(self, name: str) -> str:
+        """
+        Return the contents of an instructions file by key.
+
+        Raises:
+            InstructionsFileNotFoundError: If no such file exists or it cannot be read
+        """
+        key = self.normalize_key(name)
+        entry = self._entries.get(key)
+        if entry is None:
+            # Not preloaded (e.g. added after startup); load it on first use
+            return self._store(self._read(key)).content
+
+        now = time.monotonic()
+        if now - self._last_checked.get(key, 0.0) < self.check_interval:
+            return entry.content
+        self._last_checked[key] = now
+
+        try:
+            mtime_ns = os.stat(entry.path).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Instructions file disappeared: {entry.path}")
+            raise InstructionsFileNotFoundError(key, str(e))
+        if mtime_ns != entry.mtime_ns:
+            logger.info(f"Instructions file changed on disk, reloading: {key}")
+            entry = self._store(self._read(key))
+        return entry.content
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def _read(self, key: str) -> InstructionsEntry:
+        path = self._path_for(key)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            logger.error(f"Instructions file not found: {key}")
+            raise InstructionsFileNotFoundError(key)
+        except Exception as e:
+            logger.error(f"Error reading instructions file {key}: {e}")
+            raise InstructionsFileNotFoundError(key, str(e))
+        return InstructionsEntry(key=key, path=path, content=content, mtime_ns=mtime_ns)
+
+    def _store(self, entry: InstructionsEntry) -> InstructionsEntry:
+        with self._lock:
+            self._entries = MappingProxyType({**self._entries, entry.key: entry})
+            self._last_checked[entry.key] = time.monotonic()
+        return entry
+
+
+# Shared registry, preloaded at application startup
+instructions_registry = InstructionsRegistry()
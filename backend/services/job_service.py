@@ -0,0 +1,302 @@
+"""Background job persistence and an in-process asyncio worker pool."""
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from loguru import logger
+
+from backend.config import BackendConfig as CONFIG
+from backend.models import Job, JobRead, JobStatus
+from backend.exceptions.job_exceptions import JobNotFoundError
+
+TERMINAL_JOB_STATUSES = (JobStatus.succeeded, JobStatus.failed)
+
+
+@dataclass
+class JobContext:
+    """What a job handler gets to work with: the job row, its decoded payload and a session."""
+    job: Job
+    payload: dict
+    session: AsyncSession
+
+    def report_progress(self, done: int, total: int, failed: int = 0) -> None:
+        """Record progress on the job; it is persisted with the handler's next commit."""
+        self.job.progress_done = done
+        self.job.progress_total = total
+        self.job.progress_failed = failed
+        self.session.add(self.job)
+
+
+# Coroutine that performs one job and returns a JSON-serializable result
+JobHandler = Callable[[JobContext], Awaitable[Any]]
+
+
+class JobService:
+    """Service for persisting background jobs and their state transitions."""
+
+    @staticmethod
+    def create_job(kind: str, payload: dict, user_id: int, session: Session) -> Job:
+        """Persist a new queued job."""
+        job = Job(kind=kind, user_id=user_id, payload=json.dumps(payload))
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        logger.info(f"Job queued: id={job.id}, kind={kind}, user_id={user_id}")
+        return job
+
+    @staticmethod
+    def get_job_for_user(job_id: str, user_id: int, session: Session) -> Job:
+        """
+        Get a job by ID, ensuring it belongs to the given user.
+
+        Raises:
+            JobNotFoundError: If the job does not exist or is owned by another user
+        """
+        job = session.get(Job, job_id)
+        if not job or job.user_id != user_id:
+            logger.warning(f"Job not found or not owned by user: id={job_id}, user_id={user_id}")
+            raise JobNotFoundError(job_id)
+        return job
+
+    @staticmethod
+    def to_read(job: Job) -> JobRead:
+        """Convert a job row into its API representation with a decoded result."""
+        return JobRead(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            result=json.loads(job.result) if job.result else None,
+            error=job.error,
+            progress_done=job.progress_done,
+            progress_total=job.progress_total,
+            progress_failed=job.progress_failed,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+    @staticmethod
+    def claim_job(job_id: str, session: Session) -> bool:
+        """
+        Move a queued job to running in one conditional UPDATE.
+
+        Every worker process recovers the same queued jobs on start, so only
+        the one whose UPDATE matches the row runs it.
+
+        Returns:
+            Whether this caller claimed the job
+        """
+        now = datetime.now()
+        claimed = session.exec(  # type: ignore[call-overload]
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.queued)  # type: ignore[arg-type]
+            .values(status=JobStatus.running, started_at=now, heartbeat_at=now)
+        ).rowcount
+        session.commit()
+        return claimed == 1
+
+    @staticmethod
+    def heartbeat(job_id: str, session: Session) -> None:
+        """Renew the lease on a running job so recovery leaves it alone."""
+        session.exec(  # type: ignore[call-overload]
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.running)  # type: ignore[arg-type]
+            .values(heartbeat_at=datetime.now())
+        )
+        session.commit()
+
+    @staticmethod
+    def mark_succeeded(job: Job, result: Any, session: Session) -> None:
+        job.status = JobStatus.succeeded
+        job.result = json.dumps(result, default=str)
+        job.finished_at = datetime.now()
+        session.add(job)
+        session.commit()
+
+    @staticmethod
+    def mark_failed(job: Job, error: str, session: Session) -> None:
+        job.status = JobStatus.failed
+        job.error = error
+        job.finished_at = datetime.now()
+        session.add(job)
+        session.commit()
+
+    @staticmethod
+    def recover_pending_jobs(kind: str, session: Session, lease_seconds: float = CONFIG.JOB_LEASE_SECONDS) -> list[str]:
+        """
+        Requeue running jobs whose lease has expired and return all queued job IDs, oldest first.
+
+        Jobs another live process is running keep heartbeating and are left alone.
+        """
+        last_seen = func.coalesce(Job.heartbeat_at, Job.started_at)
+        session.exec(  # type: ignore[call-overload]
+            update(Job)
+            .where(
+                Job.kind == kind,  # type: ignore[arg-type]
+                Job.status == JobStatus.running,  # type: ignore[arg-type]
+                or_(last_seen.is_(None), last_seen < datetime.now() - timedelta(seconds=lease_seconds)),
+            )
+            .values(status=JobStatus.queued, started_at=None, heartbeat_at=None)
+        )
+        session.commit()
+        return list(session.exec(
+            select(Job.id)
+            .where(Job.kind == kind, Job.status == JobStatus.queued)  # type: ignore[arg-type]
+            .order_by(Job.created_at)  # type: ignore
+        ).all())
+
+
+class AsyncJobService:
+    """Async counterpart of JobService for handlers running on the event loop, via AsyncSession.run_sync."""
+
+    def __init__(self, job_service: JobService | None = None):
+        self.job_service = job_service or JobService()
+
+    async def create_job(self, kind: str, payload: dict, user_id: int, session: AsyncSession) -> Job:
+        """Persist a new queued job."""
+        return await session.run_sync(
+            lambda sync_session: self.job_service.create_job(kind, payload, user_id, sync_session)
+        )
+
+    async def get_job_for_user(self, job_id: str, user_id: int, session: AsyncSession) -> Job:
+        """Get a job by ID, ensuring it belongs to the given user."""
+        return await session.run_sync(
+            lambda sync_session: self.job_service.get_job_for_user(job_id, user_id, sync_session)
+        )
+
+    def to_read(self, job: Job) -> JobRead:
+        """Convert a job row into its API representation with a decoded result."""
+        return self.job_service.to_read(job)
+
+
+class JobQueue:
+    """
+    In-process worker pool for one kind of job.
+
+    Jobs are persisted in the job table, so the queue itself only carries IDs;
+    on start, queued jobs and running jobs whose heartbeat has lapsed are
+    picked up again. A worker claims a job atomically before running it, so
+    processes sharing the table never run the same job twice. The number of workers caps how many jobs of this kind run at once,
+    independently of other kinds. All job bookkeeping goes through an
+    AsyncSession, so claiming, heartbeats and recording results never block
+    the event loop the queue shares with request handlers.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        handler: JobHandler,
+        workers: int,
+        engine: AsyncEngine | None = None,
+        job_service: JobService | None = None,
+    ):
+        if engine is None:
+            from backend.db import async_engine as default_engine
+            engine = default_engine
+        self.kind = kind
+        self.handler = handler
+        self.worker_count = workers
+        self.engine = engine
+        self.job_service = job_service or JobService()
+        self._queue: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed() and any(not w.done() for w in self._workers)
+
+    async def start(self) -> None:
+        """Start workers on the running event loop and enqueue recovered jobs."""
+        loop = asyncio.get_running_loop()
+        if self.is_running and self._loop is loop:
+            return
+        self._queue = asyncio.Queue()
+        self._loop = loop
+        async with AsyncSession(self.engine) as session:
+            pending = await session.run_sync(
+                lambda sync_session: self.job_service.recover_pending_jobs(self.kind, sync_session)
+            )
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"{self.kind}-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"Job queue '{self.kind}' started with {self.worker_count} workers ({len(pending)} pending)")
+
+    async def stop(self) -> None:
+        """Cancel workers; unfinished jobs stay persisted and resume on the next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+        logger.info(f"Job queue '{self.kind}' stopped")
+
+    async def submit(self, job_id: str) -> None:
+        """Hand a persisted job to the workers, starting them if needed."""
+        if not self.is_running or self._loop is not asyncio.get_running_loop():
+            # start() recovers every queued job, including this one
+            await self.start()
+            return
+        assert self._queue is not None
+        self._queue.put_nowait(job_id)
+
+    async def join(self) -> None:
+        """Wait until every submitted job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.exception(f"Job worker {self.kind}-{index} crashed on job {job_id}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(CONFIG.JOB_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSession(self.engine) as session:
+                    await session.run_sync(lambda sync_session: self.job_service.heartbeat(job_id, sync_session))
+            except Exception as e:
+                # A missed beat is retried next time; the lease spans several intervals
+                logger.warning(f"Job heartbeat failed: id={job_id}, kind={self.kind}: {e}")
+
+    async def _run(self, job_id: str) -> None:
+        # Objects stay usable after commit, like request sessions; handlers commit as they go
+        async with AsyncSession(self.engine, expire_on_commit=False) as session:
+            claimed = await session.run_sync(lambda sync_session: self.job_service.claim_job(job_id, sync_session))
+            if not claimed:
+                return  # Finished, or claimed by another worker
+            job = await session.get(Job, job_id)
+            logger.info(f"Job started: id={job_id}, kind={self.kind}")
+            heartbeat = asyncio.create_task(self._heartbeat(job_id), name=f"{self.kind}-heartbeat-{job_id}")
+            try:
+                result = await self.handler(JobContext(job, json.loads(job.payload), session))
+            except asyncio.CancelledError:
+                # Shutting down: the heartbeat stops and the job is requeued once its lease expires
+                raise
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Job failed: id={job_id}, kind={self.kind}: {e}")
+                await session.run_sync(lambda sync_session: self.job_service.mark_failed(job, str(e), sync_session))
+                return
+            finally:
+                heartbeat.cancel()
+            await session.run_sync(lambda sync_session: self.job_service.mark_succeeded(job, result, sync_session))
+            logger.info(f"Job succeeded: id={job_id}, kind={self.kind}")
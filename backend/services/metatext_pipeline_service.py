@@ -0,0 +1,229 @@
+"""Pipeline that runs one AI operation over every chunk of a metatext."""
+import asyncio
+from typing import Callable
+
+from sqlalchemy import func, insert, update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from loguru import logger
+
+from backend.models import Chunk, Metatext, Rewrite
+from backend.config import BackendConfig as CONFIG
+from backend.services.ai_service import AIService
+from backend.services.openai_service import AsyncOpenAIService
+from backend.exceptions.ai_exceptions import PromptValidationError
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
+
+# Operation name -> instructions key used for each chunk
+PIPELINE_INSTRUCTIONS = {
+    "rewrite": "chunk_rewrite_instructions",
+    "explanation": "chunk_explanation_instructions",
+    "evaluation": "note_summary_comparison_instructions",
+}
+
+# Operation name -> AI_RATE_LIMIT_COSTS key charged for each chunk
+PIPELINE_QUOTA_OPERATIONS = {
+    "rewrite": "rewrite",
+    "explanation": "explain",
+    "evaluation": "evaluation",
+}
+
+# Chunk column written by operations that store their result on the chunk itself
+_CHUNK_RESULT_FIELDS = {
+    "explanation": "explanation",
+    "evaluation": "evaluation",
+}
+
+# Called with (done, total, failed) right before each batch is committed
+ProgressCallback = Callable[[int, int, int], None]
+
+# Called (in a worker thread) with a number of chunks to pay for; False when the user's quota cannot pay
+QuotaCallback = Callable[[int], bool]
+
+
+class MetatextPipelineService:
+    """Service for processing all chunks of a metatext with one AI operation."""
+
+    def __init__(self, openai_service: AsyncOpenAIService | None = None):
+        self.openai_service = openai_service or AsyncOpenAIService()
+
+    @staticmethod
+    def validate_request(
+        metatext_id: int,
+        user_id: int,
+        operation: str,
+        style_title: str | None,
+        session: Session
+    ) -> int:
+        """
+        Check that a pipeline run can start.
+
+        Returns:
+            The number of chunks the run will process
+
+        Raises:
+            PromptValidationError: If the operation is unknown or a rewrite has no style
+            MetatextNotFoundError: If the metatext does not exist or is owned by another user
+        """
+        if operation not in PIPELINE_INSTRUCTIONS:
+            raise PromptValidationError(f"Unknown operation: {operation}")
+        if operation == "rewrite" and not style_title:
+            raise PromptValidationError("Missing style_title")
+        owned = session.exec(
+            select(Metatext.id).where(Metatext.id == metatext_id, Metatext.user_id == user_id)
+        ).first()
+        if owned is None:
+            logger.warning(f"Meta-text not found or not owned by user: id={metatext_id}, user_id={user_id}")
+            raise MetatextNotFoundError(metatext_id)
+        return session.exec(select(func.count()).where(Chunk.metatext_id == metatext_id)).one()
+
+    @staticmethod
+    def build_prompts(
+        metatext_id: int,
+        operation: str,
+        style_title: str | None,
+        session: Session
+    ) -> list[tuple[int, str]]:
+        """Return (chunk_id, prompt) pairs for every chunk of the metatext, in reading order."""
+        chunks = session.exec(
+            select(Chunk).where(Chunk.metatext_id == metatext_id).order_by(Chunk.position)  # type: ignore
+        ).all()
+        if operation == "rewrite":
+            return [(chunk.id, AIService.rewrite_prompt(chunk, style_title or "")) for chunk in chunks]
+        if operation == "explanation":
+            return [(chunk.id, AIService.chunk_explanation_prompt(chunk)) for chunk in chunks]
+        return [(chunk.id, AIService.evaluation_prompt(chunk)) for chunk in chunks]
+
+    async def run(
+        self,
+        metatext_id: int,
+        user_id: int,
+        operation: str,
+        session: AsyncSession,
+        style_title: str | None = None,
+        concurrency: int = CONFIG.PIPELINE_CONCURRENCY,
+        batch_size: int = CONFIG.PIPELINE_COMMIT_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+        charge: QuotaCallback | None = None,
+        prepaid: int = 0,
+        quota_batch_size: int = CONFIG.PIPELINE_QUOTA_BATCH_SIZE
+    ) -> dict:
+        """
+        Run the operation over every chunk with at most `concurrency` calls in flight.
+
+        Results are written as they complete, batch_size at a time, each batch
+        in one transaction together with the progress update. A chunk whose
+        call fails is counted and skipped rather than aborting the run.
+
+        With `charge`, the first `prepaid` chunks are already paid for and the
+        rest are paid quota_batch_size chunks at a time, right before the first
+        call of each batch. Once a batch cannot be paid for, no more calls are
+        made and the remaining chunks are reported as skipped.
+
+        Returns:
+            Summary with total, succeeded, failed and skipped chunk counts
+        """
+        def load_prompts(sync_session: Session) -> list[tuple[int, str]]:
+            self.validate_request(metatext_id, user_id, operation, style_title, sync_session)
+            return self.build_prompts(metatext_id, operation, style_title, sync_session)
+
+        prompts = await session.run_sync(load_prompts)
+        await session.commit()  # No connection is held while the calls run
+        total = len(prompts)
+        instructions_key = PIPELINE_INSTRUCTIONS[operation]
+        logger.info(
+            f"Pipeline started: metatext_id={metatext_id}, operation={operation}, "
+            f"chunks={total}, concurrency={concurrency}"
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        quota_lock = asyncio.Lock()
+        paid = total if charge is None else min(prepaid, total)
+        out_of_quota = False
+
+        async def paid_for(index: int) -> bool:
+            nonlocal paid, out_of_quota
+            async with quota_lock:
+                while index >= paid and not out_of_quota:
+                    chunks = min(quota_batch_size, total - paid)
+                    if await asyncio.to_thread(charge, chunks):
+                        paid += chunks
+                    else:
+                        out_of_quota = True
+                return index < paid
+
+        async def process(index: int, chunk_id: int, prompt: str) -> tuple[int, str | None] | None:
+            async with semaphore:
+                if not await paid_for(index):
+                    return None
+                try:
+                    return chunk_id, await self.openai_service.generate_text_response(instructions_key, prompt)
+                except Exception as e:
+                    logger.warning(f"Pipeline {operation} failed for chunk_id={chunk_id}: {e}")
+                    return chunk_id, None
+
+        tasks = [asyncio.create_task(process(index, chunk_id, prompt)) for index, (chunk_id, prompt) in enumerate(prompts)]
+        results: list[tuple[int, str]] = []
+        done = failed = unflushed = 0
+
+        async def flush() -> None:
+            await session.run_sync(lambda sync_session: self._write_batch(operation, style_title, results, sync_session))
+            if on_progress:
+                on_progress(done, total, failed)
+            await session.commit()
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result is None:
+                    continue  # Not paid for, so never sent
+                chunk_id, text = result
+                done += 1
+                unflushed += 1
+                if text is None:
+                    failed += 1
+                else:
+                    results.append((chunk_id, text))
+                if unflushed >= batch_size:
+                    await flush()
+                    results, unflushed = [], 0
+        finally:
+            for task in tasks:
+                task.cancel()
+        if unflushed or total == 0:
+            await flush()
+
+        skipped = total - done
+        if skipped:
+            logger.warning(f"Pipeline out of AI quota: metatext_id={metatext_id}, user_id={user_id}, skipped={skipped}")
+        logger.info(
+            f"Pipeline finished: metatext_id={metatext_id}, operation={operation}, "
+            f"succeeded={done - failed}, failed={failed}, skipped={skipped}"
+        )
+        return {
+            "metatext_id": metatext_id,
+            "operation": operation,
+            "total": total,
+            "succeeded": done - failed,
+            "failed": failed,
+            "skipped": skipped,
+        }
+
+    @staticmethod
+    def _write_batch(
+        operation: str,
+        style_title: str | None,
+        results: list[tuple[int, str]],
+        session: Session
+    ) -> None:
+        """Write one batch of results with a single executemany statement."""
+        if not results:
+            return
+        if operation == "rewrite":
+            session.execute(
+                insert(Rewrite),
+                [{"chunk_id": chunk_id, "title": style_title, "rewrite_text": text} for chunk_id, text in results],
+            )
+        else:
+            field = _CHUNK_RESULT_FIELDS[operation]
+            session.execute(update(Chunk), [{"id": chunk_id, field: text} for chunk_id, text in results])
@@ -1,15 +1,22 @@
 """Meta-text service for business logic operations."""
+from sqlalchemy import tuple_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from loguru import logger
 
-from backend.models import Metatext, SourceDocument
+from backend.models import Chunk, ChunkPage, ChunkRead, Metatext, MetatextSummary, SourceDocument
 from backend.exceptions.metatext_exceptions import (
     SourceDocumentNotFoundError,
     MetatextNotFoundError,
     MetatextTitleExistsError,
     MetatextCreationError
 )
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.services.pagination import encode_cursor, decode_cursor
 from backend.services.text_chunking_service import TextChunkingService
+from backend.services.passage_index import passage_index
 from backend.config import BackendConfig as CONFIG
 
 
@@ -34,8 +41,13 @@ class MetatextService:
         user_id: int,
         session: Session,   
         chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE
-    ) -> Metatext:
-        """Create a new metatext with associated chunks from a source document and user."""
+    ) -> MetatextSummary:
+        """
+        Create a new metatext with associated chunks from a source document and user.
+
+        Chunks are streamed into the database in batches and never loaded back,
+        so only the metatext summary is returned.
+        """
         logger.info(f"Creating metatext with title: '{title}' from source_doc_id: {source_doc_id} for user_id: {user_id}")
         
         # Validate source document exists
@@ -48,34 +60,58 @@ class MetatextService:
             session.flush()  # Assigns metatext.id without committing
 
             # Create chunks
-            self.chunking_service.create_chunks_for_metatext(
+            chunk_count = self.chunking_service.bulk_insert_chunks_for_metatext(
                 doc.text, metatext.id, session, chunk_size
             )
-            
+            summary = MetatextSummary.model_validate(metatext)
+
             # Commit the transaction
             session.commit()
-            session.refresh(metatext)
 
-            logger.info(f"Meta-text created successfully: id={metatext.id}, title='{title}'")
-            return metatext
+            logger.info(f"Meta-text created successfully: id={summary.id}, title='{title}', chunks={chunk_count}")
+            return summary
+
+        except IntegrityError as e:
+            # Source document and user are already validated, so a violation here is a duplicate title
+            session.rollback()
+            logger.error(f"Integrity error creating metatext: {e}")
+            raise MetatextTitleExistsError(title)
 
         except Exception as e:
             session.rollback()
             logger.error(f"Error creating metatext: {e}")
             
-            # Handle specific database constraint errors
-            if 'UNIQUE constraint failed' in str(e):
-                raise MetatextTitleExistsError(title)
-            
             raise MetatextCreationError(f"Failed to create metatext: {str(e)}")
 
-    def get_metatext_by_id_and_user(self, metatext_id: int, user_id: int, session: Session) -> Metatext:
-        """Retrieve a metatext by ID for a specific user."""
+    @staticmethod
+    def _chunk_children_options() -> tuple:
+        """Loader options that fetch chunk images and rewrites in one query per table."""
+        return (selectinload(Chunk.images), selectinload(Chunk.rewrites))  # type: ignore
+
+    def get_metatext_by_id_and_user(
+        self,
+        metatext_id: int,
+        user_id: int,
+        session: Session,
+        eager_load_children: bool = CONFIG.EAGER_LOAD_METATEXT_CHILDREN
+    ) -> Metatext:
+        """
+        Retrieve a metatext by ID for a specific user.
+
+        With eager_load_children, chunks and their images/rewrites (plus the
+        source document, user and explanations) are fetched with a fixed number
+        of SELECTs, so serializing MetatextDetail does not lazy-load per chunk.
+        """
         logger.info(f"Retrieving metatext with id: {metatext_id} for user_id: {user_id}")
-        metatext = session.exec(
-            select(Metatext)
-            .where(Metatext.id == metatext_id, Metatext.user_id == user_id)
-        ).first()
+        statement = select(Metatext).where(Metatext.id == metatext_id, Metatext.user_id == user_id)
+        if eager_load_children:
+            statement = statement.options(
+                selectinload(Metatext.chunks).options(*self._chunk_children_options()),  # type: ignore
+                selectinload(Metatext.source_document),  # type: ignore
+                selectinload(Metatext.user),  # type: ignore
+                selectinload(Metatext.explanations),  # type: ignore
+            )
+        metatext = session.exec(statement).first()
         if not metatext:
             logger.warning(f"Meta-text not found or not owned by user: id={metatext_id}, user_id={user_id}")
             raise MetatextNotFoundError(metatext_id)
@@ -83,6 +119,67 @@ class MetatextService:
         logger.info(f"Meta-text found: id={metatext.id}, title='{metatext.title}', user_id={user_id}")
         return metatext
 
+    def get_chunks_page(
+        self,
+        metatext_id: int,
+        user_id: int,
+        session: Session,
+        cursor: str | None = None,
+        limit: int = CONFIG.DEFAULT_CHUNK_PAGE_SIZE,
+        eager_load_children: bool = CONFIG.EAGER_LOAD_METATEXT_CHILDREN
+    ) -> ChunkPage:
+        """
+        Retrieve a window of a metatext's chunks ordered by position.
+
+        Uses keyset pagination on (position, id), so each page is a single
+        index range scan no matter how deep into the book the reader is.
+
+        Args:
+            metatext_id: The ID of the metatext
+            user_id: The ID of the user who must own the metatext
+            session: Database session
+            cursor: Opaque cursor from the previous page, or None for the first page
+            limit: Maximum number of chunks to return
+            eager_load_children: Batch-load images and rewrites for the page
+
+        Returns:
+            ChunkPage with the chunks and the cursor for the next page
+
+        Raises:
+            MetatextNotFoundError: If the metatext does not exist or is not owned by the user
+            InvalidCursorError: If the cursor is malformed
+        """
+        logger.info(f"Retrieving chunk page for metatext_id={metatext_id}, user_id={user_id}, limit={limit}")
+        owned_id = session.exec(
+            select(Metatext.id).where(Metatext.id == metatext_id, Metatext.user_id == user_id)
+        ).first()
+        if owned_id is None:
+            logger.warning(f"Meta-text not found or not owned by user: id={metatext_id}, user_id={user_id}")
+            raise MetatextNotFoundError(metatext_id)
+
+        statement = select(Chunk).where(Chunk.metatext_id == metatext_id)
+        if eager_load_children:
+            statement = statement.options(*self._chunk_children_options())
+        if cursor:
+            position, chunk_id = decode_cursor(cursor, 2)
+            if not isinstance(position, (int, float)) or not isinstance(chunk_id, int):
+                raise InvalidCursorError(cursor)
+            statement = statement.where(tuple_(Chunk.position, Chunk.id) > tuple_(position, chunk_id))
+
+        # Fetch one extra row to learn whether another page exists
+        chunks = list(session.exec(
+            statement.order_by(Chunk.position, Chunk.id).limit(limit + 1)  # type: ignore
+        ).all())
+        next_cursor = None
+        if len(chunks) > limit:
+            chunks = chunks[:limit]
+            next_cursor = encode_cursor(chunks[-1].position, chunks[-1].id)
+
+        return ChunkPage(
+            chunks=[ChunkRead.model_validate(chunk, from_attributes=True) for chunk in chunks],
+            next_cursor=next_cursor
+        )
+
     def list_user_metatexts(self, user_id: int, session: Session) -> list[Metatext]:
         """List all metatexts for a specific user."""
         logger.info(f"Listing metatexts for user_id={user_id}")
@@ -102,5 +199,66 @@ class MetatextService:
         title = metatext.title  # Store title for response
         session.delete(metatext)
         session.commit()
+        passage_index.drop(metatext_id)
         logger.info(f"Meta-text deleted successfully: id={metatext_id}, title='{title}', user_id={user_id}")
         return {"success": True, "id": metatext_id, "title": title}
+
+
+class AsyncMetatextService:
+    """
+    Async counterpart of MetatextService.
+
+    Each method runs the sync implementation through AsyncSession.run_sync:
+    the queries are awaited on the async driver while the logic (bulk chunk
+    inserts, ORM delete cascades) stays in one place. Metatexts are always
+    returned with their children eager-loaded, since lazy loads cannot run
+    once control is back on the event loop.
+    """
+
+    def __init__(self, metatext_service: MetatextService | None = None):
+        self.metatext_service = metatext_service or MetatextService()
+
+    async def create_metatext_with_chunks(
+        self,
+        title: str,
+        source_doc_id: int,
+        user_id: int,
+        session: AsyncSession,
+        chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE
+    ) -> MetatextSummary:
+        return await session.run_sync(
+            lambda sync_session: self.metatext_service.create_metatext_with_chunks(
+                title, source_doc_id, user_id, sync_session, chunk_size
+            )
+        )
+
+    async def get_metatext_by_id_and_user(self, metatext_id: int, user_id: int, session: AsyncSession) -> Metatext:
+        return await session.run_sync(
+            lambda sync_session: self.metatext_service.get_metatext_by_id_and_user(
+                metatext_id, user_id, sync_session, eager_load_children=True
+            )
+        )
+
+    async def get_chunks_page(
+        self,
+        metatext_id: int,
+        user_id: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        limit: int = CONFIG.DEFAULT_CHUNK_PAGE_SIZE
+    ) -> ChunkPage:
+        return await session.run_sync(
+            lambda sync_session: self.metatext_service.get_chunks_page(
+                metatext_id, user_id, sync_session, cursor=cursor, limit=limit
+            )
+        )
+
+    async def list_user_metatexts(self, user_id: int, session: AsyncSession) -> list[Metatext]:
+        return await session.run_sync(
+            lambda sync_session: self.metatext_service.list_user_metatexts(user_id, sync_session)
+        )
+
+    async def delete_metatext(self, metatext_id: int, user_id: int, session: AsyncSession) -> dict:
+        return await session.run_sync(
+            lambda sync_session: self.metatext_service.delete_metatext(metatext_id, user_id, sync_session)
+        )
@@ -1,33 +1,45 @@
 """OpenAI service for handling AI operations."""
 import os
 import json
-from typing import Any, Optional
-from openai import OpenAI
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from openai import OpenAI, AsyncOpenAI
+from pydantic import BaseModel, ValidationError
 from loguru import logger
 
+from backend.config import BackendConfig as CONFIG
 from backend.exceptions.ai_exceptions import (
     OpenAIClientError,
     OpenAIResponseParsingError,
     OpenAIImageGenerationError,
-    InstructionsFileNotFoundError
 )
+from backend.services.ai_response_cache import AIResponseCache
+from backend.services.instructions_registry import InstructionsRegistry, instructions_registry
+from backend.metrics import record_openai_call
 
+T = TypeVar("T")
 
-class OpenAIService:
-    """Service for OpenAI API operations."""
-    
-    def __init__(self, client: Optional[OpenAI] = None):
-        """Initialize OpenAI service with optional client injection."""
-        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+VALID_IMAGE_SIZES = ["256x256", "512x512", "1024x1024", "1024x1536", "1536x1024", "1792x1024", "1024x1792"]
+VALID_IMAGE_STYLES = ["natural", "vivid"]
+
+
+class BaseOpenAIService:
+    """Client-agnostic helpers shared by the sync and async OpenAI services."""
+
+    def __init__(self, response_cache: AIResponseCache | None = None, instructions: InstructionsRegistry | None = None):
         self.default_model = "gpt-4o-mini-2024-07-18"
         self.image_model = "dall-e-3"
-    
-    def read_instructions_file(self, filename: str) -> str:
+        self.response_cache = response_cache
+        self.instructions = instructions or instructions_registry
+
+    def get_instructions(self, instructions_key: str) -> str:
         """
-        Read and return the contents of an instructions file.
+        Return the contents of an instructions file from the in-memory registry.
         
         Args:
-            filename: Path to instructions file relative to the backend directory
+            instructions_key: Instructions file key (file stem, e.g. 'explain2');
+                legacy 'instructions/<name>.txt' paths are also accepted
             
         Returns:
             Contents of the instructions file
@@ -35,26 +47,7 @@ class OpenAIService:
         Raises:
             InstructionsFileNotFoundError: If the file cannot be found or read
         """
-        try:
-            # Construct path relative to the backend directory
-            instructions_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), 
-                filename
-            )
-            logger.debug(f"Reading instructions file: {instructions_path}")
-            
-            with open(instructions_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            logger.debug(f"Successfully read instructions file: {filename}")
-            return content
-            
-        except FileNotFoundError:
-            logger.error(f"Instructions file not found: {filename}")
-            raise InstructionsFileNotFoundError(filename)
-        except Exception as e:
-            logger.error(f"Error reading instructions file {filename}: {e}")
-            raise InstructionsFileNotFoundError(filename, str(e))
+        return self.instructions.get(instructions_key)
     
     def extract_error_message(self, exception: Exception) -> Optional[str]:
         """
@@ -81,13 +74,70 @@ class OpenAIService:
             except Exception:
                 pass
         return None
+
+    def response_cache_key(self, instructions: str, prompt: str, response_format: type | None = None) -> str | None:
+        """Return the cache key for a text/parsed request, or None when caching is disabled."""
+        if self.response_cache is None:
+            return None
+        schema = json.dumps(response_format.model_json_schema(), sort_keys=True) if response_format else ""
+        return self.response_cache.make_key(self.default_model, instructions, prompt, schema)
+
+    def get_cached_response(self, cache_key: str | None, response_format: type | None = None) -> Any:
+        """Return a cached text or parsed response, or None on a miss."""
+        if cache_key is None or self.response_cache is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None or response_format is None:
+            return cached
+        try:
+            return response_format.model_validate_json(cached)
+        except ValidationError as e:
+            # Corrupt entry; treat as a miss so the fresh response overwrites it
+            logger.warning(f"Discarding cached {response_format.__name__} that no longer validates: {e}")
+            return None
+
+    def store_cached_response(self, cache_key: str | None, instructions_key: str, result: Any) -> None:
+        """Store a text or parsed response under cache_key."""
+        if cache_key is None or self.response_cache is None:
+            return
+        payload = result.model_dump_json() if isinstance(result, BaseModel) else result
+        self.response_cache.set(cache_key, self.default_model, instructions_key, payload)
+
+    @staticmethod
+    def normalize_image_options(size: str, style: str) -> tuple[str, str]:
+        """Fall back to safe defaults for unsupported image sizes and styles."""
+        if size not in VALID_IMAGE_SIZES:
+            size = "1024x1024"
+        if style not in VALID_IMAGE_STYLES:
+            style = "natural"
+        return size, style
+
+
+class OpenAIService(BaseOpenAIService):
+    """Service for OpenAI API operations."""
+    
+    def __init__(self, client: Optional[OpenAI] = None, response_cache: AIResponseCache | None = None):
+        """Initialize OpenAI service with optional client and response cache injection."""
+        super().__init__(response_cache)
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    def _observed(self, operation: str, instructions_key: str | None, call: Callable[[], T]) -> T:
+        """Run an API call, recording its latency, token usage and errors."""
+        started = time.perf_counter()
+        try:
+            response = call()
+        except Exception as e:
+            record_openai_call(operation, instructions_key, time.perf_counter() - started, error=e)
+            raise
+        record_openai_call(operation, instructions_key, time.perf_counter() - started, response=response)
+        return response
     
-    def generate_text_response(self, instructions_file: str, prompt: str) -> str:
+    def generate_text_response(self, instructions_key: str, prompt: str) -> str:
         """
         Generate text response using OpenAI API.
         
         Args:
-            instructions_file: Path to instructions file
+            instructions_key: Instructions file key
             prompt: Input prompt for the AI
             
         Returns:
@@ -95,21 +145,30 @@ class OpenAIService:
             
         Raises:
             OpenAIClientError: If API call fails
-            InstructionsFileNotFoundError: If instructions file cannot be read
+            InstructionsFileNotFoundError: If the instructions key is unknown
         """
-        logger.debug(f"Generating text response with instructions: {instructions_file}")
+        logger.debug(f"Generating text response with instructions: {instructions_key}")
         
         try:
-            instructions = self.read_instructions_file(instructions_file)
+            instructions = self.get_instructions(instructions_key)
+            cache_key = self.response_cache_key(instructions, prompt)
+            cached = self.get_cached_response(cache_key)
+            if cached is not None:
+                return cached
             
-            response = self.client.responses.create(
-                model=self.default_model,
-                instructions=instructions,
-                input=prompt,
+            response = self._observed(
+                "text",
+                instructions_key,
+                lambda: self.client.responses.create(
+                    model=self.default_model,
+                    instructions=instructions,
+                    input=prompt,
+                ),
             )
             
             result = response.output_text
             logger.debug("Text response generated successfully")
+            self.store_cached_response(cache_key, instructions_key, result)
             return result
             
         except Exception as e:
@@ -117,12 +176,12 @@ class OpenAIService:
             error_message = self.extract_error_message(e)
             raise OpenAIClientError(error_message or str(e))
     
-    def generate_parsed_response(self, instructions_file: str, prompt: str, response_format: type) -> Any:
+    def generate_parsed_response(self, instructions_key: str, prompt: str, response_format: type) -> Any:
         """
         Generate and parse structured response using OpenAI API.
         
         Args:
-            instructions_file: Path to instructions file
+            instructions_key: Instructions file key
             prompt: Input prompt for the AI
             response_format: Pydantic model class for parsing response
             
@@ -132,18 +191,26 @@ class OpenAIService:
         Raises:
             OpenAIClientError: If API call fails
             OpenAIResponseParsingError: If response parsing fails
-            InstructionsFileNotFoundError: If instructions file cannot be read
+            InstructionsFileNotFoundError: If the instructions key is unknown
         """
         logger.debug(f"Generating parsed response with format: {response_format.__name__}")
         
         try:
-            instructions = self.read_instructions_file(instructions_file)
+            instructions = self.get_instructions(instructions_key)
+            cache_key = self.response_cache_key(instructions, prompt, response_format)
+            cached = self.get_cached_response(cache_key, response_format)
+            if cached is not None:
+                return cached
             
-            response = self.client.responses.parse(
-                model=self.default_model,
-                instructions=instructions,
-                input=prompt,
-                text_format=response_format,
+            response = self._observed(
+                "parsed",
+                instructions_key,
+                lambda: self.client.responses.parse(
+                    model=self.default_model,
+                    instructions=instructions,
+                    input=prompt,
+                    text_format=response_format,
+                ),
             )
             
             if response.output_parsed is None:
@@ -151,6 +218,7 @@ class OpenAIService:
                 raise OpenAIResponseParsingError(response_format.__name__)
             
             logger.debug("Parsed response generated successfully")
+            self.store_cached_response(cache_key, instructions_key, response.output_parsed)
             return response.output_parsed
             
         except OpenAIResponseParsingError:
@@ -177,24 +245,20 @@ class OpenAIService:
         """
         logger.debug(f"Generating image for prompt: '{prompt[:50]}...'")
         
-        # Type-safe size parameter
-        valid_sizes = ["256x256", "512x512", "1024x1024", "1024x1536", "1536x1024", "1792x1024", "1024x1792"]
-        if size not in valid_sizes:
-            size = "1024x1024"
-        
-        # Type-safe style parameter  
-        valid_styles = ["natural", "vivid"]
-        if style not in valid_styles:
-            style = "natural"
+        size, style = self.normalize_image_options(size, style)
         
         try:
-            response = self.client.images.generate(
-                model=self.image_model,
-                prompt=prompt,
-                n=1,
-                size=size,  # type: ignore
-                response_format="b64_json",
-                style=style,  # type: ignore
+            response = self._observed(
+                "image",
+                None,
+                lambda: self.client.images.generate(
+                    model=self.image_model,
+                    prompt=prompt,
+                    n=1,
+                    size=size,  # type: ignore
+                    response_format="b64_json",
+                    style=style,  # type: ignore
+                ),
             )
             
             if not response.data or not hasattr(response.data[0], "b64_json") or not response.data[0].b64_json:
@@ -210,3 +274,220 @@ class OpenAIService:
             logger.error(f"OpenAI image generation error: {e}")
             error_message = self.extract_error_message(e)
             raise OpenAIImageGenerationError(error_message or str(e))
+
+
+class AsyncOpenAIService(BaseOpenAIService):
+    """
+    AsyncOpenAI-backed variant of OpenAIService for use from async handlers.
+
+    In-flight API calls are capped by a semaphore so one burst (e.g. several
+    slow image generations) cannot monopolise the upstream connection pool.
+    Each call, including time spent waiting for a slot, is bounded by
+    request_timeout. Cancelling the awaiting task releases its slot.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        max_concurrency: int = CONFIG.OPENAI_MAX_CONCURRENT_REQUESTS,
+        request_timeout: float = CONFIG.OPENAI_REQUEST_TIMEOUT_SECONDS,
+        response_cache: AIResponseCache | None = None,
+    ):
+        """Initialize async OpenAI service with optional client and response cache injection."""
+        super().__init__(response_cache)
+        self.client = client or AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=request_timeout,
+            max_retries=CONFIG.OPENAI_MAX_RETRIES,
+        )
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run_limited(
+        self,
+        operation: str,
+        call: Callable[[], Awaitable[T]],
+        instructions_key: str | None = None,
+    ) -> T:
+        """
+        Run an API call while holding a concurrency slot, bounded by request_timeout.
+
+        Latency (excluding time queued for a slot), token usage and errors
+        are recorded per operation and instructions key.
+
+        Raises:
+            TimeoutError: If waiting for a slot plus the call exceeds request_timeout
+        """
+        metric_operation = operation.split()[0]
+        started = None
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                async with self._get_semaphore():
+                    started = time.perf_counter()
+                    response = await call()
+        except asyncio.CancelledError:
+            logger.info(f"OpenAI {operation} cancelled")
+            raise
+        except Exception as e:
+            # A timeout while still queued for a slot has no call latency to record
+            elapsed = time.perf_counter() - started if started is not None else None
+            record_openai_call(metric_operation, instructions_key, elapsed, error=e)
+            raise
+        record_openai_call(metric_operation, instructions_key, time.perf_counter() - started, response=response)
+        return response
+
+    async def generate_text_response(self, instructions_key: str, prompt: str) -> str:
+        """
+        Generate text response using OpenAI API without blocking the event loop.
+        
+        Args:
+            instructions_key: Instructions file key
+            prompt: Input prompt for the AI
+            
+        Returns:
+            Generated text response
+            
+        Raises:
+            OpenAIClientError: If API call fails or times out
+            InstructionsFileNotFoundError: If the instructions key is unknown
+        """
+        logger.debug(f"Generating text response with instructions: {instructions_key}")
+        instructions = self.get_instructions(instructions_key)
+        cache_key = self.response_cache_key(instructions, prompt)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(self.get_cached_response, cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self._run_limited(
+                "text generation",
+                lambda: self.client.responses.create(
+                    model=self.default_model,
+                    instructions=instructions,
+                    input=prompt,
+                ),
+                instructions_key,
+            )
+            result = response.output_text
+            logger.debug("Text response generated successfully")
+
+        except TimeoutError:
+            logger.error(f"OpenAI text generation timed out after {self.request_timeout}s")
+            raise OpenAIClientError(f"Request timed out after {self.request_timeout}s")
+        except Exception as e:
+            logger.error(f"OpenAI text generation error: {e}")
+            error_message = self.extract_error_message(e)
+            raise OpenAIClientError(error_message or str(e))
+
+        if cache_key is not None:
+            await asyncio.to_thread(self.store_cached_response, cache_key, instructions_key, result)
+        return result
+
+    async def generate_parsed_response(self, instructions_key: str, prompt: str, response_format: type) -> Any:
+        """
+        Generate and parse structured response using OpenAI API without blocking the event loop.
+        
+        Args:
+            instructions_key: Instructions file key
+            prompt: Input prompt for the AI
+            response_format: Pydantic model class for parsing response
+            
+        Returns:
+            Parsed response object
+            
+        Raises:
+            OpenAIClientError: If API call fails or times out
+            OpenAIResponseParsingError: If response parsing fails
+            InstructionsFileNotFoundError: If the instructions key is unknown
+        """
+        logger.debug(f"Generating parsed response with format: {response_format.__name__}")
+        instructions = self.get_instructions(instructions_key)
+        cache_key = self.response_cache_key(instructions, prompt, response_format)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(self.get_cached_response, cache_key, response_format)
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self._run_limited(
+                "parsed response",
+                lambda: self.client.responses.parse(
+                    model=self.default_model,
+                    instructions=instructions,
+                    input=prompt,
+                    text_format=response_format,
+                ),
+                instructions_key,
+            )
+        except TimeoutError:
+            logger.error(f"OpenAI parsed response timed out after {self.request_timeout}s")
+            raise OpenAIClientError(f"Request timed out after {self.request_timeout}s")
+        except Exception as e:
+            logger.error(f"OpenAI parsed response generation error: {e}")
+            error_message = self.extract_error_message(e)
+            raise OpenAIClientError(error_message or str(e))
+
+        if response.output_parsed is None:
+            logger.error("Failed to parse AI response")
+            raise OpenAIResponseParsingError(response_format.__name__)
+
+        logger.debug("Parsed response generated successfully")
+        if cache_key is not None:
+            await asyncio.to_thread(self.store_cached_response, cache_key, instructions_key, response.output_parsed)
+        return response.output_parsed
+
+    async def generate_image(self, prompt: str, size: str = "1024x1024", style: str = "natural") -> str:
+        """
+        Generate image using DALL-E API without blocking the event loop.
+        
+        Args:
+            prompt: Text prompt for image generation
+            size: Image size (default: "1024x1024")
+            style: Image style (default: "natural")
+            
+        Returns:
+            Base64 encoded image data
+            
+        Raises:
+            OpenAIImageGenerationError: If image generation fails or times out
+        """
+        logger.debug(f"Generating image for prompt: '{prompt[:50]}...'")
+        size, style = self.normalize_image_options(size, style)
+
+        try:
+            response = await self._run_limited(
+                "image generation",
+                lambda: self.client.images.generate(
+                    model=self.image_model,
+                    prompt=prompt,
+                    n=1,
+                    size=size,  # type: ignore
+                    response_format="b64_json",
+                    style=style,  # type: ignore
+                ),
+            )
+        except TimeoutError:
+            logger.error(f"OpenAI image generation timed out after {self.request_timeout}s")
+            raise OpenAIImageGenerationError(f"Request timed out after {self.request_timeout}s")
+        except Exception as e:
+            logger.error(f"OpenAI image generation error: {e}")
+            error_message = self.extract_error_message(e)
+            raise OpenAIImageGenerationError(error_message or str(e))
+
+        if not response.data or not hasattr(response.data[0], "b64_json") or not response.data[0].b64_json:
+            logger.error("No image data returned from OpenAI")
+            raise OpenAIImageGenerationError("No image data returned from OpenAI")
+
+        logger.debug("Image generated successfully")
+        return response.data[0].b64_json
@@ -0,0 +1,45 @@
+"""Opaque cursor helpers for keyset-paginated endpoints."""
+import base64
+import binascii
+import json
+from typing import Any
+
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort-key values of the last row on a page into an opaque cursor.
+
+    Args:
+        values: JSON-serializable keyset values, in sort order
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        arity: Number of keyset values the caller expects
+
+    Returns:
+        Tuple of keyset values
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or has the wrong arity
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise InvalidCursorError(cursor)
+    if not isinstance(values, list) or len(values) != arity:
+        raise InvalidCursorError(cursor)
+    return tuple(values)
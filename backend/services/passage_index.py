@@ -0,0 +1,252 @@
+"""
+Offline passage embeddings and per-metatext vector files for similarity search.
+
+Chunks are embedded with a feature-hashing model (word unigrams and bigrams
+hashed into a fixed number of signed buckets, log-scaled and L2-normalised),
+so no model download or fitting is needed and an edit only re-embeds the
+chunks it touched. Each metatext's vectors live in a float32 .npy file that
+is memory-mapped for queries, next to a .ids.npy file with the chunk IDs.
+"""
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from loguru import logger
+
+from backend.config import BackendConfig as CONFIG
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Very frequent English words carry little meaning and would dominate hashed term counts
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i in is it its me my not of on or our "
+    "she so than that the their them then there they this to was we were what when which who will with "
+    "would you your".split()
+)
+
+
+class HashingEmbedder:
+    """Stateless text embedder: the same text always maps to the same unit vector."""
+
+    def __init__(self, dim: int = CONFIG.PASSAGE_EMBEDDING_DIM):
+        self.dim = dim
+
+    def features(self, text: str) -> list[str]:
+        tokens = [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+        return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) float32 matrix of unit (or zero) rows."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self.features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32, count=len(features)
+            )
+            # Low bits pick the bucket, the top bit the sign, so collisions cancel out on average
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dim, signs)
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class PassageIndex:
+    """
+    Per-metatext vector files with incremental updates and top-k cosine queries.
+
+    Files are only built on demand (see build). Incremental updates are
+    applied to files that already exist and skipped otherwise, so edits to
+    metatexts nobody has queried cost nothing.
+    """
+
+    def __init__(self, directory: str = CONFIG.PASSAGE_INDEX_DIR, embedder: HashingEmbedder | None = None):
+        self.directory = directory
+        self.embedder = embedder or HashingEmbedder()
+        self._locks: dict[int, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # metatext_id -> (file identity, ids, read-only memmap); in-place row writes show through the shared mapping
+        self._readers: dict[int, tuple[tuple[int, int], np.ndarray, np.ndarray]] = {}
+
+    def _lock(self, metatext_id: int) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(metatext_id, threading.Lock())
+
+    def _paths(self, metatext_id: int) -> tuple[str, str]:
+        base = os.path.join(self.directory, f"metatext_{metatext_id}")
+        return f"{base}.npy", f"{base}.ids.npy"
+
+    def _exists(self, metatext_id: int) -> bool:
+        vectors_path, ids_path = self._paths(metatext_id)
+        return os.path.exists(vectors_path) and os.path.exists(ids_path)
+
+    def is_built(self, metatext_id: int) -> bool:
+        """Whether a usable index (matching the current embedding size) exists for the metatext."""
+        return self._load(metatext_id) is not None
+
+    def _load(self, metatext_id: int, writable: bool = False) -> tuple[np.ndarray, np.ndarray] | None:
+        vectors_path, ids_path = self._paths(metatext_id)
+        try:
+            stat = os.stat(ids_path)
+        except FileNotFoundError:
+            return None
+        # Files are only ever replaced whole, so a new inode or mtime means a new index
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._readers.get(metatext_id)
+        if not writable and cached is not None and cached[0] == identity:
+            return cached[1], cached[2]
+        if not os.path.exists(vectors_path):
+            return None
+        vectors = np.load(vectors_path, mmap_mode="r+" if writable else "r")
+        if vectors.ndim != 2 or vectors.shape[1] != self.embedder.dim:
+            # Written with another embedding size; rebuild on next use
+            return None
+        ids = np.load(ids_path)
+        if not writable:
+            self._readers[metatext_id] = (identity, ids, vectors)
+        return ids, vectors
+
+    def _write(self, metatext_id: int, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Replace both files atomically so readers never see a half-written index."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._readers.pop(metatext_id, None)
+        vectors_path, ids_path = self._paths(metatext_id)
+        # The ids file goes last: its identity is what readers check
+        for path, array in ((vectors_path, vectors.astype(np.float32)), (ids_path, ids.astype(np.int64))):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+
+    def build(self, metatext_id: int, chunks: list[tuple[int, str]]) -> None:
+        """(Re)write the index of a metatext from (chunk_id, text) pairs."""
+        ids = np.array([chunk_id for chunk_id, _ in chunks], dtype=np.int64)
+        vectors = self.embedder.embed([text for _, text in chunks])
+        with self._lock(metatext_id):
+            self._write(metatext_id, ids, vectors)
+        logger.info(f"Passage index built: metatext_id={metatext_id}, chunks={len(ids)}")
+
+    def upsert(self, metatext_id: int, chunks: dict[int, str]) -> None:
+        """Re-embed changed chunks in place and append new ones; no-op until the index is built."""
+        if not chunks:
+            return
+        with self._lock(metatext_id):
+            loaded = self._load(metatext_id, writable=True)
+            if loaded is None:
+                return
+            ids, vectors = loaded
+            matched = np.flatnonzero(np.isin(ids, list(chunks)))
+            rows = {int(ids[row]): int(row) for row in matched}
+            existing = [chunk_id for chunk_id in chunks if chunk_id in rows]
+            added = [chunk_id for chunk_id in chunks if chunk_id not in rows]
+            if existing:
+                vectors[[rows[chunk_id] for chunk_id in existing]] = self.embedder.embed(
+                    [chunks[chunk_id] for chunk_id in existing]
+                )
+                vectors.flush()
+            if added:
+                new_vectors = self.embedder.embed([chunks[chunk_id] for chunk_id in added])
+                self._write(
+                    metatext_id,
+                    np.concatenate([ids, np.array(added, dtype=np.int64)]),
+                    np.concatenate([np.asarray(vectors), new_vectors]),
+                )
+
+    def remove(self, metatext_id: int, chunk_ids: list[int]) -> None:
+        """Drop chunks from an index; no-op until the index is built."""
+        with self._lock(metatext_id):
+            loaded = self._load(metatext_id)
+            if loaded is None:
+                return
+            ids, vectors = loaded
+            keep = ~np.isin(ids, chunk_ids)
+            if not keep.all():
+                self._write(metatext_id, ids[keep], np.asarray(vectors[keep]))
+
+    def apply_changes(
+        self,
+        metatext_id: int,
+        changed: dict[int, str] | None = None,
+        removed: list[int] | None = None,
+    ) -> None:
+        """
+        Apply chunk edits to a metatext's index without ever failing the edit itself.
+        If the update fails the index is dropped and rebuilt from the database on next use.
+        """
+        try:
+            if removed:
+                self.remove(metatext_id, removed)
+            if changed:
+                self.upsert(metatext_id, changed)
+        except Exception as e:
+            logger.warning(f"Passage index update failed for metatext_id={metatext_id}, dropping it: {e}")
+            try:
+                self.drop(metatext_id)
+            except OSError as drop_error:
+                logger.error(f"Could not drop passage index for metatext_id={metatext_id}: {drop_error}")
+
+    def drop(self, metatext_id: int) -> None:
+        """Delete the index files of a metatext."""
+        with self._lock(metatext_id):
+            self._readers.pop(metatext_id, None)
+            for path in self._paths(metatext_id):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def vector(self, metatext_id: int, chunk_id: int) -> np.ndarray | None:
+        loaded = self._load(metatext_id)
+        if loaded is None:
+            return None
+        ids, vectors = loaded
+        rows = np.flatnonzero(ids == chunk_id)
+        return np.array(vectors[rows[0]]) if rows.size else None
+
+    def most_similar(
+        self,
+        query: np.ndarray,
+        metatext_ids: list[int],
+        k: int,
+        exclude_chunk_id: int | None = None,
+    ) -> list[tuple[int, int, float]]:
+        """
+        Top-k chunks by cosine similarity to a unit query vector.
+
+        Returns:
+            (metatext_id, chunk_id, score) triples, best first
+        """
+        candidates: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []  # (metatext ids, chunk ids, scores)
+        for metatext_id in metatext_ids:
+            loaded = self._load(metatext_id)
+            if loaded is None or len(loaded[0]) == 0:
+                continue
+            ids, vectors = loaded
+            scores = vectors @ query  # Rows are unit vectors, so this is the cosine similarity
+            if exclude_chunk_id is not None:
+                scores = np.where(ids == exclude_chunk_id, -np.inf, scores)
+            top = self._top_k(scores, k)
+            candidates.append((np.full(len(top), metatext_id), ids[top], scores[top]))
+        if not candidates:
+            return []
+        metatexts, ids, scores = (np.concatenate(parts) for parts in zip(*candidates))
+        best = self._top_k(scores, k)
+        return [
+            (int(metatexts[i]), int(ids[i]), float(scores[i]))
+            for i in best
+            if np.isfinite(scores[i]) and scores[i] > 0
+        ]
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k largest scores, best first, without sorting the whole array."""
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+
+passage_index = PassageIndex()
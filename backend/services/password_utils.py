@@ -1,16 +1,17 @@
 """
 Password utilities for hashing and verifying user passwords.
-Uses passlib's CryptContext with bcrypt.
+Uses bcrypt, computed in the process pool of backend.password_hashing.
 """
-from passlib.context import CryptContext
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from backend.password_hashing import password_hasher
 
 def hash_password(password: str) -> str:
-    """Hash a plain password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a plain password using bcrypt at the current calibrated cost."""
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a plain password; also return a new hash if the stored one was made with another cost."""
+    return password_hasher.verify_and_update(plain_password, hashed_password)
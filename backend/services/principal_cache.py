@@ -0,0 +1,77 @@
+"""
+In-process cache of authenticated users, keyed by the user id carried in access tokens.
+
+With a warm cache an authenticated request costs a JWT signature check and
+a dictionary lookup instead of a user query. Entries expire after
+PRINCIPAL_CACHE_TTL_SECONDS and are invalidated whenever a User row is
+updated (e.g. a password change) or deleted through the ORM in this process;
+the TTL bounds how long other worker processes may serve a stale entry.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from backend.config import BackendConfig as CONFIG
+from backend.models import User
+from backend.services.schemas import Principal
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of user id -> Principal."""
+
+    _instances: "weakref.WeakSet[PrincipalCache]" = weakref.WeakSet()  # Every cache hears about changed users
+
+    def __init__(
+        self,
+        ttl_seconds: float = CONFIG.PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = CONFIG.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()  # user id -> (expires at, principal)
+        self._lock = threading.Lock()
+        PrincipalCache._instances.add(self)
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    # Runs at flush; a rolled-back change only costs one extra lookup on the next request
+    if target.id is not None:
+        for cache in list(PrincipalCache._instances):
+            cache.invalidate(target.id)
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for authentication and user operations.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import timedelta
 
 class Token(BaseModel):
@@ -20,6 +20,13 @@ class UserRead(BaseModel):
     id: int
     username: str
 
+class Principal(BaseModel):
+    """The authenticated user as seen by request handlers; immutable so one cached copy can serve every request."""
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    username: str
+
 class LoginRequest(BaseModel):
     """Request body for user login."""
     username: str
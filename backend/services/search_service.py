@@ -0,0 +1,226 @@
+"""Full-text search over a user's chunks, notes, summaries and explanations."""
+import re
+from typing import Literal
+
+from sqlalchemy import bindparam, text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from loguru import logger
+
+from backend.models import SearchHit, SearchPage
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.pagination_exceptions import InvalidCursorError
+from backend.exceptions.search_exceptions import InvalidSearchQueryError, SearchUnavailableError
+from backend.services.pagination import decode_cursor, encode_cursor
+
+SearchKind = Literal["chunk", "explanation"]
+
+# A "quoted phrase" or a bare term
+_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+# What the unicode61 tokenizer treats as a token; anything else is a separator
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _weights(weights: tuple[float, ...]) -> str:
+    return ", ".join(repr(float(weight)) for weight in weights)
+
+
+class SearchService:
+    """Service for ranked full-text search backed by SQLite FTS5 (see backend/fts.py)."""
+
+    @staticmethod
+    def to_fts_query(query: str) -> str:
+        """
+        Turn free text into an FTS5 MATCH expression.
+
+        Every bare term and "quoted phrase" must match; a bare term ending in
+        * matches as a prefix. Punctuation is dropped the same way the
+        tokenizer drops it, so user input can never form FTS5 operators.
+
+        Raises:
+            InvalidSearchQueryError: If the query has no searchable terms
+        """
+        terms = []
+        for phrase, word in _TERM_PATTERN.findall(query):
+            is_prefix = word.endswith("*")
+            tokens = _TOKEN_PATTERN.findall(phrase or word)
+            if tokens:
+                terms.append('"' + " ".join(tokens) + '"' + ("*" if is_prefix else ""))
+        if not terms:
+            raise InvalidSearchQueryError(query)
+        return " ".join(terms)
+
+    def search(
+        self,
+        user_id: int,
+        query: str,
+        session: Session,
+        metatext_id: int | None = None,
+        source_document_id: int | None = None,
+        kind: SearchKind | None = None,
+        cursor: str | None = None,
+        limit: int = CONFIG.SEARCH_DEFAULT_PAGE_SIZE
+    ) -> SearchPage:
+        """
+        Search the user's chunks (text, note, summary) and explanations (words, explanation).
+
+        Hits are ordered by BM25 relevance and paged with a keyset on
+        (rank, kind, id). Snippets are only built for the rows on the page.
+
+        Args:
+            user_id: The ID of the user whose library is searched
+            query: Free-text query (see to_fts_query)
+            session: Database session
+            metatext_id: Only return hits from this metatext
+            source_document_id: Only return hits from metatexts of this source document
+            kind: Only return chunk or explanation hits
+            cursor: Opaque cursor from the previous page, or None for the first page
+            limit: Maximum number of hits to return
+
+        Returns:
+            SearchPage with the hits and the cursor for the next page
+
+        Raises:
+            InvalidSearchQueryError: If the query has no searchable terms
+            InvalidCursorError: If the cursor is malformed
+            SearchUnavailableError: If the database is not SQLite
+        """
+        dialect = session.get_bind().dialect.name
+        if dialect != "sqlite":
+            raise SearchUnavailableError(dialect)
+
+        match = self.to_fts_query(query)
+        logger.info(f"Searching for user_id={user_id}: match={match!r}, metatext_id={metatext_id}, kind={kind}")
+        params: dict = {"match": match, "user_id": user_id, "limit": limit + 1}
+        filters = ""
+        if metatext_id is not None:
+            filters += " AND m.id = :metatext_id"
+            params["metatext_id"] = metatext_id
+        if source_document_id is not None:
+            filters += " AND m.source_document_id = :source_document_id"
+            params["source_document_id"] = source_document_id
+
+        arms = []
+        if kind in (None, "chunk"):
+            arms.append(
+                f"SELECT 'chunk' AS kind, c.id AS id, bm25(chunk_fts, {_weights(CONFIG.SEARCH_CHUNK_WEIGHTS)}) AS rank "
+                "FROM chunk_fts JOIN chunk c ON c.id = chunk_fts.rowid JOIN metatext m ON m.id = c.metatext_id "
+                f"WHERE chunk_fts MATCH :match AND m.user_id = :user_id{filters}"
+            )
+        if kind in (None, "explanation"):
+            arms.append(
+                f"SELECT 'explanation' AS kind, e.id AS id, "
+                f"bm25(explanation_fts, {_weights(CONFIG.SEARCH_EXPLANATION_WEIGHTS)}) AS rank "
+                "FROM explanation_fts JOIN explanation e ON e.id = explanation_fts.rowid "
+                "JOIN metatext m ON m.id = e.metatext_id "
+                f"WHERE explanation_fts MATCH :match AND e.user_id = :user_id AND m.user_id = :user_id{filters}"
+            )
+
+        keyset = ""
+        if cursor:
+            after_rank, after_kind, after_id = decode_cursor(cursor, 3)
+            if (
+                not isinstance(after_rank, (int, float))
+                or after_kind not in ("chunk", "explanation")
+                or not isinstance(after_id, int)
+            ):
+                raise InvalidCursorError(cursor)
+            keyset = "WHERE (rank, kind, id) > (:after_rank, :after_kind, :after_id) "
+            params.update(after_rank=after_rank, after_kind=after_kind, after_id=after_id)
+
+        # Rank every match, but keep only the page; snippets come afterwards for those rows alone
+        rows = session.execute(
+            text(f"SELECT kind, id, rank FROM ({' UNION ALL '.join(arms)}) {keyset}ORDER BY rank, kind, id LIMIT :limit"),
+            params,
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].kind, rows[-1].id)
+
+        details = {
+            **self._chunk_details(match, [row.id for row in rows if row.kind == "chunk"], session),
+            **self._explanation_details(match, [row.id for row in rows if row.kind == "explanation"], session),
+        }
+        results = [
+            SearchHit(kind=row.kind, id=row.id, rank=row.rank, **details[(row.kind, row.id)])
+            for row in rows
+            if (row.kind, row.id) in details
+        ]
+        return SearchPage(results=results, next_cursor=next_cursor)
+
+    @staticmethod
+    def _snippet_params(match: str, ids: list[int]) -> dict:
+        return {
+            "match": match,
+            "ids": ids,
+            "open": CONFIG.SEARCH_SNIPPET_OPEN,
+            "close": CONFIG.SEARCH_SNIPPET_CLOSE,
+            "ellipsis": CONFIG.SEARCH_SNIPPET_ELLIPSIS,
+            "tokens": CONFIG.SEARCH_SNIPPET_TOKENS,
+        }
+
+    def _chunk_details(self, match: str, ids: list[int], session: Session) -> dict[tuple[str, int], dict]:
+        if not ids:
+            return {}
+        statement = text(
+            "SELECT c.id, c.position, c.metatext_id, m.title, m.source_document_id, "
+            "snippet(chunk_fts, -1, :open, :close, :ellipsis, :tokens) AS snippet "
+            "FROM chunk_fts JOIN chunk c ON c.id = chunk_fts.rowid JOIN metatext m ON m.id = c.metatext_id "
+            "WHERE chunk_fts MATCH :match AND chunk_fts.rowid IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        return {
+            ("chunk", row.id): {
+                "metatext_id": row.metatext_id,
+                "metatext_title": row.title,
+                "source_document_id": row.source_document_id,
+                "snippet": row.snippet,
+                "position": row.position,
+            }
+            for row in session.execute(statement, self._snippet_params(match, ids))
+        }
+
+    def _explanation_details(self, match: str, ids: list[int], session: Session) -> dict[tuple[str, int], dict]:
+        if not ids:
+            return {}
+        statement = text(
+            "SELECT e.id, e.words, e.metatext_id, m.title, m.source_document_id, "
+            "snippet(explanation_fts, -1, :open, :close, :ellipsis, :tokens) AS snippet "
+            "FROM explanation_fts JOIN explanation e ON e.id = explanation_fts.rowid "
+            "JOIN metatext m ON m.id = e.metatext_id "
+            "WHERE explanation_fts MATCH :match AND explanation_fts.rowid IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        return {
+            ("explanation", row.id): {
+                "metatext_id": row.metatext_id,
+                "metatext_title": row.title,
+                "source_document_id": row.source_document_id,
+                "snippet": row.snippet,
+                "words": row.words,
+            }
+            for row in session.execute(statement, self._snippet_params(match, ids))
+        }
+
+
+class AsyncSearchService:
+    """Async counterpart of SearchService, running the sync queries through AsyncSession.run_sync."""
+
+    def __init__(self, search_service: SearchService | None = None):
+        self.search_service = search_service or SearchService()
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        session: AsyncSession,
+        metatext_id: int | None = None,
+        source_document_id: int | None = None,
+        kind: SearchKind | None = None,
+        cursor: str | None = None,
+        limit: int = CONFIG.SEARCH_DEFAULT_PAGE_SIZE
+    ) -> SearchPage:
+        return await session.run_sync(
+            lambda sync_session: self.search_service.search(
+                user_id, query, sync_session, metatext_id, source_document_id, kind, cursor, limit
+            )
+        )
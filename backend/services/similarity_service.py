@@ -0,0 +1,96 @@
+"""Similar-passage lookup over the per-metatext passage index."""
+import asyncio
+from typing import Literal
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from loguru import logger
+
+from backend.models import Chunk, Metatext, SimilarPassage
+from backend.config import BackendConfig as CONFIG
+from backend.exceptions.chunk_exceptions import ChunkNotFoundError
+from backend.services.passage_index import PassageIndex, passage_index as default_passage_index
+
+SimilarityScope = Literal["metatext", "library"]
+
+
+class AsyncSimilarityService:
+    """
+    Service for finding passages similar to a chunk.
+
+    Queries run on the async session; embedding, index builds and the NumPy
+    scoring run in a worker thread so the event loop stays responsive.
+    """
+
+    def __init__(self, passage_index: PassageIndex | None = None):
+        self.passage_index = passage_index or default_passage_index
+
+    async def similar_to_chunk(
+        self,
+        chunk_id: int,
+        user_id: int,
+        session: AsyncSession,
+        k: int = CONFIG.DEFAULT_SIMILAR_PASSAGES,
+        scope: SimilarityScope = "metatext"
+    ) -> list[SimilarPassage]:
+        """
+        Find the k chunks most similar to a chunk, within its metatext or the user's whole library.
+
+        Raises:
+            ChunkNotFoundError: If the chunk does not exist or is owned by another user
+        """
+        source = (await session.exec(
+            select(Chunk.text, Chunk.metatext_id)
+            .join(Metatext)
+            .where(Chunk.id == chunk_id, Metatext.user_id == user_id)
+        )).first()
+        if source is None:
+            logger.warning(f"Chunk not found or not owned by user: id={chunk_id}, user_id={user_id}")
+            raise ChunkNotFoundError(chunk_id)
+        text, metatext_id = source
+
+        if scope == "metatext":
+            metatext_ids = [metatext_id]
+        else:
+            metatext_ids = list((await session.exec(select(Metatext.id).where(Metatext.user_id == user_id))).all())
+        await self.ensure_built(metatext_ids, session)
+
+        def rank():
+            query = self.passage_index.embedder.embed([text])[0]
+            return self.passage_index.most_similar(query, metatext_ids, k, exclude_chunk_id=chunk_id)
+
+        hits = await asyncio.to_thread(rank)
+        if not hits:
+            return []
+
+        # Re-check ownership and drop chunks deleted since they were indexed
+        rows = (await session.exec(
+            select(Chunk.id, Chunk.metatext_id, Chunk.position, Chunk.text, Metatext.title)
+            .join(Metatext)
+            .where(Chunk.id.in_([hit_chunk_id for _, hit_chunk_id, _ in hits]), Metatext.user_id == user_id)  # type: ignore
+        )).all()
+        by_id = {row.id: row for row in rows}
+        return [
+            SimilarPassage(
+                chunk_id=hit_chunk_id,
+                metatext_id=by_id[hit_chunk_id].metatext_id,
+                metatext_title=by_id[hit_chunk_id].title,
+                position=by_id[hit_chunk_id].position,
+                text=by_id[hit_chunk_id].text,
+                score=score,
+            )
+            for _, hit_chunk_id, score in hits
+            if hit_chunk_id in by_id
+        ]
+
+    async def ensure_built(self, metatext_ids: list[int], session: AsyncSession) -> None:
+        """Build the index of every metatext that does not have one yet."""
+        missing = [
+            metatext_id for metatext_id in metatext_ids
+            if not await asyncio.to_thread(self.passage_index.is_built, metatext_id)
+        ]
+        for metatext_id in missing:
+            chunks = list((await session.exec(
+                select(Chunk.id, Chunk.text).where(Chunk.metatext_id == metatext_id).order_by(Chunk.position)  # type: ignore
+            )).all())
+            await asyncio.to_thread(self.passage_index.build, metatext_id, [(row.id, row.text) for row in chunks])
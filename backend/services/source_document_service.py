@@ -1,6 +1,9 @@
 """Source document service for business logic operations."""
 import os
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from loguru import logger
 
 from backend.config import BackendConfig as CONFIG
@@ -20,31 +23,11 @@ from backend.services.text_processing_service import TextProcessingService
 
 class SourceDocumentService:
     """Service for source document business logic operations."""
-    
-    def __init__(self, text_processing_service: TextProcessingService | None = None):
-        self.text_processing_service = text_processing_service or TextProcessingService()
-    
-    async def create_source_document_from_upload(
-        self,
-        title: str,
-        file,
-        session: Session,
-        user
-    ) -> SourceDocument:
-        """Create a new source document from an uploaded file. Tries to extract and set author if present. Associates document with user."""
-        logger.info(f"Creating source document with title: '{title}' for user_id={user.id}")
 
+    def create_source_document(self, title: str, text: str, author: str | None, session: Session, user) -> SourceDocument:
+        """Create a new source document for the user, with the author if one was found."""
         try:
-            # Validate the uploaded file
-            self._validate_upload_file(file)
-
-            # Process the uploaded file and extract text and author
-            processed = await self.text_processing_service.process_uploaded_file(file)
-            processed_text = processed["text"]
-            author = processed["author"]
-
-            # Create the source document, including author if found
-            doc_kwargs = dict(title=title, text=processed_text, user_id=user.id)
+            doc_kwargs = dict(title=title, text=text, user_id=user.id)
             if author:
                 doc_kwargs['author'] = author
                 logger.info(f"Extracted author: '{author}'")
@@ -56,16 +39,18 @@ class SourceDocumentService:
             logger.info(f"Source document created successfully: id={doc.id}, title='{doc.title}', user_id={user.id}")
             return doc
 
+        except IntegrityError as e:
+            # Title is the only unique column written here
+            session.rollback()
+            logger.error(f"Integrity error creating source document: {e}")
+            raise SourceDocumentTitleExistsError(title)
+
         except Exception as e:
             session.rollback()
             logger.error(f"Error creating source document: {e}")
 
-            # Handle specific database constraint errors
-            if 'UNIQUE constraint failed' in str(e):
-                raise SourceDocumentTitleExistsError(title)
-
             raise SourceDocumentCreationError(f"Failed to create source document: {str(e)}")
-    
+
     def get_source_document_by_id(self, doc_id: int, session: Session, user) -> SourceDocument:
         """Retrieve a source document by ID for the given user."""
         doc = session.exec(
@@ -91,12 +76,13 @@ class SourceDocumentService:
             logger.warning(f"Source document not found for deletion or not owned by user: id={doc_id}, user_id={user.id}")
             raise SourceDocumentNotFoundError(doc_id)
         # Check for dependencies
-        meta_texts = list(session.exec(select(Metatext).where(Metatext.source_document_id == doc_id)).all())
-        if meta_texts:
-            logger.warning(f"Cannot delete source document id={doc_id}: {len(meta_texts)} Metatext records exist")
-            raise SourceDocumentHasDependenciesError(doc_id, len(meta_texts))
+        meta_text_count = session.exec(
+            select(func.count()).select_from(Metatext).where(Metatext.source_document_id == doc_id)
+        ).one()
+        if meta_text_count:
+            logger.warning(f"Cannot delete source document id={doc_id}: {meta_text_count} Metatext records exist")
+            raise SourceDocumentHasDependenciesError(doc_id, meta_text_count)
         # Perform deletion
-        title = doc.title  # Store for response
         session.delete(doc)
         session.commit()
         return DeleteResponse(
@@ -152,7 +138,8 @@ class SourceDocumentService:
             logger.error(f"Error updating source document: {e}")
             raise SourceDocumentUpdateError(f"Failed to update source document: {str(e)}")
     
-    def _validate_upload_file(self, file) -> None:
+    @staticmethod
+    def _validate_upload_file(file) -> None:
         """Validate uploaded file type and size."""
         # Validate filename exists
         if not file.filename:
@@ -170,3 +157,69 @@ class SourceDocumentService:
             raise FileSizeExceededError(
                 f"File size {file.size} bytes exceeds maximum allowed size of {CONFIG.MAX_FILE_SIZE} bytes"
             )
+
+
+class AsyncSourceDocumentService:
+    """
+    Async counterpart of SourceDocumentService for handlers running on the event loop.
+
+    Uploads are read and parsed here; all database work runs the
+    SourceDocumentService implementation through AsyncSession.run_sync.
+    """
+
+    def __init__(
+        self,
+        text_processing_service: TextProcessingService | None = None,
+        source_document_service: SourceDocumentService | None = None
+    ):
+        self.text_processing_service = text_processing_service or TextProcessingService()
+        self.source_document_service = source_document_service or SourceDocumentService()
+
+    async def create_source_document_from_upload(
+        self,
+        title: str,
+        file,
+        session: AsyncSession,
+        user
+    ) -> SourceDocument:
+        """Create a new source document from an uploaded file, extracting the author if present."""
+        logger.info(f"Creating source document with title: '{title}' for user_id={user.id}")
+        SourceDocumentService._validate_upload_file(file)
+        try:
+            processed = await self.text_processing_service.process_uploaded_file(file)
+        except Exception as e:
+            logger.error(f"Error processing uploaded file: {e}")
+            raise SourceDocumentCreationError(f"Failed to create source document: {str(e)}")
+        return await session.run_sync(
+            lambda sync_session: self.source_document_service.create_source_document(
+                title, processed["text"], processed["author"], sync_session, user
+            )
+        )
+
+    async def get_source_document_by_id(self, doc_id: int, session: AsyncSession, user) -> SourceDocument:
+        return await session.run_sync(
+            lambda sync_session: self.source_document_service.get_source_document_by_id(doc_id, sync_session, user)
+        )
+
+    async def list_all_source_documents(self, session: AsyncSession, user) -> list[SourceDocument]:
+        return await session.run_sync(
+            lambda sync_session: self.source_document_service.list_all_source_documents(sync_session, user)
+        )
+
+    async def delete_source_document(self, doc_id: int, session: AsyncSession, user) -> DeleteResponse:
+        return await session.run_sync(
+            lambda sync_session: self.source_document_service.delete_source_document(doc_id, sync_session, user)
+        )
+
+    async def update_source_document(
+        self,
+        doc_id: int,
+        update_data: dict,
+        session: AsyncSession,
+        user
+    ) -> SourceDocument:
+        return await session.run_sync(
+            lambda sync_session: self.source_document_service.update_source_document(
+                doc_id, update_data, sync_session, user
+            )
+        )
@@ -1,4 +1,9 @@
 """Text chunking service for processing documents."""
+import re
+from itertools import batched
+from typing import Iterator
+
+from sqlalchemy import insert
 from sqlmodel import Session
 from loguru import logger
 
@@ -6,28 +11,42 @@ from backend.models import Chunk
 from backend.config import BackendConfig as CONFIG
 
 
+# Matches the same tokens as str.split() without building the full word list
+_WORD_PATTERN = re.compile(r"\S+")
 
 
 class TextChunkingService:
     """Service for handling text chunking operations."""
-    
+
     @staticmethod
     def split_text_into_chunks(text: str, chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE) -> list[str]:
         """Split text into a list of chunk_size-word strings."""
         words = text.split()
         return [' '.join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_size)]
-    
+
+    @staticmethod
+    def iter_chunk_texts(text: str, chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Lazily yield chunk_size-word strings from text.
+
+        Produces the same chunks as split_text_into_chunks, but only holds one
+        chunk's worth of words in memory at a time.
+        """
+        words = (match.group() for match in _WORD_PATTERN.finditer(text))
+        for chunk_words in batched(words, chunk_size):
+            yield ' '.join(chunk_words)
+
     @staticmethod
     def create_chunks_for_metatext(
-        text: str, 
-        metatext_id: int, 
-        session: Session, 
+        text: str,
+        metatext_id: int,
+        session: Session,
         chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE
     ) -> list[Chunk]:
         """Create and persist chunks for a metatext."""
         chunk_texts = TextChunkingService.split_text_into_chunks(text, chunk_size)
         logger.info(f"Creating {len(chunk_texts)} chunks of size {chunk_size} for metatext_id={metatext_id}")
-        
+
         chunks = []
         for i, chunk_text in enumerate(chunk_texts):
             chunk = Chunk(
@@ -37,5 +56,45 @@ class TextChunkingService:
             )
             session.add(chunk)
             chunks.append(chunk)
-        
+
         return chunks
+
+    @staticmethod
+    def bulk_insert_chunks_for_metatext(
+        text: str,
+        metatext_id: int,
+        session: Session,
+        chunk_size: int = CONFIG.DEFAULT_CHUNK_SIZE,
+        batch_size: int = CONFIG.CHUNK_INSERT_BATCH_SIZE
+    ) -> int:
+        """
+        Insert chunks for a metatext with batched Core executemany statements.
+
+        No ORM Chunk objects are created, so peak memory is bounded by
+        batch_size rows regardless of document size. The caller owns the
+        transaction.
+
+        Returns:
+            Number of chunks inserted
+        """
+        rows = (
+            {
+                "text": chunk_text,
+                "position": float(i),
+                "metatext_id": metatext_id,
+                "note": "",
+                "summary": "",
+                "evaluation": "",
+                "explanation": "",
+            }
+            for i, chunk_text in enumerate(TextChunkingService.iter_chunk_texts(text, chunk_size))
+        )
+
+        statement = insert(Chunk)
+        total = 0
+        for batch in batched(rows, batch_size):
+            session.execute(statement, list(batch))
+            total += len(batch)
+
+        logger.info(f"Bulk inserted {total} chunks of size {chunk_size} for metatext_id={metatext_id}")
+        return total
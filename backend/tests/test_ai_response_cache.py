@@ -0,0 +1,85 @@
+"""
+Tests for the persistent AI response cache and its use inside AsyncOpenAIService.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlmodel import Session
+
+from backend.models import AIResponseCacheEntry, ExplanationResponse2
+from backend.services.ai_response_cache import AIResponseCache
+from backend.services.openai_service import AsyncOpenAIService
+
+INSTRUCTIONS = "explain2"
+
+
+def test_key_depends_on_every_part():
+    base = AIResponseCache.make_key("m", "instr", "prompt", "schema")
+    assert base == AIResponseCache.make_key("m", "instr", "prompt", "schema")
+    assert base != AIResponseCache.make_key("m2", "instr", "prompt", "schema")
+    assert base != AIResponseCache.make_key("m", "instr2", "prompt", "schema")
+    assert base != AIResponseCache.make_key("m", "instr", "prompt2", "schema")
+    assert base != AIResponseCache.make_key("m", "instr", "prompt", "")
+    # Shifting text across field boundaries must not collide
+    assert AIResponseCache.make_key("m", "ab", "c") != AIResponseCache.make_key("m", "a", "bc")
+
+
+def test_get_set_and_counters(test_engine):
+    cache = AIResponseCache(engine=test_engine)
+    assert cache.get("k") is None
+    cache.set("k", "model", INSTRUCTIONS, "value")
+    assert cache.get("k") == "value"
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+
+
+def test_expired_entries_are_misses(test_engine):
+    cache = AIResponseCache(engine=test_engine, ttl_seconds=60)
+    cache.set("old", "model", INSTRUCTIONS, "stale")
+    with Session(test_engine) as session:
+        entry = session.get(AIResponseCacheEntry, "old")
+        entry.created_at = datetime.now() - timedelta(seconds=120)
+        session.add(entry)
+        session.commit()
+    assert cache.get("old") is None
+    assert cache.stats.expirations == 1
+    with Session(test_engine) as session:
+        assert session.get(AIResponseCacheEntry, "old") is None
+
+
+def test_lru_eviction(test_engine):
+    cache = AIResponseCache(engine=test_engine, max_entries=2)
+    cache.set("a", "model", INSTRUCTIONS, "A")
+    cache.set("b", "model", INSTRUCTIONS, "B")
+    with Session(test_engine) as session:
+        # Make "a" the most recently used entry
+        entry = session.get(AIResponseCacheEntry, "b")
+        entry.last_accessed_at = datetime.now() - timedelta(hours=1)
+        session.add(entry)
+        session.commit()
+    cache.set("c", "model", INSTRUCTIONS, "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats.evictions == 1
+
+
+def test_async_service_reuses_cached_parsed_response(test_engine):
+    calls = []
+
+    async def parse(**kwargs):
+        calls.append(kwargs["input"])
+        return SimpleNamespace(output_parsed=ExplanationResponse2(word="ennui", concise="boredom", comprehensive="..."))
+
+    client = SimpleNamespace(responses=SimpleNamespace(parse=parse))
+    service = AsyncOpenAIService(client=client, response_cache=AIResponseCache(engine=test_engine))  # type: ignore[arg-type]
+
+    async def run():
+        first = await service.generate_parsed_response(INSTRUCTIONS, "word='ennui'", ExplanationResponse2)
+        second = await service.generate_parsed_response(INSTRUCTIONS, "word='ennui'", ExplanationResponse2)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert isinstance(second, ExplanationResponse2)
+    assert calls == ["word='ennui'"]
@@ -98,3 +98,45 @@ def test_unauthenticated_access():
     assert resp_get.status_code in (401, 403)
     # Restore override for other tests
     app.dependency_overrides[get_current_user] = override_get_current_user
+
+
+def _create_metatext_with_chunks(title: str, count: int) -> int:
+    metatext_id = client.post("/api/metatext", json={"title": title, "sourceDocId": 1}).json()["id"]
+    for i in range(count):
+        resp = client.post("/api/chunk", json={"text": f"chunk {i}", "position": i + 1, "metatextId": metatext_id})
+        assert resp.status_code in (200, 201)
+    return metatext_id
+
+
+def test_list_metatext_chunks_paginates_in_order():
+    metatext_id = _create_metatext_with_chunks("PagedTest", 5)
+    texts = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/metatext/{metatext_id}/chunks", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["chunks"]) <= 2
+        texts.extend(c["text"] for c in data["chunks"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    # The source document's own chunk sits at position 0, ahead of the added ones
+    assert texts == ["Test text"] + [f"chunk {i}" for i in range(5)]
+    assert pages == 3
+
+
+def test_list_metatext_chunks_invalid_cursor():
+    metatext_id = _create_metatext_with_chunks("BadCursorTest", 1)
+    response = client.get(f"/api/metatext/{metatext_id}/chunks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_metatext_chunks_not_found():
+    response = client.get("/api/metatext/999999/chunks")
+    assert response.status_code == 404
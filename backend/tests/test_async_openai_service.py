@@ -0,0 +1,72 @@
+"""
+Tests for AsyncOpenAIService concurrency limiting, timeouts and cancellation.
+Uses a fake AsyncOpenAI client so no network calls are made.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.exceptions.ai_exceptions import OpenAIClientError
+from backend.services.openai_service import AsyncOpenAIService
+
+INSTRUCTIONS = "chunk_rewrite_instructions"
+
+
+class FakeResponses:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(output_text=f"echo: {kwargs['input']}")
+
+
+def make_service(delay: float, max_concurrency: int = 2, request_timeout: float = 5.0):
+    responses = FakeResponses(delay)
+    client = SimpleNamespace(responses=responses)
+    service = AsyncOpenAIService(client=client, max_concurrency=max_concurrency, request_timeout=request_timeout)  # type: ignore[arg-type]
+    return service, responses
+
+
+def test_concurrency_is_capped():
+    service, responses = make_service(delay=0.02, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.generate_text_response(INSTRUCTIONS, f"p{i}") for i in range(6))
+        )
+
+    results = asyncio.run(run())
+    assert results == [f"echo: p{i}" for i in range(6)]
+    assert responses.max_in_flight == 2
+
+
+def test_timeout_raises_client_error():
+    service, _ = make_service(delay=1.0, request_timeout=0.05)
+    with pytest.raises(OpenAIClientError, match="timed out"):
+        asyncio.run(service.generate_text_response(INSTRUCTIONS, "slow"))
+
+
+def test_cancellation_releases_slot():
+    service, responses = make_service(delay=10.0, max_concurrency=1)
+
+    async def run():
+        task = asyncio.create_task(service.generate_text_response(INSTRUCTIONS, "cancel me"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The slot must be free again for the next caller
+        responses.delay = 0
+        return await service.generate_text_response(INSTRUCTIONS, "next")
+
+    assert asyncio.run(run()) == "echo: next"
+    assert responses.in_flight == 0
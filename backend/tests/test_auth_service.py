@@ -5,8 +5,12 @@ Tests registration, authentication, token generation, and error handling.
 """
 
 import pytest
+from fastapi import HTTPException
 from sqlmodel import SQLModel, Session, create_engine
 from backend.services.auth_service import AuthService
+from backend.services.jwt_utils import create_access_token
+from backend.services.principal_cache import PrincipalCache
+from backend.services.schemas import Principal
 from backend.exceptions.auth_exceptions import (
     UserNotFoundError,
     UsernameAlreadyExistsError,
@@ -96,3 +100,44 @@ def test_refresh_access_token(auth_service, session):
     # Missing refresh token
     with pytest.raises(InvalidTokenError):
         auth_service.refresh_access_token(None, session)
+
+def test_access_token_user_is_cached_until_user_changes(session):
+    """Tokens carry the user id, so a cached user is returned without a database lookup."""
+    cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+    auth_service = AuthService(principal_cache=cache)
+    user = auth_service.register_user("frank", "pw", session)
+    token = auth_service.create_login_token(user)
+    assert auth_service.get_user_from_access_token(token, session) == Principal(id=user.id, username="frank")
+    # A warm cache never touches the session
+    assert auth_service.get_user_from_access_token(token, None).id == user.id
+
+    # Password changes and deletes made through the ORM invalidate the cached entry
+    user.hashed_password = "changed"
+    session.add(user)
+    session.commit()
+    assert cache.get(user.id) is None
+    assert auth_service.get_user_from_access_token(token, session).username == "frank"
+    session.delete(user)
+    session.commit()
+    with pytest.raises(HTTPException) as excinfo:
+        auth_service.get_user_from_access_token(token, session)
+    assert excinfo.value.status_code == 401
+
+def test_access_token_without_user_id_is_resolved_by_username(session):
+    """Tokens issued before the uid claim existed keep working."""
+    auth_service = AuthService(principal_cache=PrincipalCache())
+    user = auth_service.register_user("grace", "pw", session)
+    token = create_access_token(data={"sub": "grace"})
+    assert auth_service.get_user_from_access_token(token, session).id == user.id
+
+def test_principal_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.services.principal_cache.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl_seconds=10, max_entries=2)
+    for user_id in (1, 2):
+        cache.put(Principal(id=user_id, username=f"u{user_id}"))
+    assert cache.get(1).username == "u1"  # 1 is now the most recently used
+    cache.put(Principal(id=3, username="u3"))
+    assert cache.get(2) is None and cache.get(1) is not None
+    now[0] += 11
+    assert cache.get(1) is None and cache.get(3) is None
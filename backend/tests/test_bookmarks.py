@@ -0,0 +1,63 @@
+"""
+Tests for per-user bookmarks stored in the bookmark table.
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.models import Bookmark, Chunk, Metatext, User
+from backend.services.bookmark_service import BookmarkService
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def chunks(test_engine):
+    """Three chunks in metatext 11, and a second user."""
+    with Session(test_engine) as session:
+        session.add(User(id=2, username="other", hashed_password="fakehash"))
+        session.add(Metatext(id=11, title="Bookmarked", source_document_id=1, user_id=1, text=""))
+        rows = [Chunk(text=f"chunk {i}", position=float(i), metatext_id=11) for i in range(1, 4)]
+        session.add_all(rows)
+        session.commit()
+        ids = [row.id for row in rows]
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    yield ids
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_bookmark_upsert_per_user(test_engine, chunks):
+    service = BookmarkService()
+    with Session(test_engine) as session:
+        service.set_user_bookmark_for_metatext(session, 1, 11, chunks[0])
+        service.set_user_bookmark_for_metatext(session, 1, 11, chunks[1])
+        # Another reader can bookmark the same chunk without displacing anyone
+        service.set_user_bookmark_for_metatext(session, 2, 11, chunks[1])
+        assert service.get_user_bookmark_for_metatext(session, 1, 11) == chunks[1]
+        assert service.get_user_bookmark_for_metatext(session, 2, 11) == chunks[1]
+        assert len(session.exec(select(Bookmark)).all()) == 2
+
+        with pytest.raises(ValueError):
+            service.set_user_bookmark_for_metatext(session, 1, 1, chunks[0])  # wrong metatext
+        assert service.get_user_bookmark_for_metatext(session, 1, 11) == chunks[1]
+
+
+def test_bookmark_api_round_trip(chunks):
+    assert client.get("/api/bookmarks/11").json() == {"chunk_id": None}
+    response = client.post("/api/bookmarks/", json={"metatext_id": 11, "chunk_id": chunks[2]})
+    assert response.status_code == 201 and response.json() == {"chunk_id": chunks[2]}
+    assert client.get("/api/bookmarks/11").json() == {"chunk_id": chunks[2]}
+    assert client.delete("/api/bookmarks/11").status_code == 204
+    assert client.get("/api/bookmarks/11").json() == {"chunk_id": None}
+
+
+def test_combining_chunks_moves_bookmark(test_engine, chunks):
+    with Session(test_engine) as session:
+        BookmarkService().set_user_bookmark_for_metatext(session, 1, 11, chunks[1])
+    response = client.post("/api/chunk/combine", params={"first_chunk_id": chunks[0]})
+    assert response.status_code == 200
+    assert client.get("/api/bookmarks/11").json() == {"chunk_id": chunks[0]}
@@ -0,0 +1,53 @@
+"""
+Tests for the local dictionary and the explain2 fast path.
+"""
+import asyncio
+import json
+
+from backend.dictionary import SQLiteDictionary, compile_dictionary, read_entries
+from backend.metrics import DICTIONARY_LOOKUPS_TOTAL
+from backend.models import ExplanationResponse2
+from backend.services.explanation_service import ExplanationService
+
+
+class FakeOpenAIService:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_parsed_response(self, instructions_key, prompt, response_format):
+        self.calls += 1
+        return ExplanationResponse2(word="harpoon", concise="model concise", comprehensive="model comprehensive")
+
+
+def test_compile_and_lookup(tmp_path):
+    tsv = tmp_path / "words.tsv"
+    tsv.write_text("Harpoon\tA barbed spear.\nharpoon\tTo strike with a harpoon.\nharpoon\tA barbed spear.\n\nbad line\n")
+    jsonl = tmp_path / "wiktionary.jsonl"
+    jsonl.write_text(json.dumps({"word": "Leviathan", "senses": [{"glosses": ["A sea monster.", "A whale."]}]}) + "\n")
+
+    output = str(tmp_path / "dictionary.sqlite")
+    assert compile_dictionary([*read_entries(str(tsv)), *read_entries(str(jsonl))], output) == 2
+    dictionary = SQLiteDictionary(output)
+    assert dictionary.lookup(" HARPOON ") == "A barbed spear.; To strike with a harpoon."
+    assert dictionary.lookup("leviathan") == "A whale."
+    assert dictionary.lookup("ahab") is None
+
+
+def test_explain2_uses_dictionary_for_known_headwords(tmp_path):
+    output = str(tmp_path / "dictionary.sqlite")
+    compile_dictionary([("harpoon", "A barbed spear.")], output)
+    openai_service = FakeOpenAIService()
+    service = ExplanationService(openai_service=openai_service, dictionary=SQLiteDictionary(output))
+    hits = DICTIONARY_LOOKUPS_TOTAL.value(outcome="hit")
+
+    concise_only = asyncio.run(service.explain2("Harpoon", include_comprehensive=False))
+    assert (concise_only.concise, concise_only.comprehensive, concise_only.source) == ("A barbed spear.", None, "dictionary")
+    assert openai_service.calls == 0
+    assert DICTIONARY_LOOKUPS_TOTAL.value(outcome="hit") == hits + 1
+
+    full = asyncio.run(service.explain2("harpoon", context="He threw the harpoon."))
+    assert (full.concise, full.comprehensive, full.source) == ("A barbed spear.", "model comprehensive", "dictionary")
+
+    unknown = asyncio.run(service.explain2("ahab", include_comprehensive=False))
+    assert (unknown.concise, unknown.source) == ("model concise", "model")
+    assert openai_service.calls == 2
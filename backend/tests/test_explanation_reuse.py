@@ -0,0 +1,86 @@
+"""
+Tests for reusing stored explanations before calling the model.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
+from backend.models import Explanation, ExplanationResponse, Metatext, User
+from backend.services.explanation_service import ExplanationService
+
+
+class FakeOpenAIService:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_parsed_response(self, instructions_key, prompt, response_format):
+        self.calls += 1
+        return ExplanationResponse(explanation=f"answer {self.calls}", explanation_in_context="in context")
+
+
+@pytest.fixture
+def readers(test_engine):
+    """User 1 and user 2 each reading source document 1 through their own metatext."""
+    with Session(test_engine) as session:
+        session.add(User(id=2, username="other", hashed_password="fakehash"))
+        session.add(Metatext(id=11, title="Mine", source_document_id=1, user_id=1, text=""))
+        session.add(Metatext(id=3, title="Theirs", source_document_id=1, user_id=2, text=""))
+        session.commit()
+
+
+CONTEXT = "Call me Ishmael. Some years ago, never mind how long precisely, I thought I would sail about."
+
+
+def explain(service, engine, user_id, words, context, metatext_id):
+    async def run():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await service.explain(SimpleNamespace(id=user_id), words, context, metatext_id, session)
+    return asyncio.run(run())
+
+
+def test_normalisation():
+    assert ExplanationService.words_key("  Ishmael's, ") == ExplanationService.words_key("ishmael") == "ishmael"
+    assert ExplanationService.words_key("Never  MIND") == "never mind"
+    # Only the window around the words matters, not text far away from them
+    assert ExplanationService.context_hash("years", CONTEXT, window=3) == ExplanationService.context_hash(
+        "Years", "Prologue. " + CONTEXT.upper(), window=3
+    )
+    assert ExplanationService.context_hash("years", CONTEXT) != ExplanationService.context_hash(
+        "years", "Forty years in the desert."
+    )
+
+
+def test_explain_reuses_stored_explanations(test_engine, async_test_engine, readers):
+    openai_service = FakeOpenAIService()
+    service = ExplanationService(openai_service=openai_service)
+    with Session(test_engine) as session:
+        first = explain(service, async_test_engine, 1, "precisely", CONTEXT, 11)
+        again = explain(service, async_test_engine, 1, "Precisely,", CONTEXT, 11)
+        assert openai_service.calls == 1
+        assert again == first
+        assert len(session.exec(select(Explanation)).all()) == 1
+
+        # Another reader of the same source document gets the answer copied into their review list
+        theirs = explain(service, async_test_engine, 2, "precisely", CONTEXT, 3)
+        assert openai_service.calls == 1 and theirs == first
+        assert service.get_review_data(3, 2, session).word_list[0].explanation == first.explanation
+
+        # A different context is a miss
+        explain(service, async_test_engine, 1, "precisely", "Measure it precisely.", 11)
+        assert openai_service.calls == 2
+
+
+def test_explain_rejects_another_users_metatext(test_engine, async_test_engine, readers):
+    openai_service = FakeOpenAIService()
+    service = ExplanationService(openai_service=openai_service)
+    with Session(test_engine) as session:
+        explain(service, async_test_engine, 2, "precisely", CONTEXT, 3)
+        # User 1 cannot read user 2's explanation through user 2's metatext, nor save one on it
+        with pytest.raises(MetatextNotFoundError):
+            explain(service, async_test_engine, 1, "precisely", CONTEXT, 3)
+        assert openai_service.calls == 1
+        assert len(session.exec(select(Explanation)).all()) == 1
@@ -0,0 +1,100 @@
+"""
+Tests for per-user favorites stored in the favorite table.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.models import Chunk, Favorite, Metatext, User
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def chunks(test_engine):
+    """Three chunks in metatext 11, and a second user."""
+    with Session(test_engine) as session:
+        session.add(User(id=2, username="other", hashed_password="fakehash"))
+        session.add(Metatext(id=11, title="Favorites", source_document_id=1, user_id=1, text=""))
+        rows = [Chunk(text=f"chunk {i} " + "word " * 100, position=float(i), metatext_id=11) for i in range(1, 4)]
+        session.add_all(rows)
+        session.commit()
+        ids = [row.id for row in rows]
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    yield ids
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_favorite_is_idempotent_and_shown_on_chunk(test_engine, chunks):
+    for _ in range(2):
+        response = client.post(f"/api/chunk/{chunks[0]}/favorite")
+        assert response.status_code == 200
+        assert response.json()["favorited_by_user_id"] == 1
+    assert client.get(f"/api/chunk/{chunks[0]}").json()["favorited_by_user_id"] == 1
+    assert client.get(f"/api/chunk/{chunks[1]}").json()["favorited_by_user_id"] is None
+
+    response = client.delete(f"/api/chunk/{chunks[0]}/favorite")
+    assert response.status_code == 200 and response.json()["favorited_by_user_id"] is None
+    assert client.delete(f"/api/chunk/{chunks[0]}/favorite").status_code == 403
+    with Session(test_engine) as session:
+        assert session.exec(select(Favorite)).all() == []
+
+
+def test_only_the_metatext_owner_can_favorite_its_chunks(test_engine, chunks):
+    with Session(test_engine) as session:
+        session.add(Favorite(chunk_id=chunks[1], user_id=2))  # Left from before favorites were owner-only
+        session.commit()
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=2, username="other")
+    assert client.post(f"/api/chunk/{chunks[0]}/favorite").status_code == 404
+    assert client.delete(f"/api/chunk/{chunks[1]}/favorite").status_code == 404
+    assert client.get("/api/user/me/favorite_chunks").json()["favorites"] == []
+    with Session(test_engine) as session:
+        assert session.exec(select(Favorite.chunk_id, Favorite.user_id)).all() == [(chunks[1], 2)]
+
+
+def test_favorite_list_is_paginated_newest_first(test_engine, chunks):
+    now = datetime.now()
+    with Session(test_engine) as session:
+        session.add_all([
+            Favorite(chunk_id=chunk_id, user_id=1, created_at=now + timedelta(seconds=i))
+            for i, chunk_id in enumerate(chunks)
+        ])
+        session.add(Favorite(chunk_id=chunks[0], user_id=2, created_at=now))  # not listed for user 1
+        session.commit()
+
+    first = client.get("/api/user/me/favorite_chunks", params={"limit": 2}).json()
+    assert [f["chunk_id"] for f in first["favorites"]] == [chunks[2], chunks[1]]
+    favorite = first["favorites"][0]
+    assert favorite["metatext_id"] == 11 and favorite["metatext_title"] == "Favorites"
+    assert favorite["position"] == 3.0
+    assert favorite["preview"].startswith("chunk 3 ") and len(favorite["preview"]) == 200
+
+    second = client.get("/api/user/me/favorite_chunks", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [f["chunk_id"] for f in second["favorites"]] == [chunks[0]]
+    assert second["next_cursor"] is None
+    assert client.get("/api/user/me/favorite_chunks", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_combining_chunks_keeps_favorites(test_engine, chunks):
+    with Session(test_engine) as session:
+        session.add_all([
+            Favorite(chunk_id=chunks[0], user_id=2),
+            Favorite(chunk_id=chunks[1], user_id=1),
+            Favorite(chunk_id=chunks[1], user_id=2),
+        ])
+        session.commit()
+    response = client.post("/api/chunk/combine", params={"first_chunk_id": chunks[0]})
+    assert response.status_code == 200
+    assert response.json()["favorited_by_user_id"] == 1
+    with Session(test_engine) as session:
+        rows = session.exec(select(Favorite.chunk_id, Favorite.user_id)).all()
+    assert sorted(rows) == [(chunks[0], 1), (chunks[0], 2)]
+
+    assert client.delete("/api/metatext/11").status_code < 400
+    with Session(test_engine) as session:
+        assert session.exec(select(Favorite)).all() == []
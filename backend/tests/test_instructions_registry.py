@@ -0,0 +1,52 @@
+"""
+Tests for the in-memory instructions registry.
+"""
+import os
+
+import pytest
+
+from backend.exceptions.ai_exceptions import InstructionsFileNotFoundError
+from backend.services.instructions_registry import InstructionsRegistry, instructions_registry
+
+
+def make_registry(tmp_path, check_interval: float = 0.0) -> InstructionsRegistry:
+    (tmp_path / "alpha.txt").write_text("alpha v1", encoding="utf-8")
+    (tmp_path / "beta.txt").write_text("beta v1", encoding="utf-8")
+    registry = InstructionsRegistry(directory=str(tmp_path), check_interval=check_interval)
+    registry.preload()
+    return registry
+
+
+def test_preload_and_lookup_by_key_or_legacy_path(tmp_path):
+    registry = make_registry(tmp_path)
+    assert sorted(registry.keys()) == ["alpha", "beta"]
+    assert registry.get("alpha") == "alpha v1"
+    assert registry.get("instructions/beta.txt") == "beta v1"
+
+
+def test_reloads_only_when_mtime_changes(tmp_path):
+    registry = make_registry(tmp_path)
+    path = tmp_path / "alpha.txt"
+    path.write_text("alpha v2", encoding="utf-8")
+    stat = os.stat(path)
+    # Force a distinct mtime even on coarse-grained filesystems
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert registry.get("alpha") == "alpha v2"
+
+
+def test_check_interval_serves_from_memory(tmp_path):
+    registry = make_registry(tmp_path, check_interval=3600)
+    (tmp_path / "alpha.txt").unlink()
+    assert registry.get("alpha") == "alpha v1"
+
+
+def test_unknown_key_raises(tmp_path):
+    registry = make_registry(tmp_path)
+    with pytest.raises(InstructionsFileNotFoundError):
+        registry.get("missing")
+
+
+def test_shared_registry_has_bundled_instructions():
+    instructions_registry.preload()
+    assert "explain2" in instructions_registry.keys()
+    assert instructions_registry.get("chunk_rewrite_instructions")
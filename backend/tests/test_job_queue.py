@@ -0,0 +1,118 @@
+"""
+Tests for the persisted background job queue.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.config import BackendConfig as CONFIG
+from backend.dependencies import get_current_user
+from backend.main import app
+from backend.models import Job, JobStatus
+from backend.services.job_service import JobQueue, JobService
+
+
+def test_jobs_run_and_record_results(test_engine, async_test_engine):
+    async def handler(context):
+        n = context.payload["n"]
+        if n < 0:
+            raise ValueError("negative")
+        context.report_progress(1, 1)
+        await asyncio.sleep(0)
+        return {"double": n * 2}
+
+    async def scenario():
+        queue = JobQueue("test_run", handler, workers=2, engine=async_test_engine)
+        with Session(test_engine) as session:
+            ok_id = JobService.create_job("test_run", {"n": 21}, 1, session).id
+            bad_id = JobService.create_job("test_run", {"n": -1}, 1, session).id
+        await queue.submit(ok_id)
+        await queue.submit(bad_id)
+        await queue.join()
+        await queue.stop()
+        return ok_id, bad_id
+
+    ok_id, bad_id = asyncio.run(scenario())
+    with Session(test_engine) as session:
+        ok = JobService.to_read(session.get(Job, ok_id))
+        bad = JobService.to_read(session.get(Job, bad_id))
+    assert ok.status == JobStatus.succeeded and ok.result == {"double": 42}
+    assert ok.started_at is not None and ok.finished_at is not None
+    assert (ok.progress_done, ok.progress_total) == (1, 1)
+    assert bad.status == JobStatus.failed and bad.error == "negative"
+
+
+def test_start_recovers_interrupted_jobs(test_engine, async_test_engine):
+    seen = []
+
+    async def handler(context):
+        seen.append(context.payload["n"])
+        return None
+
+    with Session(test_engine) as session:
+        interrupted = JobService.create_job("test_recover", {"n": 1}, 1, session)
+        assert JobService.claim_job(interrupted.id, session)
+        interrupted.heartbeat_at = datetime.now() - timedelta(seconds=CONFIG.JOB_LEASE_SECONDS + 1)
+        session.add(interrupted)
+        session.commit()
+        JobService.create_job("test_recover", {"n": 2}, 1, session)
+
+    async def scenario():
+        queue = JobQueue("test_recover", handler, workers=1, engine=async_test_engine)
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert seen == [1, 2]
+
+
+def test_running_job_with_live_heartbeat_is_claimed_once(test_engine):
+    with Session(test_engine) as session:
+        job_id = JobService.create_job("test_claim", {}, 1, session).id
+        assert JobService.recover_pending_jobs("test_claim", session) == [job_id]
+        # Two workers that both recovered the job race to claim it
+        assert JobService.claim_job(job_id, session)
+        assert not JobService.claim_job(job_id, session)
+        # Another process starting while the job still heartbeats leaves it running
+        assert JobService.recover_pending_jobs("test_claim", session) == []
+        session.expire_all()
+        assert session.get(Job, job_id).status == JobStatus.running
+
+
+def test_job_events_report_progress_of_a_running_job(monkeypatch, test_engine):
+    monkeypatch.setattr(CONFIG, "JOB_EVENTS_POLL_SECONDS", 0.01)
+    with Session(test_engine) as session:
+        job_id = JobService.create_job("test_events", {}, 1, session).id
+        assert JobService.claim_job(job_id, session)
+
+    def update_job(**values):
+        with Session(test_engine) as session:
+            job = session.get(Job, job_id)
+            for name, value in values.items():
+                setattr(job, name, value)
+            session.add(job)
+            session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    try:
+        with TestClient(app).stream("GET", f"/api/jobs/{job_id}/events") as response:
+            lines = response.iter_lines()
+
+            def next_event():
+                event = next(line for line in lines if line.startswith("event: "))
+                return event[len("event: "):], json.loads(next(lines)[len("data: "):])
+
+            assert next_event()[0] == "status"
+            update_job(progress_done=1, progress_total=3)
+            event, job = next_event()
+            assert event == "progress" and (job["progress_done"], job["progress_total"]) == (1, 3)
+            update_job(status=JobStatus.succeeded, progress_done=3)
+            event, job = next_event()
+            assert event == "status" and job["status"] == "succeeded"
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,53 @@
+"""
+Tests for the event-loop lag monitor and its admin endpoint.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.middleware.loop_monitor import LoopLagMonitor
+
+
+def blocking_helper():
+    time.sleep(0.3)
+
+
+def test_blocking_call_is_recorded_with_stack_and_route():
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+        await monitor.start()
+        token = monitor.request_started({"type": "http", "method": "GET", "path": "/api/slow"})
+        await asyncio.sleep(0.05)
+        blocking_helper()
+        await asyncio.sleep(0.05)
+        monitor.request_finished(token)
+        await monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["samples"] > 0
+    assert snapshot["lag_max_seconds"] >= 0.2
+    event = snapshot["events"][0]
+    assert event["duration_seconds"] >= 0.2
+    assert event["routes"] == ["GET /api/slow"]
+    assert "blocking_helper" in event["stack"]
+    assert snapshot["routes"]["GET /api/slow"]["count"] == 1
+
+
+def test_loop_lag_endpoint_requires_admin(monkeypatch):
+    client = TestClient(app)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="alice")
+    try:
+        monkeypatch.setenv("ADMIN_USERNAMES", "")
+        assert client.get("/api/admin/loop-lag").status_code == 403
+
+        monkeypatch.setenv("ADMIN_USERNAMES", "ops, alice")
+        response = client.get("/api/admin/loop-lag")
+        assert response.status_code == 200
+        assert {"lag_p99_seconds", "routes", "events"} <= response.json().keys()
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
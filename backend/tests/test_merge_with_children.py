@@ -58,8 +58,10 @@ def add_rewrites_and_image(chunk_id: int):
         """
         import os
         from pathlib import Path
-        from sqlmodel import Session, create_engine
+        from sqlmodel import Session
         from backend.models import Rewrite, Image
+        from backend.db import create_db_engine
+        from backend.tests.conftest import TEST_DB_URL
 
         # Try to read rewrite texts from optional fixtures
         tests_dir = Path(__file__).parent
@@ -85,8 +87,7 @@ def add_rewrites_and_image(chunk_id: int):
         os.makedirs(abs_image_dir, exist_ok=True)
 
         # Use the same persistent test DB as configured in backend/tests/conftest.py
-        test_db_url = "sqlite:///test_database.sqlite"
-        engine = create_engine(test_db_url, connect_args={"check_same_thread": False})
+        engine = create_db_engine(TEST_DB_URL)
         with Session(engine) as session:
                 session.add(Rewrite(title="like im 5", rewrite_text=rtext1, chunk_id=chunk_id))
                 session.add(Rewrite(title="academic", rewrite_text=rtext2, chunk_id=chunk_id))
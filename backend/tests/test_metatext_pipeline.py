@@ -0,0 +1,89 @@
+"""
+Tests for the whole-metatext AI pipeline.
+"""
+import asyncio
+
+import pytest
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.models import Chunk, Metatext, Rewrite
+from backend.services.metatext_pipeline_service import MetatextPipelineService
+from backend.exceptions.ai_exceptions import PromptValidationError
+from backend.exceptions.metatext_exceptions import MetatextNotFoundError
+
+
+class FakeOpenAIService:
+    def __init__(self, fail_on: str):
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_text_response(self, instructions_key, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if self.fail_on in prompt:
+            raise RuntimeError("boom")
+        return f"{instructions_key}:{prompt.split()[-1]}"
+
+
+def run_pipeline(engine, openai_service, metatext_id, operation, **kwargs):
+    async def run():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await MetatextPipelineService(openai_service=openai_service).run(
+                metatext_id, 1, operation, session, **kwargs
+            )
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def pipeline_metatext(test_engine):
+    with Session(test_engine) as session:
+        metatext = Metatext(title="Pipeline Book", source_document_id=1, user_id=1, text="")
+        session.add(metatext)
+        session.commit()
+        session.add_all(
+            Chunk(text=f"word{i}", position=float(i), metatext_id=metatext.id) for i in range(7)
+        )
+        session.commit()
+        return metatext.id
+
+
+def test_explanation_pipeline_writes_results_in_batches(test_engine, async_test_engine, pipeline_metatext):
+    fake = FakeOpenAIService(fail_on="word3")
+    progress = []
+    summary = run_pipeline(
+        async_test_engine, fake, pipeline_metatext, "explanation",
+        concurrency=2, batch_size=3, on_progress=lambda *p: progress.append(p),
+    )
+    assert summary["total"] == 7 and summary["succeeded"] == 6 and summary["failed"] == 1
+    assert fake.max_in_flight == 2
+    assert progress[-1] == (7, 7, 1)
+    assert [p[0] for p in progress] == [3, 6, 7]
+
+    with Session(test_engine) as session:
+        chunks = session.exec(select(Chunk).where(Chunk.metatext_id == pipeline_metatext)).all()
+        explanations = {c.text: c.explanation for c in chunks}
+    assert explanations["word0"] == "chunk_explanation_instructions:word0"
+    assert explanations["word3"] == ""
+
+
+def test_rewrite_pipeline_inserts_rewrites(test_engine, async_test_engine, pipeline_metatext):
+    fake = FakeOpenAIService(fail_on="nothing")
+    run_pipeline(async_test_engine, fake, pipeline_metatext, "rewrite", style_title="like im 5", batch_size=4)
+    with Session(test_engine) as session:
+        rewrites = session.exec(
+            select(Rewrite).join(Chunk).where(Chunk.metatext_id == pipeline_metatext)
+        ).all()
+    assert len(rewrites) == 7
+    assert all(r.title == "like im 5" for r in rewrites)
+
+
+def test_validate_request(test_engine, pipeline_metatext):
+    with Session(test_engine) as session:
+        with pytest.raises(PromptValidationError):
+            MetatextPipelineService.validate_request(pipeline_metatext, 1, "rewrite", None, session)
+        with pytest.raises(MetatextNotFoundError):
+            MetatextPipelineService.validate_request(pipeline_metatext, 999, "evaluation", None, session)
@@ -0,0 +1,87 @@
+"""
+Regression test for N+1 loading on the metatext detail endpoint.
+Counts the SQL statements issued while serving GET /metatext/{id} and checks
+that the count does not grow with the number of chunks.
+"""
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.models import Chunk, Image, Rewrite
+
+
+def override_get_current_user():
+    class User:
+        id = 1
+        username = "testuser"
+    return User()
+
+def setup_module(module):
+    app.dependency_overrides[get_current_user] = override_get_current_user
+
+def teardown_module(module):
+    app.dependency_overrides = {}
+
+client = TestClient(app)
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SELECT statements executed on engine inside the block."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seed_metatext(engine, title: str, chunk_count: int) -> int:
+    metatext_id = client.post("/api/metatext", json={"title": title, "sourceDocId": 1}).json()["id"]
+    with Session(engine) as session:
+        for i in range(chunk_count):
+            chunk = Chunk(text=f"chunk {i}", position=float(i + 1), metatext_id=metatext_id)
+            session.add(chunk)
+            session.flush()
+            session.add(Image(prompt=f"img {i}", path=f"generated_images/{i}.png", chunk_id=chunk.id))
+            session.add(Rewrite(title="like im 5", rewrite_text=f"rewrite {i}", chunk_id=chunk.id))
+        session.commit()
+    return metatext_id
+
+
+def get_metatext_query_count(async_engine, metatext_id: int) -> int:
+    # The endpoint reads through the async engine; its events fire on the wrapped sync engine
+    with count_queries(async_engine.sync_engine) as statements:
+        response = client.get(f"/api/metatext/{metatext_id}")
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_metatext_detail_query_count_is_constant(test_engine, async_test_engine):
+    small_id = seed_metatext(test_engine, "SmallBook", 2)
+    large_id = seed_metatext(test_engine, "LargeBook", 40)
+
+    small_count = get_metatext_query_count(async_test_engine, small_id)
+    large_count = get_metatext_query_count(async_test_engine, large_id)
+
+    assert 0 < large_count == small_count
+    assert large_count <= 8
+
+
+def test_metatext_detail_serializes_children(test_engine):
+    metatext_id = seed_metatext(test_engine, "ChildrenBook", 3)
+    chunks = client.get(f"/api/metatext/{metatext_id}").json()["chunks"]
+    positions = [c["position"] for c in chunks]
+    assert positions == sorted(positions)
+    seeded = [c for c in chunks if c["text"].startswith("chunk ")]
+    assert len(seeded) == 3
+    assert all(len(c["images"]) == 1 and len(c["rewrites"]) == 1 for c in seeded)
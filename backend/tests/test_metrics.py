@@ -0,0 +1,77 @@
+"""
+Tests for the metrics registry, the request middleware and the OpenAI hooks.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.exceptions.ai_exceptions import OpenAIClientError
+from backend.metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    OPENAI_ERRORS_TOTAL,
+    OPENAI_TOKENS_TOTAL,
+    MetricsRegistry,
+)
+from backend.services.openai_service import AsyncOpenAIService
+
+
+def test_render_uses_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    requests.inc(route='/a"b')
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a\\"b"} 1.0' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1.0' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2.0' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 2.0' in text
+    assert 'latency_seconds_count{route="/a"} 2.0' in text
+    with pytest.raises(ValueError):
+        requests.inc(path="/a")
+
+
+def test_requests_are_recorded_per_route_template():
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    try:
+        client = TestClient(app)
+        labels = {"method": "GET", "route": "/api/chunk/{chunk_id}"}
+        before = HTTP_REQUEST_DB_QUERIES.count(**labels)
+        assert client.get("/api/chunk/999999").status_code == 404
+
+        assert HTTP_REQUEST_DB_QUERIES.count(**labels) == before + 1
+        assert HTTP_REQUEST_DB_QUERIES.sum(**labels) > 0
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/api/chunk/{chunk_id}",status="404"}' in response.text
+        assert "db_query_duration_seconds_bucket" in response.text
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_openai_calls_record_tokens_and_errors():
+    class FakeResponses:
+        async def create(self, **kwargs):
+            if kwargs["input"] == "fail":
+                raise RuntimeError("upstream down")
+            return SimpleNamespace(output_text="ok", usage=SimpleNamespace(input_tokens=12, output_tokens=3))
+
+    service = AsyncOpenAIService(client=SimpleNamespace(responses=FakeResponses()))  # type: ignore[arg-type]
+    key = "chunk_rewrite_instructions"
+    tokens_before = OPENAI_TOKENS_TOTAL.value(instructions=key, direction="input")
+    errors_before = OPENAI_ERRORS_TOTAL.value(operation="text", instructions=key, error="RuntimeError")
+
+    assert asyncio.run(service.generate_text_response(key, "hello")) == "ok"
+    with pytest.raises(OpenAIClientError):
+        asyncio.run(service.generate_text_response(key, "fail"))
+
+    assert OPENAI_TOKENS_TOTAL.value(instructions=key, direction="input") == tokens_before + 12
+    assert OPENAI_ERRORS_TOTAL.value(operation="text", instructions=key, error="RuntimeError") == errors_before + 1
@@ -0,0 +1,93 @@
+"""
+Tests for the hashed passage embeddings, the per-metatext index files and the similar-passages endpoint.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.models import Chunk, Metatext
+from backend.services.passage_index import HashingEmbedder, PassageIndex, passage_index
+
+client = TestClient(app)
+
+PASSAGES = [
+    "The whale breached beside the whaling ship and the harpooner raised his harpoon.",
+    "Ahab stood on the deck watching the white whale circle the ship.",
+    "She baked bread in the kitchen every morning before the market opened.",
+    "The bakery sold warm bread and pastries at the morning market.",
+]
+
+
+def test_embeddings_are_unit_vectors_that_rank_related_text_higher():
+    vectors = HashingEmbedder(dim=256).embed(PASSAGES + ["", "the of and"])
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:4], axis=1), 1.0)
+    assert not vectors[4:].any()  # nothing but stopwords
+    scores = vectors[:4] @ vectors[0]
+    assert scores[1] > scores[2] and scores[1] > scores[3]
+
+
+def test_incremental_updates_match_a_rebuild(tmp_path):
+    index = PassageIndex(directory=str(tmp_path), embedder=HashingEmbedder(dim=64))
+    index.upsert(1, {1: "ignored"})
+    assert not index.is_built(1)  # Unbuilt indexes are left for the lazy build
+
+    index.build(1, [(1, PASSAGES[0]), (2, PASSAGES[1]), (3, PASSAGES[2])])
+    index.apply_changes(1, changed={2: PASSAGES[3], 4: PASSAGES[1]}, removed=[3])
+
+    rebuilt = PassageIndex(directory=str(tmp_path / "rebuilt"), embedder=HashingEmbedder(dim=64))
+    rebuilt.build(1, [(1, PASSAGES[0]), (2, PASSAGES[3]), (4, PASSAGES[1])])
+    query = index.embedder.embed([PASSAGES[1]])[0]
+    assert index.most_similar(query, [1], k=3) == pytest.approx(rebuilt.most_similar(query, [1], k=3))
+    assert index.most_similar(query, [1], k=1)[0][1] == 4
+
+    index.drop(1)
+    assert not index.is_built(1)
+
+
+@pytest.fixture
+def chunks(test_engine):
+    with Session(test_engine) as session:
+        session.add(Metatext(id=21, title="Sea", source_document_id=1, user_id=1, text=""))
+        session.add(Metatext(id=22, title="Kitchen", source_document_id=1, user_id=1, text=""))
+        rows = [
+            Chunk(text=PASSAGES[0], position=1, metatext_id=21),
+            Chunk(text=PASSAGES[2], position=2, metatext_id=21),
+            Chunk(text=PASSAGES[1], position=3, metatext_id=21),
+            Chunk(text=PASSAGES[3], position=1, metatext_id=22),
+        ]
+        session.add_all(rows)
+        session.commit()
+        ids = [row.id for row in rows]
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    yield ids
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_similar_endpoint_ranks_and_follows_edits(chunks):
+    whale, bread, ahab, bakery = chunks
+    response = client.get(f"/api/chunk/{whale}/similar")
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["chunk_id"] for hit in hits][0] == ahab
+    assert whale not in [hit["chunk_id"] for hit in hits]
+    assert passage_index.is_built(21) and not passage_index.is_built(22)
+
+    library = client.get(f"/api/chunk/{bread}/similar", params={"scope": "library", "k": 1}).json()
+    assert [(hit["chunk_id"], hit["metatext_title"]) for hit in library] == [(bakery, "Kitchen")]
+
+    # Editing text re-embeds the chunk in place
+    assert client.put(f"/api/chunk/{bread}", json={"text": PASSAGES[1]}).status_code == 200
+    assert client.get(f"/api/chunk/{ahab}/similar", params={"k": 1}).json()[0]["chunk_id"] == bread
+
+    # Combining removes the absorbed chunk from the index
+    assert client.post("/api/chunk/combine", params={"first_chunk_id": bread}).status_code == 200
+    ids, _ = passage_index._load(21)
+    assert sorted(ids.tolist()) == sorted([whale, bread])
+
+    assert client.get("/api/chunk/999999/similar").status_code == 404
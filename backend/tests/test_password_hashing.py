@@ -0,0 +1,53 @@
+"""
+Tests for bcrypt hashing in the process pool, cost calibration and rehash-on-login.
+"""
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+
+import backend.password_hashing as password_hashing
+from backend.models import User
+from backend.password_hashing import PasswordHasher, calibrate_rounds, hash_rounds, password_hasher
+from backend.services.auth_service import AuthService
+
+
+def test_process_pool_hashes_and_rehashes_on_cost_change():
+    hasher = PasswordHasher(workers=1, rounds=4)
+    try:
+        hashed = hasher.hash("s3cret")
+        assert hash_rounds(hashed) == 4
+        assert hasher.verify("s3cret", hashed) and not hasher.verify("wrong", hashed)
+        assert hasher.verify_and_update("s3cret", hashed) == (True, None)
+
+        hasher.rounds = 5
+        assert hasher.verify_and_update("wrong", hashed) == (False, None)
+        verified, new_hash = hasher.verify_and_update("s3cret", hashed)
+        assert verified and hash_rounds(new_hash) == 5 and hasher.verify("s3cret", new_hash)
+
+        # A process that calibrated lower never weakens a stronger hash
+        hasher.rounds = 4
+        assert hasher.verify_and_update("s3cret", new_hash) == (True, None)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.parametrize("seconds_at_sample_cost, expected", [(0.016, 12), (0.001, 15), (1.0, 10)])
+def test_calibration_targets_time_per_hash(monkeypatch, seconds_at_sample_cost, expected):
+    # Each round doubles the time: 16ms at cost 8 is 256ms at cost 12
+    monkeypatch.setattr(password_hashing, "_seconds_per_hash", lambda rounds: seconds_at_sample_cost)
+    assert calibrate_rounds(target_ms=260, min_rounds=10, max_rounds=15) == expected
+
+
+def test_login_rehashes_password_made_with_old_cost(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(password_hasher, "workers", 0)
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+    auth_service = AuthService()
+    with Session(engine) as session:
+        user = auth_service.register_user("henry", "pw", session)
+        assert hash_rounds(user.hashed_password) == 4
+
+        password_hasher.rounds = 5
+        auth_service.authenticate_user("henry", "pw", session)
+        session.expire_all()
+        assert hash_rounds(session.get(User, user.id).hashed_password) == 5
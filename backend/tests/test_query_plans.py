@@ -0,0 +1,123 @@
+"""
+Query-plan regression tests.
+
+Drives the API through a typical reading session, records every SELECT,
+UPDATE and DELETE the services send to the database, and runs each one
+through SQLite's EXPLAIN QUERY PLAN. A plan that scans a whole table
+(rather than searching an index) fails the test, so a dropped index or a
+new unindexed filter shows up here instead of in production latency.
+"""
+import re
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from backend.main import app
+from backend.dependencies import get_current_user, get_explanation_service
+from backend.models import Chunk, Explanation, Image, Rewrite
+from backend.services.explanation_service import ExplanationService
+
+client = TestClient(app)
+
+# "SCAN chunk" and "SCAN chunk USING INDEX ..." both walk every row; "SEARCH ..." and FTS lookups do not
+_FULL_SCAN = re.compile(r"^SCAN \w+\b(?! VIRTUAL TABLE)")
+
+
+@contextmanager
+def record_statements(*engines):
+    """Collect (statement, parameters) for every single-row SELECT, UPDATE and DELETE run on engines."""
+    statements: list[tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("SELECT", "UPDATE", "DELETE") and not executemany:
+            statements.append((statement, parameters))
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(engine, statement: str, parameters) -> list[str]:
+    connection = engine.raw_connection()
+    try:
+        plan = connection.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    finally:
+        connection.close()
+    return [row[-1] for row in plan if _FULL_SCAN.match(row[-1])]
+
+
+@pytest.fixture
+def reader(test_engine):
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    app.dependency_overrides[get_explanation_service] = lambda: ExplanationService(openai_service=object())
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_explanation_service, None)
+
+
+def seed(test_engine) -> tuple[int, list[int]]:
+    metatext_id = client.post("/api/metatext", json={"title": "Plans", "sourceDocId": 1}).json()["id"]
+    with Session(test_engine) as session:
+        chunks = [Chunk(text=f"chunk number {i} about whales", position=float(i), metatext_id=metatext_id)
+                  for i in range(1, 6)]
+        session.add_all(chunks)
+        session.flush()
+        session.add(Image(prompt="img", path="generated_images/x.png", chunk_id=chunks[0].id))
+        session.add(Rewrite(title="like im 5", rewrite_text="rewrite", chunk_id=chunks[0].id))
+        session.add(Explanation.create_with_type(words="whale", context="ctx", explanation="e",
+                                                 explanation_in_context="", user_id=1, metatext_id=metatext_id))
+        session.commit()
+        return metatext_id, [chunk.id for chunk in chunks]
+
+
+def test_service_queries_use_indexes(test_engine, async_test_engine, reader):
+    if test_engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite-specific")
+    metatext_id, chunk_ids = seed(test_engine)
+
+    with record_statements(test_engine, async_test_engine.sync_engine) as statements:
+        requests = [
+            ("GET", "/api/source-documents", None),
+            ("GET", "/api/source-documents/1", None),
+            ("GET", "/api/metatext", None),
+            ("GET", f"/api/metatext/{metatext_id}", None),
+            ("GET", f"/api/metatext/{metatext_id}/chunks?limit=2", None),
+            ("GET", f"/api/chunk/{chunk_ids[0]}", None),
+            ("PUT", f"/api/chunk/{chunk_ids[0]}", {"note": "a note"}),
+            ("POST", f"/api/chunk/{chunk_ids[1]}/split?word_index=1", None),
+            ("POST", f"/api/chunk/combine?first_chunk_id={chunk_ids[2]}", None),
+            ("GET", f"/api/chunk/{chunk_ids[0]}/similar?scope=library", None),
+            ("POST", f"/api/chunk/{chunk_ids[0]}/favorite", None),
+            ("GET", "/api/user/me/favorite_chunks", None),
+            ("DELETE", f"/api/chunk/{chunk_ids[0]}/favorite", None),
+            ("POST", "/api/bookmarks/", {"metatext_id": metatext_id, "chunk_id": chunk_ids[0]}),
+            ("GET", f"/api/bookmarks/{metatext_id}", None),
+            ("DELETE", f"/api/bookmarks/{metatext_id}", None),
+            ("GET", f"/api/metatext/{metatext_id}/review?type=word&limit=10", None),
+            ("GET", "/api/search?q=whales", None),
+            ("GET", "/api/user/config", None),
+            ("DELETE", f"/api/metatext/{metatext_id}", None),
+            ("DELETE", "/api/source-documents/1", None),
+        ]
+        for method, url, body in requests:
+            response = client.request(method, url, json=body)
+            assert response.status_code < 400, (method, url, response.text)
+
+    assert len(statements) > len(requests)
+    problems = {
+        statement: scans
+        for statement, parameters in statements
+        if (scans := full_scans(test_engine, statement, parameters))
+    }
+    assert not problems, "Full table scans:\n" + "\n\n".join(
+        f"{statement}\n  -> {', '.join(scans)}" for statement, scans in problems.items()
+    )
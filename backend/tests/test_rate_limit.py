@@ -0,0 +1,168 @@
+"""
+Tests for the SQLite-backed rate limit storage and the per-user AI token buckets.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import backend.dependencies as dependencies
+import backend.rate_limit as rate_limit
+from backend.config import BackendConfig as CONFIG
+from backend.dependencies import get_ai_service, get_current_user, get_explanation_service, get_pipeline_job_queue
+from backend.exceptions.ai_exceptions import ChunkNotFoundError
+from backend.main import app
+from backend.models import Chunk, ExplanationLookupResponse, Job, Metatext
+from backend.rate_limit import SQLiteStorage, TokenBucketStore
+from backend.services.job_service import JobContext
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "time", clock.time)
+    return clock
+
+
+def test_token_bucket_spends_cost_and_refills(tmp_path, clock):
+    buckets = TokenBucketStore(f"sqlite:///{tmp_path / 'limits.sqlite'}")
+    assert buckets.consume("ai:1", 3, capacity=5, refill_per_second=1) == 0
+    assert buckets.consume("ai:1", 2, capacity=5, refill_per_second=1) == 0
+    assert buckets.consume("ai:1", 3, capacity=5, refill_per_second=1) == pytest.approx(3)
+    assert buckets.consume("ai:2", 3, capacity=5, refill_per_second=1) == 0  # Buckets are per key
+
+    clock.now += 2
+    assert buckets.consume("ai:1", 3, capacity=5, refill_per_second=1) == pytest.approx(1)  # A refusal spends nothing
+    clock.now += 1
+    assert buckets.consume("ai:1", 3, capacity=5, refill_per_second=1) == 0
+    with pytest.raises(ValueError):
+        buckets.consume("ai:1", 6, capacity=5, refill_per_second=1)
+
+
+def test_sqlite_storage_counts_in_fixed_windows_shared_across_instances(tmp_path, clock):
+    uri = f"sqlite:///{tmp_path / 'limits.sqlite'}"
+    first, second = SQLiteStorage(uri), SQLiteStorage(uri)
+    assert first.incr("login", expiry=60) == 1
+    assert second.incr("login", expiry=60) == 2
+    assert first.get("login") == 2 and first.get_expiry("login") == 1060
+
+    clock.now += 60
+    assert second.get("login") == 0
+    assert second.incr("login", expiry=60) == 1
+
+
+def test_ai_route_returns_429_once_the_bucket_is_empty(monkeypatch):
+    class ChunklessAIService:
+        async def generate_rewrite(self, chunk_id, style_title, session):
+            raise ChunkNotFoundError(chunk_id)
+
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_CAPACITY", 6)
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_REFILL_PER_MINUTE", 1)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    app.dependency_overrides[get_ai_service] = lambda: ChunklessAIService()
+    try:
+        client = TestClient(app)
+        url = "/api/generate-rewrite/999?style_title=plain"
+        assert [client.get(url).status_code for _ in range(2)] == [404, 404]  # Two rewrites at cost 3
+        response = client.get(url)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) == 180
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides.pop(get_ai_service, None)
+
+
+def test_pipeline_is_charged_per_chunk(monkeypatch, test_engine):
+    class IdleQueue:
+        async def submit(self, job_id):
+            pass
+
+    with Session(test_engine) as session:
+        session.add(Metatext(id=11, title="Mine", source_document_id=1, user_id=1, text=""))
+        session.add_all(Chunk(text=f"chunk {i}", position=float(i), metatext_id=11) for i in range(4))
+        session.commit()
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_CAPACITY", 10)
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_REFILL_PER_MINUTE", 1)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    app.dependency_overrides[get_pipeline_job_queue] = lambda: IdleQueue()
+    try:
+        client = TestClient(app)
+        url = "/api/metatext/11/ai-pipeline"
+        # Four chunks at the evaluation cost of 2 leave 2 of 10 tokens
+        assert client.post(url, json={"operation": "evaluation"}).status_code == 202
+        assert client.post(url, json={"operation": "evaluation"}).status_code == 429
+        assert client.post(url, json={"operation": "explanation"}).status_code == 429
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides.pop(get_pipeline_job_queue, None)
+
+
+def test_large_pipeline_is_not_discounted(monkeypatch, test_engine, async_test_engine):
+    class CountingOpenAIService:
+        calls = 0
+
+        async def generate_text_response(self, instructions_key, prompt):
+            CountingOpenAIService.calls += 1
+            return "fine"
+
+    class Queue:
+        async def submit(self, job_id):
+            self.job_id = job_id
+
+    queue = Queue()
+    with Session(test_engine) as session:
+        session.add(Metatext(id=11, title="Mine", source_document_id=1, user_id=1, text=""))
+        session.add_all(Chunk(text=f"chunk {i}", position=float(i), metatext_id=11) for i in range(25))
+        session.commit()
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_CAPACITY", 30)
+    monkeypatch.setattr(CONFIG, "AI_RATE_LIMIT_REFILL_PER_MINUTE", 1)
+    monkeypatch.setattr(CONFIG, "PIPELINE_QUOTA_BATCH_SIZE", 10)
+    monkeypatch.setattr(dependencies, "get_openai_service", CountingOpenAIService)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    app.dependency_overrides[get_pipeline_job_queue] = lambda: queue
+    try:
+        response = TestClient(app).post("/api/metatext/11/ai-pipeline", json={"operation": "evaluation"})
+        assert response.status_code == 202
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides.pop(get_pipeline_job_queue, None)
+
+    # 25 chunks at 2 tokens cost 50: the first 10 are paid for up front, the next 10 would need 20 of the 10 left
+    async def run_job():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            job = await session.get(Job, queue.job_id)
+            return await dependencies._run_pipeline_job(JobContext(job, json.loads(job.payload), session))
+
+    summary = asyncio.run(run_job())
+    assert (summary["succeeded"], summary["skipped"]) == (10, 15)
+    assert CountingOpenAIService.calls == 10
+
+
+def test_explain2_is_limited_per_client_ip():
+    class LookupService:
+        async def explain2(self, word, context, include_comprehensive):
+            return ExplanationLookupResponse(word=word, concise="a large whale")
+
+    app.dependency_overrides[get_ai_service] = lambda: None
+    app.dependency_overrides[get_explanation_service] = lambda: LookupService()
+    try:
+        client = TestClient(app)
+        body = {"word": "cachalot", "context": "", "include_comprehensive": False}
+        limit = int(CONFIG.EXPLAIN2_RATE_LIMIT.split("/")[0])
+        assert all(client.post("/api/explain2", json=body).status_code == 200 for _ in range(limit))
+        assert client.post("/api/explain2", json=body).status_code == 429
+    finally:
+        app.dependency_overrides.pop(get_ai_service, None)
+        app.dependency_overrides.pop(get_explanation_service, None)
@@ -0,0 +1,73 @@
+"""
+Tests for the filtered, keyset-paginated review endpoint.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from backend.main import app
+from backend.dependencies import get_current_user, get_explanation_service
+from backend.models import Explanation
+from backend.services.explanation_service import ExplanationService
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def explanations(test_engine):
+    """Five words and two phrases on metatext 1, all created at the same instant but one."""
+    created_at = datetime(2026, 1, 1)
+    with Session(test_engine) as session:
+        for i, words in enumerate(["a", "b", "c", "d", "e", "f g", "h i"]):
+            session.add(Explanation.create_with_type(
+                words=words, context="ctx", explanation=f"long explanation {i}", explanation_in_context="",
+                user_id=1, metatext_id=1, created_at=created_at + timedelta(seconds=1 if i == 0 else 0)
+            ))
+        session.add(Explanation.create_with_type(
+            words="z", context="", explanation="", explanation_in_context="", user_id=2, metatext_id=1
+        ))
+        session.commit()
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    # Reviewing never reaches the model, so no OpenAI client is needed
+    app.dependency_overrides[get_explanation_service] = lambda: ExplanationService(openai_service=object())
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_explanation_service, None)
+
+
+def test_unpaginated_review_returns_everything(explanations):
+    body = client.get("/api/metatext/1/review").json()
+    assert [e["words"] for e in body["word_list"]] == ["b", "c", "d", "e", "a"]
+    assert [e["words"] for e in body["phrase_list"]] == ["f g", "h i"]
+    assert body["word_list"][0]["explanation"] == "long explanation 1" and body["next_cursor"] is None
+
+
+def test_review_pages_filters_and_summarises(explanations):
+    seen, cursor = [], None
+    while True:
+        params = {"type": "word", "limit": 2, "summary": True, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/metatext/1/review", params=params).json()
+        assert body["phrase_list"] == []
+        assert all(e["explanation"] is None and e["context"] is None for e in body["word_list"])
+        seen += [e["words"] for e in body["word_list"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["b", "c", "d", "e", "a"]
+    assert client.get("/api/metatext/1/review", params={"cursor": "nope"}).status_code == 400
+
+
+def test_review_query_uses_composite_index(test_engine, explanations):
+    if test_engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN is SQLite-specific")
+    with test_engine.connect() as connection:
+        plan = " ".join(row[-1] for row in connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM explanation WHERE metatext_id = 1 AND user_id = 1 AND type = 'word' "
+            "AND (created_at, id) > ('2026-01-01', 0) ORDER BY created_at, id LIMIT 3"
+        )))
+    assert "ix_explanation_metatext_id_user_id_type_created_at" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,97 @@
+"""
+Tests for FTS5 full-text search over chunks and explanations.
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.models import Chunk, Explanation, Metatext, SourceDocument, User
+from backend.services.search_service import SearchService
+from backend.exceptions.search_exceptions import InvalidSearchQueryError
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def library(test_engine):
+    """Two metatexts for user 1 and one for another user, with chunks and explanations."""
+    with Session(test_engine) as session:
+        session.add(User(id=2, username="other", hashed_password="fakehash"))
+        session.add(SourceDocument(id=2, user_id=1, title="Second", author="", summary="", characters="",
+                                   locations="", themes="", symbols="", text=""))
+        session.add(Metatext(id=11, title="Sea book", source_document_id=1, user_id=1, text=""))
+        session.add(Metatext(id=2, title="Whale book", source_document_id=2, user_id=1, text=""))
+        session.add(Metatext(id=3, title="Not yours", source_document_id=1, user_id=2, text=""))
+        session.add_all([
+            Chunk(text="The whale surfaced near the ship.", position=1, metatext_id=11),
+            Chunk(text="A quiet harbour at dawn.", position=2, metatext_id=11, note="whale sighting later"),
+            Chunk(text="Whales and whaling were his obsession.", position=1, metatext_id=2),
+            Chunk(text="The white whale again.", position=2, metatext_id=2, summary="Ahab sees the whale"),
+            Chunk(text="A whale belonging to somebody else.", position=1, metatext_id=3),
+        ])
+        session.add(Explanation(words="whale", context="", explanation="A large marine mammal.",
+                                explanation_in_context="", user_id=1, metatext_id=2))
+        session.commit()
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, username="testuser")
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_to_fts_query_neutralises_operators():
+    assert SearchService.to_fts_query('whale "white whale" ahab* NOT -x') == '"whale" "white whale" "ahab"* "NOT" "x"'
+    with pytest.raises(InvalidSearchQueryError):
+        SearchService.to_fts_query('"" ( * )')
+
+
+def test_search_ranks_snippets_and_scopes_to_user(library):
+    response = client.get("/api/search", params={"q": "whale"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert {(hit["kind"], hit["metatext_id"]) for hit in results} == {
+        ("chunk", 11), ("chunk", 2), ("explanation", 2)
+    }
+    assert len(results) == 4  # no stemming ("Whales"), and the other user's chunk is excluded
+    assert [hit["rank"] for hit in results] == sorted(hit["rank"] for hit in results)
+    assert all("<mark>" in hit["snippet"] for hit in results)
+    explanation = next(hit for hit in results if hit["kind"] == "explanation")
+    assert explanation["words"] == "whale" and explanation["metatext_title"] == "Whale book"
+
+    by_metatext = client.get("/api/search", params={"q": "whale", "metatext_id": 11}).json()["results"]
+    assert {hit["metatext_id"] for hit in by_metatext} == {11}
+    by_document = client.get("/api/search", params={"q": "whale", "source_document_id": 2, "kind": "chunk"}).json()
+    assert {(hit["kind"], hit["source_document_id"]) for hit in by_document["results"]} == {("chunk", 2)}
+    prefixed = client.get("/api/search", params={"q": "whal*", "kind": "chunk"}).json()["results"]
+    assert len(prefixed) == 4
+
+
+def test_search_pages_with_keyset_cursor(library):
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "whale", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/search", params=params).json()
+        seen.extend((hit["kind"], hit["id"]) for hit in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    full = client.get("/api/search", params={"q": "whale"}).json()["results"]
+    assert seen == [(hit["kind"], hit["id"]) for hit in full]
+    assert client.get("/api/search", params={"q": "whale", "cursor": "bogus"}).status_code == 400
+
+
+def test_index_follows_updates_and_deletes(library, test_engine):
+    with Session(test_engine) as session:
+        chunk = session.get(Chunk, 1)
+        chunk.text = "A narwhal this time."
+        session.add(chunk)
+        session.delete(session.get(Chunk, 3))
+        session.commit()
+
+    ids = {hit["id"] for hit in client.get("/api/search", params={"q": "whale", "kind": "chunk"}).json()["results"]}
+    assert 1 not in ids and 3 not in ids
+    assert [hit["id"] for hit in client.get("/api/search", params={"q": "narwhal"}).json()["results"]] == [1]
+    assert client.get("/api/search", params={"q": "?!"}).status_code == 400
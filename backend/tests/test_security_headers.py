@@ -97,4 +97,31 @@ def test_security_headers_development_vs_production():
     
     # Clean up
     if "ENVIRONMENT" in os.environ:
-        del os.environ["ENVIRONMENT"]
\ No newline at end of file
+        del os.environ["ENVIRONMENT"]
+
+def test_security_headers_stream_without_buffering():
+    """Test that streamed bodies pass through message by message and route headers are replaced, not duplicated."""
+    import asyncio
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"x-frame-options", b"SAMEORIGIN")]})
+        for chunk in (b"data: 1\n\n", b"data: 2\n\n"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    middleware = SecurityHeadersMiddleware(streaming_app)
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": "/events", "headers": []}, receive, send))
+
+    assert [message["type"] for message in sent] == ["http.response.start"] + ["http.response.body"] * 3
+    assert [message["body"] for message in sent[1:]] == [b"data: 1\n\n", b"data: 2\n\n", b""]
+    frame_options = [value for name, value in sent[0]["headers"] if name == b"x-frame-options"]
+    assert frame_options == [b"DENY"]
+    assert (b"x-content-type-options", b"nosniff") in sent[0]["headers"]
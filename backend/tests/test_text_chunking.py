@@ -0,0 +1,37 @@
+"""
+Tests for TextChunkingService streaming and bulk insertion.
+"""
+from sqlmodel import Session, select
+
+from backend.models import Chunk
+from backend.services.text_chunking_service import TextChunkingService
+
+
+SAMPLE_TEXT = "  one two\tthree\nfour   five six seven\r\neight nine  "
+
+
+def test_iter_chunk_texts_matches_split():
+    for chunk_size in (1, 2, 3, 4, 9, 10):
+        expected = TextChunkingService.split_text_into_chunks(SAMPLE_TEXT, chunk_size)
+        assert list(TextChunkingService.iter_chunk_texts(SAMPLE_TEXT, chunk_size)) == expected
+
+
+def test_iter_chunk_texts_empty():
+    assert list(TextChunkingService.iter_chunk_texts("   \n  ", 3)) == []
+
+
+def test_bulk_insert_chunks_for_metatext(test_engine):
+    text = " ".join(f"w{i}" for i in range(23))
+    with Session(test_engine) as session:
+        inserted = TextChunkingService.bulk_insert_chunks_for_metatext(
+            text, metatext_id=1, session=session, chunk_size=5, batch_size=2
+        )
+        session.commit()
+        assert inserted == 5
+
+        chunks = session.exec(
+            select(Chunk).where(Chunk.metatext_id == 1).order_by(Chunk.position)  # type: ignore
+        ).all()
+        assert [c.text for c in chunks] == TextChunkingService.split_text_into_chunks(text, 5)
+        assert [c.position for c in chunks] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert all(c.note == "" and c.summary == "" for c in chunks)